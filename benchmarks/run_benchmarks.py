@@ -0,0 +1,185 @@
+"""
+Benchmarks for the propagation, collision and render hot paths
+===============================================================
+
+Times Planet.get_state, Fleet.get_states, the Kepler solvers, GameModel.update,
+GameModel.detect_collisions and OrbitRenderer.render for a range of body counts
+and eccentricities. Rendering runs headless on SDL's dummy video driver.
+
+To run:       python -m benchmarks.run_benchmarks --output bench.json
+To compare:   python -m benchmarks.run_benchmarks --baseline bench.json --output new.json
+
+With --baseline, every case whose median time grew by more than --threshold is
+reported and the exit code is 1.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from statistics import median
+from time import perf_counter
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import numpy as np  # noqa: E402
+
+from src.config import OrbitConfig  # noqa: E402
+from src.kepler import SOLVERS, get_solver  # noqa: E402
+from src.orbit_model import GameModel, state_from_elements  # noqa: E402
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+DEFAULT_SIZES = (2, 100, 10_000, 100_000)
+DEFAULT_ECCENTRICITIES = (0.0, 0.3, 0.7, 0.9)
+DEBRIS_RADIUS = 0.001  # ratio of screen size, about 10 km: a dense but realistic field
+
+
+def measure(func, min_time=0.2, max_repeats=1000):
+    """Call func at least once and for at least min_time seconds; return per-call timings."""
+    times = []
+    total = 0.0
+    while not times or (total < min_time and len(times) < max_repeats):
+        start = perf_counter()
+        func()
+        elapsed = perf_counter() - start
+        times.append(elapsed)
+        total += elapsed
+    return {"best": min(times), "median": median(times), "repeats": len(times)}
+
+
+def build_model(n_bodies, eccentricity, seed=0):
+    """GameModel with the ship, the debris and n_bodies - 2 random debris of the given eccentricity."""
+    config = OrbitConfig()
+    model = GameModel(config)
+    extra = n_bodies - len(model.ships)
+    if extra > 0:
+        rng = np.random.default_rng(seed)
+        a = rng.uniform(6000e3, 9000e3, extra)
+        e = np.full(extra, eccentricity)
+        r, v = state_from_elements(a, e, rng.uniform(0, 2 * np.pi, extra), rng.uniform(0, 2 * np.pi, extra),
+                                   config.mu)
+        model.add_debris(r, v, DEBRIS_RADIUS)
+    return model
+
+
+@contextmanager
+def working_directory(path):
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+def bench_model(n_bodies, eccentricity, min_time):
+    model = build_model(n_bodies, eccentricity)
+    ship = model.ships[0]
+    results = {}
+
+    def cold_get_state():
+        ship.propagate(0)  # drops the memoized state
+        ship.get_state()
+
+    results["Planet.get_state"] = measure(cold_get_state, min_time)
+    results["Fleet.get_states"] = measure(model.fleet.get_states, min_time)
+    results["GameModel.detect_collisions"] = measure(model.detect_collisions, min_time)
+
+    # keep the game running however the random field behaves
+    model.collided_with_star = model.caught_satellite = False
+    results["GameModel.update"] = measure(model.update, min_time, max_repeats=200)
+    return results
+
+
+def bench_kepler(n_bodies, eccentricity, min_time):
+    rng = np.random.default_rng(1)
+    M = rng.uniform(0, 2 * np.pi, n_bodies)
+    results = {}
+    for name in SOLVERS:
+        solver = get_solver(name)
+        timing = measure(lambda: solver.solve(M, eccentricity), min_time)
+        # convergence diagnostics next to the timings
+        solution = solver.solve(M, eccentricity)
+        timing["mean_iterations"] = float(solution.iterations.mean())
+        timing["max_residual"] = solution.max_residual
+        results[f"solve_kepler[{name}]"] = timing
+    return results
+
+
+def bench_render(n_bodies, eccentricity, min_time):
+    from src.orbit_view import OrbitRenderer
+
+    model = build_model(n_bodies, eccentricity)
+    with working_directory(SRC_DIR):
+        view = OrbitRenderer(model.config)
+    return {"OrbitRenderer.render": measure(lambda: view.render(model), min_time, max_repeats=200)}
+
+
+def run(sizes, eccentricities, min_time, render=True):
+    results = []
+    for n_bodies in sizes:
+        for eccentricity in eccentricities:
+            cases = {}
+            cases.update(bench_model(n_bodies, eccentricity, min_time))
+            cases.update(bench_kepler(n_bodies, eccentricity, min_time))
+            if render:
+                cases.update(bench_render(n_bodies, eccentricity, min_time))
+            for name, timing in cases.items():
+                results.append({"name": name, "n": n_bodies, "e": eccentricity, **timing})
+                print(f"{name:32s} n={n_bodies:<7d} e={eccentricity:<4} "
+                      f"median {timing['median'] * 1e3:10.3f} ms  best {timing['best'] * 1e3:10.3f} ms")
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Return the cases whose median grew by more than `threshold` times against the baseline."""
+    previous = {(case["name"], case["n"], case["e"]): case for case in baseline["results"]}
+    regressions = []
+    for case in results:
+        old = previous.get((case["name"], case["n"], case["e"]))
+        if old is not None and case["median"] > threshold * old["median"]:
+            regressions.append({**case, "baseline_median": old["median"], "ratio": case["median"] / old["median"]})
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="body counts")
+    parser.add_argument("--eccentricities", type=float, nargs="+", default=DEFAULT_ECCENTRICITIES)
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds spent timing each case")
+    parser.add_argument("--no-render", action="store_true", help="skip the OrbitRenderer cases")
+    parser.add_argument("--output", help="write results as JSON to this path")
+    parser.add_argument("--baseline", help="JSON results of an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=1.25, help="median slowdown ratio that counts as regression")
+    args = parser.parse_args(argv)
+
+    results = run(args.sizes, args.eccentricities, args.min_time, render=not args.no_render)
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": sys.version.split()[0],
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            regressions = compare(results, json.load(file), args.threshold)
+        for case in regressions:
+            print(f"REGRESSION {case['name']} n={case['n']} e={case['e']}: "
+                  f"{case['baseline_median'] * 1e3:.3f} ms -> {case['median'] * 1e3:.3f} ms ({case['ratio']:.2f}x)")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
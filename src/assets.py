@@ -0,0 +1,50 @@
+import os
+import pygame
+
+# Preprocessed image assets.
+# Decoding and scaling the 4K background JPEG dominates renderer startup, so the
+# scaled result is cached as raw RGB pixels, one file per resolution. The file
+# name also carries the source's size and modification time, so editing the
+# source invalidates the cache. Loading a cached background is a plain buffer
+# read plus a conversion to the display format.
+
+ASSET_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CACHE_DIR = os.path.join(ASSET_DIR, ".asset_cache")
+
+
+def cache_path(source, size, cache_dir=DEFAULT_CACHE_DIR):
+    """Cache file of `source` scaled to `size` (width, height)."""
+    stat = os.stat(source)
+    stem = os.path.splitext(os.path.basename(source))[0]
+    width, height = size
+    return os.path.join(cache_dir, f"{stem}-{width}x{height}-{stat.st_size:x}-{stat.st_mtime_ns:x}.rgb")
+
+
+def load_background(name, size, cache_dir=None):
+    """Image `name` from the asset directory, scaled to `size` and in display format.
+
+    Needs a display mode to be set. Falls back to decoding the source when the
+    cache cannot be read or written.
+    """
+    source = os.path.join(ASSET_DIR, name)
+    cache_dir = DEFAULT_CACHE_DIR if cache_dir is None else cache_dir
+    path = cache_path(source, size, cache_dir)
+    try:
+        with open(path, "rb") as file:
+            pixels = file.read()
+        if len(pixels) == size[0] * size[1] * 3:
+            return pygame.image.frombuffer(pixels, size, "RGB").convert()
+    except OSError:
+        pass
+
+    surface = pygame.transform.scale(pygame.image.load(source), size)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        # write then rename, so a concurrent launch never reads half a file
+        partial = f"{path}.{os.getpid()}.tmp"
+        with open(partial, "wb") as file:
+            file.write(pygame.image.tobytes(surface, "RGB"))
+        os.replace(partial, path)
+    except OSError:
+        pass  # read-only install: decode on every launch
+    return surface.convert()
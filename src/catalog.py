@@ -0,0 +1,123 @@
+"""
+Debris catalogs
+===============
+
+A catalog is a .npy file holding a NumPy structured array with one row per
+body: orbital elements, radius and color. Opening one memory-maps the file, so
+it costs the same for ten bodies or a million; rows are only read when used.
+
+Catalogs are built from CSV state vectors with a header row naming the columns
+x, y, vx, vy (metres, m/s) and optionally radius (ratio of screen size, like the
+OrbitConfig radii) and r, g, b. The CSV is streamed in chunks and every chunk is
+converted to elements in one vectorized call.
+
+To import: python -m src.catalog states.csv debris.npy
+"""
+import argparse
+import os
+import sys
+from itertools import islice
+import numpy as np
+
+from src.config import OrbitConfig
+from src.orbit_model import elements_from_state
+
+CATALOG_DTYPE = np.dtype([
+    ('a', 'f8'), ('e', 'f8'), ('omega', 'f8'), ('M', 'f8'), ('n', 'f8'),
+    ('radius', 'f4'),
+    ('color', 'u1', (3,)),
+])
+STATE_COLUMNS = ('x', 'y', 'vx', 'vy')
+
+
+class Catalog:
+    """Read-only, memory-mapped view of a catalog file."""
+
+    def __init__(self, path):
+        self.path = path
+        self.rows = np.load(path, mmap_mode='r')
+        if self.rows.dtype != CATALOG_DTYPE:
+            raise ValueError(f"{path} is not a debris catalog (dtype {self.rows.dtype})")
+
+    def __len__(self):
+        return len(self.rows)
+
+    def elements(self, start=0, stop=None):
+        """(a, e, omega, M, n) arrays for rows [start, stop), copied out of the map."""
+        chunk = self.rows[start:stop]
+        return tuple(np.array(chunk[name]) for name in ('a', 'e', 'omega', 'M', 'n'))
+
+    def radii(self, start=0, stop=None):
+        return np.array(self.rows['radius'][start:stop], dtype=float)
+
+    def colors(self, start=0, stop=None):
+        return np.array(self.rows['color'][start:stop])
+
+
+def _data_lines(file):
+    """Lines np.loadtxt would parse: neither blank nor only a '#' comment."""
+    return (line for line in file if line.split('#', 1)[0].strip())
+
+
+def _count_rows(csv_path):
+    with open(csv_path) as file:
+        return sum(1 for _ in _data_lines(file)) - 1
+
+
+def import_csv(csv_path, catalog_path, mu=None, chunk_size=100_000, radius=None, color=None):
+    """Stream CSV state vectors into a new catalog, chunk_size rows at a time. Returns the row count."""
+    config = OrbitConfig()
+    mu = config.mu if mu is None else mu
+    radius = config.debris_radius if radius is None else radius
+    color = config.debris_color if color is None else color
+
+    count = _count_rows(csv_path)
+    with open(csv_path) as file:
+        header = [name.strip() for name in next(_data_lines(file), '').split('#', 1)[0].split(',')]
+        missing = [name for name in STATE_COLUMNS if name not in header]
+        if missing:
+            raise ValueError(f"{csv_path} lacks state columns {missing}")
+        column = {name: k for k, name in enumerate(header)}
+
+        # the header is good: only now create the catalog, and remove it again if a row is bad
+        rows = np.lib.format.open_memmap(catalog_path, mode='w+', dtype=CATALOG_DTYPE, shape=(count,))
+        try:
+            start = 0
+            while start < count:
+                lines = list(islice(_data_lines(file), chunk_size))
+                if not lines:
+                    break
+                data = np.loadtxt(lines, delimiter=',', ndmin=2)
+                stop = start + len(data)
+                r = data[:, [column['x'], column['y']]]
+                v = data[:, [column['vx'], column['vy']]]
+                chunk = rows[start:stop]
+                chunk['a'], chunk['e'], chunk['omega'], chunk['M'], chunk['n'] = elements_from_state(r, v, mu)
+                chunk['radius'] = data[:, column['radius']] if 'radius' in column else radius
+                if all(channel in column for channel in 'rgb'):
+                    chunk['color'] = data[:, [column['r'], column['g'], column['b']]]
+                else:
+                    chunk['color'] = color
+                start = stop
+        except BaseException:
+            del rows
+            os.remove(catalog_path)
+            raise
+    rows.flush()
+    del rows
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Import CSV state vectors into a debris catalog")
+    parser.add_argument("csv", help="CSV with header x,y,vx,vy[,radius][,r,g,b]")
+    parser.add_argument("catalog", help="output .npy catalog")
+    parser.add_argument("--chunk-size", type=int, default=100_000)
+    args = parser.parse_args(argv)
+    count = import_csv(args.csv, args.catalog, chunk_size=args.chunk_size)
+    print(f"imported {count} bodies into {args.catalog}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
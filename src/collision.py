@@ -0,0 +1,385 @@
+import numpy as np
+
+# sizes are relative to the screen: -1 to 1
+
+# half of the 3x3 neighbourhood, so every pair of adjacent cells is visited once
+_NEIGHBOUR_OFFSETS = ((0, 0), (1, -1), (1, 0), (1, 1), (0, 1))
+# the whole neighbourhood, for pairs between two different sets of bodies
+_ALL_OFFSETS = tuple((dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1))
+RADIUS_CLASSES = 8  # radius classes of a factor of two each; smaller bodies share the last one
+
+
+def _empty_pairs():
+    return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+
+
+def broad_phase(positions, radii, cell_size=None):
+    """Find every pair of overlapping circles using uniform grids.
+
+    positions is an (N, 2) array in normalized [-1, 1] coordinates and radii is
+    a scalar or (N,) array in the same units. Bodies are split into radius
+    classes a factor of two apart, and each class is bucketed into square cells
+    as wide as its largest contact distance, so a few oversized bodies (like
+    the star) do not inflate the cells for everyone. Bodies are tested exactly
+    only against bodies in the same or adjacent cells: of their own class's
+    grid, and of the grid of every larger class.
+
+    Returns index arrays (i, j), with i < j, of the colliding pairs.
+    """
+    positions = np.asarray(positions, dtype=float)
+    count = len(positions)
+    radii = np.broadcast_to(np.asarray(radii, dtype=float), (count,))
+    if count < 2:
+        return _empty_pairs()
+    if cell_size is not None:
+        return _grid_pairs(positions, radii, cell_size)
+    largest = radii.max()
+    if largest <= 0:
+        return _empty_pairs()
+
+    with np.errstate(divide='ignore'):
+        level = np.floor(np.log2(radii / largest))
+    level = np.clip(level, 1 - RADIUS_CLASSES, 0).astype(int)
+    classes = [np.nonzero(level == k)[0] for k in np.unique(level)]  # smallest radii first
+
+    first, second = [], []
+    for k, members in enumerate(classes):
+        cell = 2 * radii[members].max()
+        i, j = _grid_pairs(positions[members], radii[members], cell)
+        first.append(members[i])
+        second.append(members[j])
+        # smaller bodies reach no further than this class's own contact distance
+        for smaller in classes[:k]:
+            i, j = _cross_pairs(positions[smaller], radii[smaller], positions[members], radii[members], cell)
+            first.append(smaller[i])
+            second.append(members[j])
+    i, j = np.concatenate(first), np.concatenate(second)
+    return np.minimum(i, j), np.maximum(i, j)
+
+
+def _cell_keys(positions, cell_size):
+    """One sortable key per body and the key span of a column of cells.
+
+    Cells (x, y) and (x + dx, y + dy) have keys k and k + dx * span + dy; the +1
+    and +3 leave room for the -1/+1 neighbour offsets in y.
+    """
+    cells = np.floor(positions / cell_size).astype(np.int64)
+    cells -= cells.min(axis=0)
+    span = cells[:, 1].max() + 3
+    return cells[:, 0] * span + cells[:, 1] + 1, span
+
+
+def _neighbours(query, keys, span, offsets, same=False):
+    """(q, k) index pairs of query keys and keys in neighbouring cells.
+
+    With same, query is keys itself, and bodies in one cell pair only with
+    those later in sort order.
+    """
+    order = np.argsort(keys, kind='stable')
+    sorted_keys = keys[order]
+    if same:
+        rank = np.empty(len(keys), dtype=np.intp)
+        rank[order] = np.arange(len(keys))
+
+    first, second = [], []
+    for dx, dy in offsets:
+        target = query + dx * span + dy
+        lo = np.searchsorted(sorted_keys, target, side='left')
+        hi = np.searchsorted(sorted_keys, target, side='right')
+        if same and dx == 0 and dy == 0:
+            lo = np.maximum(lo, rank + 1)
+        counts = np.maximum(hi - lo, 0)
+        total = counts.sum()
+        if total == 0:
+            continue
+        starts = np.repeat(lo, counts)
+        offsets_in_cell = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        first.append(np.repeat(np.arange(len(query)), counts))
+        second.append(order[starts + offsets_in_cell])
+    if not first:
+        return _empty_pairs()
+    return np.concatenate(first), np.concatenate(second)
+
+
+def _overlap(positions_i, radii_i, positions_j, radii_j):
+    # narrow phase: exact circle overlap
+    delta = positions_i - positions_j
+    return np.einsum('ij,ij->i', delta, delta) <= (radii_i + radii_j) ** 2
+
+
+def _grid_pairs(positions, radii, cell_size):
+    if len(positions) < 2 or cell_size <= 0:
+        return _empty_pairs()
+    keys, span = _cell_keys(positions, cell_size)
+    i, j = _neighbours(keys, keys, span, _NEIGHBOUR_OFFSETS, same=True)
+    hit = _overlap(positions[i], radii[i], positions[j], radii[j])
+    i, j = i[hit], j[hit]
+    return np.minimum(i, j), np.maximum(i, j)
+
+
+def _cross_pairs(positions_a, radii_a, positions_b, radii_b, cell_size):
+    """Overlapping pairs (i into a, j into b) between two sets, on one grid of cell_size."""
+    if not len(positions_a) or not len(positions_b) or cell_size <= 0:
+        return _empty_pairs()
+    keys, span = _cell_keys(np.concatenate([positions_a, positions_b]), cell_size)
+    count = len(positions_a)
+    i, j = _neighbours(keys[:count], keys[count:], span, _ALL_OFFSETS)
+    hit = _overlap(positions_a[i], radii_a[i], positions_b[j], radii_b[j])
+    return i[hit], j[hit]
+
+
+def shell_bounds(a, e, reach=0.0):
+    """Radial shells [periapsis - reach, apoapsis + reach] of orbits (a, e), in metres.
+
+    Open orbits have no apoapsis and reach out to infinity; elements that give
+    no finite periapsis (parabolas, unset rows) span everything, so they are
+    never screened out.
+    """
+    a = np.asarray(a, dtype=float)
+    e = np.asarray(e, dtype=float)
+    with np.errstate(invalid='ignore'):
+        lo = a * (1 - e) - reach
+        hi = np.where(e < 1, a * (1 + e), np.inf) + reach
+    unknown = ~np.isfinite(lo)
+    return np.where(unknown, -np.inf, lo), np.where(unknown | np.isnan(hi), np.inf, hi)
+
+
+def shell_pairs(lo, hi):
+    """Every pair (i, j), i < j, of overlapping intervals [lo, hi].
+
+    A 1-D sweep: after sorting by lo, each interval overlaps exactly the ones
+    that start after it and no later than its own end.
+    """
+    count = len(lo)
+    if count < 2:
+        return _empty_pairs()
+    order = np.argsort(lo, kind='stable')
+    sorted_lo = lo[order]
+    start = np.arange(1, count + 1)
+    stop = np.searchsorted(sorted_lo, hi[order], side='right')
+    counts = np.maximum(stop - start, 0)
+    total = counts.sum()
+    if total == 0:
+        return _empty_pairs()
+    offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+    i = np.repeat(order, counts)
+    j = order[np.repeat(start, counts) + offsets]
+    return np.minimum(i, j), np.maximum(i, j)
+
+
+class ConjunctionFilter:
+    """Cached set of body pairs whose orbits can come within reach of each other.
+
+    Two bodies on orbits whose radial shells [periapsis, apoapsis], padded by
+    their reach, do not overlap can never meet, wherever they are on them.
+    The surviving pairs are kept between calls; update() only re-screens the
+    bodies whose a, e or reach changed since the last call (a burn, a new body)
+    and keeps every other pair as it was.
+
+    With `subjects` (fleet rows), only pairs involving one of them are kept,
+    e.g. the player against the debris field.
+    """
+
+    # re-screening this many changed bodies one by one costs about as much as a full sweep
+    FULL_SWEEP = 64
+
+    def __init__(self, subjects=None):
+        self.subjects = None if subjects is None else np.asarray(subjects, dtype=np.intp)
+        self.i, self.j = _empty_pairs()
+        self._screened = np.empty((0, 3))  # a, e, reach of every row at the last update
+        self.rescreened = 0  # rows re-screened by the last update
+
+    def update(self, a, e, reach):
+        """Bring the pair set up to date with elements a, e and per-body reach; return (i, j)."""
+        screened = np.column_stack([a, e, np.broadcast_to(reach, np.shape(a))])
+        count = len(screened)
+        known = min(count, len(self._screened))
+        changed = np.ones(count, dtype=bool)
+        # NaN never equals itself: rows with unset elements are re-screened every time
+        changed[:known] = np.any(screened[:known] != self._screened[:known], axis=1)
+        self._screened = screened
+        rows = np.nonzero(changed)[0]
+        self.rescreened = len(rows)
+        if not len(rows):
+            return self.i, self.j
+
+        lo, hi = shell_bounds(screened[:, 0], screened[:, 1], screened[:, 2])
+        if self.subjects is not None:
+            # changed subjects against everything, other changed rows against the unchanged subjects
+            subject = np.zeros(count, dtype=bool)
+            subject[self.subjects[self.subjects < count]] = True
+            moved, others = rows[subject[rows]], rows[~subject[rows]]
+            still = np.nonzero(subject & ~changed)[0]
+            i = np.concatenate([np.repeat(moved, count), np.repeat(others, len(still))])
+            j = np.concatenate([np.tile(np.arange(count), len(moved)), np.tile(still, len(others))])
+            # a pair of two changed subjects turns up twice
+            keep = (i != j) & ~(subject[j] & changed[j] & (j < i))
+        elif len(rows) > self.FULL_SWEEP:
+            self.i, self.j = shell_pairs(lo, hi)
+            return self.i, self.j
+        else:
+            i = np.repeat(rows, count)
+            j = np.tile(np.arange(count), len(rows))
+            # pairs of two changed rows once, from the lower one
+            keep = (i != j) & ~(changed[j] & (j < i))
+        i, j = i[keep], j[keep]
+        overlap = (lo[j] <= hi[i]) & (lo[i] <= hi[j])
+        i, j = np.minimum(i[overlap], j[overlap]), np.maximum(i[overlap], j[overlap])
+
+        stale = changed[self.i] | changed[self.j]
+        self.i = np.concatenate([self.i[~stale], i])
+        self.j = np.concatenate([self.j[~stale], j])
+        return self.i, self.j
+
+    def partners(self, row):
+        """Rows paired with `row` in the current pair set."""
+        return np.concatenate([self.j[self.i == row], self.i[self.j == row]])
+
+
+def closest_approach(fleet, i, j, duration, samples=8, iterations=30, start=0.0):
+    """Minimum separation of fleet rows i and j within the next `duration` seconds.
+
+    The separation is a smooth function of time between the analytic states, so
+    its minima are found as roots of the range rate r_rel . v_rel: the interval
+    is sampled to bracket every - to + sign change, each bracket is refined by
+    bisection, and the best root is compared against both end points.
+    Entries of j below zero denote the central body fixed at the origin.
+    `start` (scalar or one value per pair) delays each window by that many seconds.
+
+    Returns (t_min, d_min) arrays: seconds after the current epoch and metres.
+    """
+    i = np.atleast_1d(np.asarray(i, dtype=np.intp))
+    j = np.atleast_1d(np.asarray(j, dtype=np.intp))
+    pairs = len(i)
+    if pairs == 0:
+        return np.empty(0), np.empty(0)
+
+    def relative(pair, tau):
+        r_i, v_i = fleet.get_states(i[pair], tau)
+        central = j[pair] < 0
+        r_j, v_j = fleet.get_states(np.where(central, 0, j[pair]), tau)
+        r_j[central] = 0.0
+        v_j[central] = 0.0
+        return r_i - r_j, v_i - v_j
+
+    # sample the range rate on a regular grid
+    start = np.broadcast_to(np.asarray(start, dtype=float), (pairs,))
+    taus = start[:, None] + np.linspace(0.0, duration, samples + 1)[None, :]
+    pair = np.repeat(np.arange(pairs), samples + 1)
+    r, v = relative(pair, taus.ravel())
+    dist2 = np.einsum('ij,ij->i', r, r).reshape(pairs, samples + 1)
+    rate = np.einsum('ij,ij->i', r, v).reshape(pairs, samples + 1)
+
+    # best end point per pair
+    at_end = dist2[:, -1] < dist2[:, 0]
+    t_min = np.where(at_end, taus[:, -1], taus[:, 0])
+    d2_min = np.where(at_end, dist2[:, -1], dist2[:, 0])
+
+    # brackets where the separation stops shrinking and starts growing
+    bracket_pair, bracket_k = np.nonzero((rate[:, :-1] < 0) & (rate[:, 1:] >= 0))
+    if len(bracket_pair):
+        lo = taus[bracket_pair, bracket_k]
+        hi = taus[bracket_pair, bracket_k + 1]
+        for _ in range(iterations):
+            mid = 0.5 * (lo + hi)
+            r, v = relative(bracket_pair, mid)
+            growing = np.einsum('ij,ij->i', r, v) >= 0
+            hi = np.where(growing, mid, hi)
+            lo = np.where(growing, lo, mid)
+        root = 0.5 * (lo + hi)
+        r, _ = relative(bracket_pair, root)
+        root_d2 = np.einsum('ij,ij->i', r, r)
+
+        # keep the deepest minimum of each pair
+        best = np.full(pairs, np.inf)
+        np.minimum.at(best, bracket_pair, root_d2)
+        is_best = root_d2 == best[bracket_pair]
+        improves = best < d2_min
+        d2_min = np.where(improves, best, d2_min)
+        best_t = np.zeros(pairs)
+        best_t[bracket_pair[is_best]] = root[is_best]
+        t_min = np.where(improves, best_t, t_min)
+
+    return t_min, np.sqrt(d2_min)
+
+
+def first_contact(fleet, i, j, reach, duration, samples=8, iterations=30):
+    """Earliest time within the next `duration` seconds that rows i and j are within `reach` metres.
+
+    The separation is sampled like in closest_approach. The first sample
+    interval that enters the reach, or that holds a range-rate minimum dipping
+    into it between two samples outside, is refined by bisection on the
+    boundary crossing. Entries of j below zero denote the central body.
+
+    Returns an array of seconds after the current epoch, inf where the pair never gets that close.
+    """
+    i = np.atleast_1d(np.asarray(i, dtype=np.intp))
+    j = np.atleast_1d(np.asarray(j, dtype=np.intp))
+    pairs = len(i)
+    reach2 = np.broadcast_to(np.asarray(reach, dtype=float), (pairs,)) ** 2
+    t_first = np.full(pairs, np.inf)
+    if pairs == 0:
+        return t_first
+
+    def relative(pair, tau):
+        r_i, v_i = fleet.get_states(i[pair], tau)
+        central = j[pair] < 0
+        r_j, v_j = fleet.get_states(np.where(central, 0, j[pair]), tau)
+        r_j[central] = 0.0
+        v_j[central] = 0.0
+        return r_i - r_j, v_i - v_j
+
+    def bisect(pair, lo, hi, is_hi):
+        for _ in range(iterations):
+            mid = 0.5 * (lo + hi)
+            upper = is_hi(*relative(pair, mid), pair)
+            hi = np.where(upper, mid, hi)
+            lo = np.where(upper, lo, mid)
+        return lo, hi
+
+    taus = np.linspace(0.0, duration, samples + 1)
+    pair = np.repeat(np.arange(pairs), samples + 1)
+    r, v = relative(pair, np.tile(taus, pairs))
+    dist2 = np.einsum('ij,ij->i', r, r).reshape(pairs, samples + 1)
+    rate = np.einsum('ij,ij->i', r, v).reshape(pairs, samples + 1)
+    inside = dist2 <= reach2[:, None]
+    t_first[inside[:, 0]] = 0.0
+
+    # intervals that start outside and either end inside or dip inside in between
+    outside = ~inside[:, :-1]
+    entering = outside & inside[:, 1:]
+    dipping = outside & ~inside[:, 1:] & (rate[:, :-1] < 0) & (rate[:, 1:] >= 0)
+    hi = np.where(entering, taus[1:], np.inf)
+    dip_pair, dip_k = np.nonzero(dipping)
+    if len(dip_pair):
+        # the bottom of the dip, where the range rate turns positive
+        _, root = bisect(dip_pair, taus[dip_k], taus[dip_k + 1],
+                         lambda r, v, pair: np.einsum('ij,ij->i', r, v) >= 0)
+        r, _ = relative(dip_pair, root)
+        deep = np.einsum('ij,ij->i', r, r) <= reach2[dip_pair]
+        hi[dip_pair[deep], dip_k[deep]] = root[deep]
+
+    # the first such interval of each pair still outside at the start, bisected to the crossing
+    k = np.argmax(np.isfinite(hi), axis=1)
+    found = np.nonzero(np.isfinite(hi[np.arange(pairs), k]) & ~inside[:, 0])[0]
+    if len(found):
+        _, crossing = bisect(found, taus[k[found]], hi[found, k[found]],
+                             lambda r, v, pair: np.einsum('ij,ij->i', r, r) <= reach2[pair])
+        t_first[found] = crossing
+    return t_first
+
+
+def rendezvous_outcome(fleet, ships, targets, catch_reach, star_reach, duration, samples=8):
+    """Swept check of ships against their targets and the central body, pairwise.
+
+    Returns (caught, crashed, t_catch) arrays: whichever of the two contacts
+    comes first within `duration` wins, and t_catch is the time the ship first
+    comes within catch_reach of its target (inf unless caught).
+    """
+    count = len(ships)
+    t_first = first_contact(fleet, np.concatenate([ships, ships]), np.concatenate([targets, np.full(count, -1)]),
+                            np.repeat([catch_reach, star_reach], count), duration, samples=samples)
+    t_target, t_star = np.split(t_first, 2)
+    caught = np.isfinite(t_target) & (t_target <= t_star)
+    crashed = np.isfinite(t_star) & (t_star < t_target)
+    return caught, crashed, np.where(caught, t_target, np.inf)
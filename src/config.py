@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import Tuple
+from typing import Optional, Tuple
 import numpy as np
 
 
@@ -10,7 +10,11 @@ class OrbitConfig:
     # Display
     screen_width: int = 600
     screen_height: int = 600
-    fps: int = 10
+    fps: int = 10  # render rate
+    min_fps: int = 2  # lowest render rate adaptive pacing may drop to under sustained load
+    idle_timeout: float = 0.5  # s; longest a paused, unchanged game blocks waiting for input
+    physics_rate: int = 10  # physics ticks per real second, each advancing dt
+    max_substeps: int = 5  # catch-up ticks per frame before dropping time
 
     # Physics
     mu = 3.986e14  # Earth gravity parameter (m^3/s^2) μ=GM
@@ -21,6 +25,27 @@ class OrbitConfig:
     ship_position = np.array([4000e3, 0.0])
     ship_velocity = np.array([0.0, 9982.0])
     dt = 100  # index parameter of orbit speed
+    catalog_path: Optional[str] = None  # extra debris from a catalog file (see catalog.py)
+    catalog_page_rows: int = 20_000  # catalog bodies copied into the game per evaluation, until all are in
+    kepler_solver: str = 'newton'  # 'newton' (reference), 'halley', 'laguerre' or 'table'
+    time_warp_levels: Tuple[int, ...] = (1, 2, 5, 10, 50, 100)  # dt multipliers per update
+    swept_collisions: bool = True  # also catch passes between ticks, not only at sample points
+    swept_samples_per_orbit: int = 60  # range-rate samples per orbit of the fastest body checked
+    history_length: int = 600  # ticks of positions and velocities kept per body (see history.py); 0: none
+    history_all_bodies: bool = False  # record the whole fleet, not only the ships
+    history_spill_path: Optional[str] = None  # the game also keeps every full lap of the history in this new file
+
+    # Perturbations
+    propagator: str = 'kepler'  # 'kepler' (two-body) or 'perturbed' (J2 and drag integrated where significant)
+    j2 = 1.08263e-3  # Earth oblateness coefficient
+    body_radius = None  # m, equatorial radius for J2 and altitudes; None: the star's, planet_radius * world_radius
+    atmosphere_density = 3.6e-12  # kg/m^3 at atmosphere_altitude
+    atmosphere_altitude = 400e3  # m
+    atmosphere_scale_height = 58e3  # m
+    ballistic_coefficient = 0.01  # Cd * A / m (m^2/kg), the same for all bodies
+    perturbation_threshold = 1e-5  # perturbing / central acceleration below which Kepler is exact enough
+    integrator_rtol = 1e-9
+    integrator_atol = 1e-3  # m and m/s
 
     # Visual
     planet_radius: float = 0.08  # ratio of screen size of [-1, 1]
@@ -32,9 +57,47 @@ class OrbitConfig:
     ship_color: Tuple[int, int, int] = (56, 56, 200)  # Blueish
     debris_color: Tuple[int, int, int] = (230, 100, 100)  # Reddish
     epochs_color: Tuple[int, int, int] = (0, 255, 0)  # Green
+    preview_color: Tuple[int, int, int] = (110, 110, 140)  # Dim blue-grey
+    overlay_color: Tuple[int, int, int] = (255, 255, 255)  # White
 
     world_radius = 10000e3  # display in each direction
+    background_image: str = 'stars-galaxy.jpg'  # in the src directory
+    asset_cache_dir: Optional[str] = None  # scaled backgrounds; None: src/.asset_cache
+    dirty_rects: bool = False  # redraw and push only regions that changed between frames
+    show_orbit_paths: bool = True
+    orbit_path_points: int = 180  # polyline vertices per orbit
+    lod_pixel_radius: float = 1.5  # px; bulk debris drawn smaller than this is plotted as single pixels
+    lod_near_radius: float = 0.1  # ratio of screen size; bulk debris this close to the player is always a circle
+    lod_cell: int = 32  # px; screen cells for the density test and the pixel layer's dirty rects
+    lod_cell_circles: int = 4  # bulk debris in a cell holding more bodies than this is plotted as pixels
+    lod_max_circles: int = 500  # circles per frame at most, nearest the player first
+    show_trails: bool = True  # fading trails of the ships' recent positions
+    trail_length: int = 120  # ticks of trail, at most history_length
+    trail_fade_steps: int = 8  # brightness levels along a trail, one polyline each
+
+    # Profiling
+    profile: bool = False  # per-phase frame timers and an on-screen frame-time overlay
+    profile_window: int = 1000  # frames kept for the percentiles
+    profile_export: Optional[str] = None  # .json or .csv written on exit
+
+    # Networking
+    server_address: Optional[str] = None  # "host:port" of a simulation server (see server.py); the game only renders
+
+    # Session recording
+    record_path: Optional[str] = None  # write a replayable input log (see replay.py)
 
     # Controls
     delta_v: float = 100
+    preview_burns: int = 5  # preview -n..+n multiples of delta_v
+    preview_orbits: int = 3  # prediction horizon in current ship orbits
+    preview_samples_per_orbit: int = 90
+
+    # Autopilot
+    planner_max_delta_v: float = 2000  # per burn, m/s
+    planner_delta_v_step: float = 50
+    planner_burn_times: int = 24  # first-burn times over one ship orbit
+    planner_orbits: int = 2  # catch window after the last burn, in ship orbits
+    planner_samples_per_orbit: int = 60
+    planner_batch_size: int = 1024
+    planner_time_budget: float = 0.02  # seconds of search per frame
     paused: bool = False
@@ -0,0 +1,117 @@
+import numpy as np
+
+# Trajectory history: the last `capacity` ticks of positions and velocities in a
+# preallocated ring buffer.
+# Every sample is written twice, at slot k and k + capacity of a buffer twice as
+# long, so the latest `count` samples are always one contiguous slice: readers
+# get plain read-only views, never copies, however often the ring has wrapped.
+# Recording copies into the existing rows and allocates nothing.
+#
+# For long runs the ring can spill to a file: every time a lap of `capacity`
+# samples is complete it is appended as raw records, and the file is read back
+# through np.memmap. The file then holds every full lap, the ring the rest.
+# The spill file is created fresh: an existing file is never overwritten.
+
+
+def record_dtype(bodies):
+    """One tick of history: the time and (bodies, 2) positions and velocities."""
+    return np.dtype([('time', 'f8'), ('r', 'f8', (bodies, 2)), ('v', 'f8', (bodies, 2))])
+
+
+def read_spill(path, bodies):
+    """Memory-mapped records of a spill file written for `bodies` bodies."""
+    return np.memmap(path, dtype=record_dtype(bodies), mode='r')
+
+
+class TrajectoryHistory:
+    """Fixed-size ring buffer of per-tick states of `bodies` bodies."""
+
+    def __init__(self, capacity, bodies, spill_path=None):
+        if capacity < 1:
+            raise ValueError(f"history capacity must be at least 1, got {capacity}")
+        self.capacity = capacity
+        self._allocate(bodies)
+        self.recorded = 0  # samples recorded since the start, spilled or not
+        self.spill_path = spill_path
+        self.spilled = 0  # samples written to the spill file
+        self._spill = open(spill_path, 'xb') if spill_path else None
+
+    def _allocate(self, bodies):
+        self.bodies = bodies
+        self.dtype = record_dtype(bodies)
+        self._buffer = np.zeros(2 * self.capacity, dtype=self.dtype)
+        # field views, so recording never goes through the structured indexing
+        self._time = self._buffer['time']
+        self._r = self._buffer['r']
+        self._v = self._buffer['v']
+
+    def __len__(self):
+        return min(self.recorded, self.capacity)
+
+    def record(self, time, r, v, rows=None):
+        """Append one tick: states (N, 2) of all bodies, or of fleet rows `rows` of larger arrays."""
+        slot = self.recorded % self.capacity
+        for index in (slot, slot + self.capacity):
+            self._time[index] = time
+            if rows is None:
+                self._r[index] = r
+                self._v[index] = v
+            else:
+                np.take(r, rows, axis=0, out=self._r[index])
+                np.take(v, rows, axis=0, out=self._v[index])
+        self.recorded += 1
+        if self._spill is not None and slot == self.capacity - 1:
+            self._spill.write(self._buffer[:self.capacity].data)
+            self.spilled += self.capacity
+
+    def grow(self, bodies):
+        """Make room for `bodies` bodies; the added ones read NaN for the ticks kept so far."""
+        if bodies < self.bodies:
+            raise ValueError(f"history cannot shrink from {self.bodies} to {bodies} bodies")
+        if self._spill is not None:
+            raise ValueError("a spilling history cannot change its number of bodies")
+        old, kept = self._buffer, self.bodies
+        self._allocate(bodies)
+        self._time[:] = old['time']
+        for field, values in ((self._r, old['r']), (self._v, old['v'])):
+            field[:, :kept] = values
+            field[:, kept:] = np.nan
+
+    def window(self, count=None):
+        """The latest `count` (default all kept) samples, oldest first, as a read-only record view."""
+        count = len(self) if count is None else min(count, len(self))
+        end = self.recorded % self.capacity + self.capacity
+        if self.recorded < self.capacity:
+            end = self.recorded  # first lap: the mirror half is not filled in order yet
+        view = self._buffer[end - count:end]
+        view.flags.writeable = False
+        return view
+
+    def times(self, count=None):
+        return self.window(count)['time']
+
+    def positions(self, count=None):
+        """(count, bodies, 2) positions, oldest first; a view, not a copy."""
+        return self.window(count)['r']
+
+    def velocities(self, count=None):
+        return self.window(count)['v']
+
+    def spilled_records(self):
+        """Every spilled sample, memory-mapped from the spill file."""
+        if self._spill is not None:
+            self._spill.flush()
+        if not self.spilled:
+            return np.zeros(0, dtype=self.dtype)
+        return read_spill(self.spill_path, self.bodies)
+
+    def close(self):
+        """Write out the samples recorded since the last full lap and close the spill file."""
+        if self._spill is None:
+            return
+        pending = self.recorded - self.spilled
+        if pending:
+            self._spill.write(self.window(pending).tobytes())
+            self.spilled += pending
+        self._spill.close()
+        self._spill = None
@@ -0,0 +1,307 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+import numpy as np
+
+# Solvers for Kepler's equation E - e sin(E) = M on arrays of (M, e).
+# All strategies share one interface: solve(M, e) -> KeplerSolution.
+# Open and near-parabolic orbits use the universal-variable functions at the end instead.
+
+TWO_PI = 2 * np.pi
+
+
+@dataclass
+class KeplerSolution:
+    """Eccentric anomaly with per-element diagnostics."""
+
+    E: np.ndarray
+    iterations: np.ndarray  # correction steps applied to each element
+    residual: np.ndarray  # |E - e sin(E) - M|
+
+    @property
+    def max_residual(self):
+        return float(self.residual.max(initial=0.0))
+
+    @property
+    def total_iterations(self):
+        return int(self.iterations.sum())
+
+
+class KeplerSolver(ABC):
+    """Base class: reduces M to [0, 2pi), calls _solve and restores the full turns."""
+
+    name = None
+
+    def __init__(self, tol=1e-10, max_iter=50):
+        self.tol = tol
+        self.max_iter = max_iter
+
+    def solve(self, M, e):
+        M = np.asarray(M, dtype=float)
+        shape = M.shape
+        M = M.reshape(-1)
+        e = np.broadcast_to(np.asarray(e, dtype=float), shape).reshape(-1)
+        turns = np.floor(M / TWO_PI) * TWO_PI
+        M_reduced = M - turns
+        E, iterations = self._solve(M_reduced, e)
+        residual = np.abs(E - e * np.sin(E) - M_reduced)
+        return KeplerSolution((E + turns).reshape(shape), iterations.reshape(shape), residual.reshape(shape))
+
+    def __call__(self, M, e):
+        return self.solve(M, e).E
+
+    @abstractmethod
+    def _solve(self, M, e):
+        """(E, iterations) for M in [0, 2pi)."""
+
+    def _iterate(self, E, M, e, step):
+        """Apply `step` to the elements that have not converged yet."""
+        iterations = np.zeros(E.shape, dtype=np.int64)
+        active = np.ones(E.shape, dtype=bool)
+        for _ in range(self.max_iter):
+            if not active.any():
+                break
+            E_a = E[active]
+            dE = step(E_a, M[active], e[active])
+            E[active] = E_a + dE
+            iterations[active] += 1
+            active[active] = np.abs(dE) >= self.tol
+        return E, iterations
+
+
+def newton_step(E, M, e):
+    f = E - e * np.sin(E) - M
+    fprime = 1 - e * np.cos(E)
+    return -f / fprime
+
+
+def halley_step(E, M, e):
+    sin_E = e * np.sin(E)
+    f = E - sin_E - M
+    fprime = 1 - e * np.cos(E)
+    return -f / (fprime - 0.5 * f * sin_E / fprime)
+
+
+def laguerre_step(E, M, e, order=5):
+    """Laguerre-Conway step: globally convergent for every e < 1."""
+    sin_E = e * np.sin(E)
+    f = E - sin_E - M
+    fprime = 1 - e * np.cos(E)
+    root = np.sqrt(np.abs((order - 1) ** 2 * fprime ** 2 - order * (order - 1) * f * sin_E))
+    return -order * f / (fprime + np.copysign(root, fprime))
+
+
+class NewtonSolver(KeplerSolver):
+    """Reference Newton iteration, starting from M (or pi when e >= 0.8)."""
+
+    name = 'newton'
+
+    def _solve(self, M, e):
+        E = np.where(e < 0.8, M, np.pi)
+        return self._iterate(E, M, e, newton_step)
+
+
+class HalleySolver(KeplerSolver):
+    """Third-order series starter refined by cubically convergent Halley steps."""
+
+    name = 'halley'
+    step = staticmethod(halley_step)
+
+    @staticmethod
+    def starter(M, e):
+        # series in e for near-circular orbits, Danby's starter otherwise
+        sin_M = np.sin(M)
+        series = M + e * sin_M + 0.5 * e ** 2 * np.sin(2 * M) + e ** 3 * sin_M * (1.5 * np.cos(M) ** 2 - 0.5)
+        danby = M + 0.85 * e * np.sign(np.sin(M))
+        return np.where(e < 0.3, series, danby)
+
+    def _solve(self, M, e):
+        return self._iterate(self.starter(M, e), M, e, self.step)
+
+
+class LaguerreSolver(HalleySolver):
+    """Same starter as Halley with Laguerre-Conway steps, robust up to e -> 1."""
+
+    name = 'laguerre'
+    step = staticmethod(laguerre_step)
+
+
+class TableSolver(KeplerSolver):
+    """Bilinear lookup in a precomputed E(M, e) grid plus one Halley refinement.
+
+    Elements with e above the table range fall back to Newton iteration.
+    """
+
+    name = 'table'
+
+    def __init__(self, tol=1e-10, max_iter=50, m_points=512, e_points=64, e_max=0.95):
+        super().__init__(tol, max_iter)
+        self.e_max = e_max
+        self.M_grid = np.linspace(0.0, TWO_PI, m_points)
+        self.e_grid = np.linspace(0.0, e_max, e_points)
+        M, e = np.meshgrid(self.M_grid, self.e_grid, indexing='ij')
+        self.table = NewtonSolver(tol=1e-14).solve(M, e).E
+
+    def _solve(self, M, e):
+        E = np.empty_like(M)
+        iterations = np.ones(M.shape, dtype=np.int64)
+        inside = e <= self.e_max
+
+        # bilinear interpolation in the grid
+        M_in, e_in = M[inside], e[inside]
+        m_pos = M_in / (self.M_grid[1] - self.M_grid[0])
+        e_pos = e_in / (self.e_grid[1] - self.e_grid[0])
+        m0 = np.clip(m_pos.astype(np.int64), 0, len(self.M_grid) - 2)
+        e0 = np.clip(e_pos.astype(np.int64), 0, len(self.e_grid) - 2)
+        dm = m_pos - m0
+        de = e_pos - e0
+        table = self.table
+        E_in = ((1 - dm) * (1 - de) * table[m0, e0] + dm * (1 - de) * table[m0 + 1, e0] +
+                (1 - dm) * de * table[m0, e0 + 1] + dm * de * table[m0 + 1, e0 + 1])
+        E[inside] = E_in + halley_step(E_in, M_in, e_in)
+
+        if not inside.all():
+            outside = ~inside
+            E[outside], iterations[outside] = NewtonSolver(self.tol, self.max_iter)._solve(M[outside], e[outside])
+        return E, iterations
+
+
+SOLVERS = {solver.name: solver for solver in (NewtonSolver, HalleySolver, LaguerreSolver, TableSolver)}
+
+
+def get_solver(solver=None):
+    """Return a solver instance from a name, an instance, or None for the Newton reference."""
+    if solver is None:
+        return NewtonSolver()
+    if isinstance(solver, KeplerSolver):
+        return solver
+    try:
+        return SOLVERS[solver]()
+    except KeyError:
+        raise ValueError(f"unknown Kepler solver {solver!r}, expected one of {sorted(SOLVERS)}") from None
+
+
+# Universal variables: one formulation for ellipses, parabolas and hyperbolas.
+# The universal anomaly chi replaces E (chi = sqrt(a) E) or H (chi = sqrt(-a) H),
+# alpha = 1 / a is zero for a parabola and negative for a hyperbola, and the
+# Stumpff functions C(z), S(z) of z = alpha chi^2 hide which conic it is.
+
+# below this |z| the closed forms lose digits to cancellation; the series are exact to rounding
+_SERIES_Z = 1e-2
+
+
+def stumpff(z):
+    """Stumpff functions (C(z), S(z)) on arrays, continuous through z = 0."""
+    z = np.asarray(z, dtype=float)
+    C = np.empty_like(z)
+    S = np.empty_like(z)
+    small = np.abs(z) < _SERIES_Z
+    zs = z[small]
+    C[small] = 1 / 2 - zs / 24 * (1 - zs / 30 * (1 - zs / 56))
+    S[small] = 1 / 6 - zs / 120 * (1 - zs / 42 * (1 - zs / 72))
+    ellipse = (z > 0) & ~small
+    x = np.sqrt(z[ellipse])
+    C[ellipse] = (1 - np.cos(x)) / z[ellipse]
+    S[ellipse] = (x - np.sin(x)) / x ** 3
+    hyperbola = (z < 0) & ~small
+    x = np.sqrt(-z[hyperbola])
+    C[hyperbola] = (np.cosh(x) - 1) / -z[hyperbola]
+    S[hyperbola] = (np.sinh(x) - x) / x ** 3
+    return C, S
+
+
+def universal_step(chi, r0, sigma0, alpha, target, order=5):
+    """Laguerre-Conway step on the universal Kepler equation F(chi) = sqrt(mu) dt.
+
+    sigma0 = r0 . v0 / sqrt(mu); F' is the radius at chi, which is always
+    positive, so the step is well defined for every conic.
+    """
+    z = alpha * chi ** 2
+    C, S = stumpff(z)
+    eccentric = 1 - alpha * r0
+    f = sigma0 * chi ** 2 * C + eccentric * chi ** 3 * S + r0 * chi - target
+    fprime = sigma0 * chi * (1 - z * S) + eccentric * chi ** 2 * C + r0
+    fsecond = sigma0 * (1 - z * C) + eccentric * chi * (1 - z * S)
+    root = np.sqrt(np.abs((order - 1) ** 2 * fprime ** 2 - order * (order - 1) * f * fsecond))
+    return -order * f / (fprime + np.copysign(root, fprime))
+
+
+def solve_universal(r0, sigma0, alpha, dt, mu, tol=1e-12, max_iter=50):
+    """Universal anomaly chi reached dt seconds after a state with radius r0.
+
+    Returns (chi, iterations). Convergence is tested relative to |chi|.
+    """
+    target = np.sqrt(mu) * dt
+    # Vallado's starters: the mean motion for ellipses, the asymptotic solution for hyperbolas
+    chi = np.sqrt(mu) * dt * np.maximum(alpha, 0.0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        a = 1 / alpha
+        sign = np.sign(dt)
+        hyperbolic = sign * np.sqrt(-a) * np.log(-2 * mu * alpha * dt /
+                                                 (sigma0 * np.sqrt(mu) + sign * np.sqrt(-mu * a) * (1 - r0 * alpha)))
+    # the asymptotic form only holds far out; close to the start the linear term bounds chi
+    chi = np.where(alpha < 0, sign * np.minimum(np.abs(hyperbolic), np.abs(target) / r0), chi)
+    # near a parabola the asymptotic starter overshoots by orders of magnitude; take the smaller
+    # root of the linear and the cubic term of the parabolic equation r0 chi + chi^3 / 6 = target
+    near_parabolic = (np.abs(alpha * r0) < 1e-6) | ~np.isfinite(chi)
+    parabolic = np.sign(target) * np.minimum(np.abs(target) / r0, np.cbrt(6 * np.abs(target)))
+    chi = np.where(near_parabolic, parabolic, chi)
+    iterations = np.zeros(chi.shape, dtype=np.int64)
+    active = np.ones(chi.shape, dtype=bool)
+    for _ in range(max_iter):
+        if not active.any():
+            break
+        step = universal_step(chi[active], r0[active], sigma0[active], alpha[active], target[active])
+        chi[active] += step
+        iterations[active] += 1
+        active[active] = np.abs(step) > tol * np.maximum(np.abs(chi[active]), 1.0)
+    return chi, iterations
+
+
+def propagate_universal(r0, v0, dt, mu, tol=1e-12, max_iter=50):
+    """States (r, v), shape (N, 2), dt seconds after (r0, v0) on any conic, via Lagrange f and g."""
+    r0 = np.asarray(r0, dtype=float)
+    v0 = np.asarray(v0, dtype=float)
+    dt = np.broadcast_to(np.asarray(dt, dtype=float), r0.shape[:1])
+    radius0 = np.linalg.norm(r0, axis=1)
+    sigma0 = np.einsum('ij,ij->i', r0, v0) / np.sqrt(mu)
+    alpha = 2 / radius0 - np.einsum('ij,ij->i', v0, v0) / mu
+    chi, _ = solve_universal(radius0, sigma0, alpha, dt, mu, tol, max_iter)
+
+    z = alpha * chi ** 2
+    C, S = stumpff(z)
+    f = 1 - chi ** 2 * C / radius0
+    g = dt - chi ** 3 * S / np.sqrt(mu)
+    r = f[:, None] * r0 + g[:, None] * v0
+    radius = np.linalg.norm(r, axis=1)
+    fdot = np.sqrt(mu) / (radius * radius0) * chi * (z * S - 1)
+    gdot = 1 - chi ** 2 * C / radius
+    return r, fdot[:, None] * r0 + gdot[:, None] * v0
+
+
+def _arctan_ratio(x):
+    """atan(sqrt(x)) / sqrt(x), continued as atanh(sqrt(-x)) / sqrt(-x) for x < 0."""
+    x = np.asarray(x, dtype=float)
+    out = np.empty_like(x)
+    small = np.abs(x) < _SERIES_Z
+    xs = x[small]
+    out[small] = 1 - xs / 3 + xs ** 2 / 5 - xs ** 3 / 7
+    positive = (x > 0) & ~small
+    root = np.sqrt(x[positive])
+    out[positive] = np.arctan(root) / root
+    negative = (x < 0) & ~small
+    root = np.sqrt(-x[negative])
+    out[negative] = np.arctanh(np.minimum(root, 1.0)) / root
+    return out
+
+
+def time_since_periapsis(q, e, alpha, f, mu):
+    """Seconds since periapsis at true anomaly f, for every conic.
+
+    With u = sqrt(q / (1 + e)) tan(f / 2) the universal anomaly from periapsis is
+    chi = 2 u atan(sqrt(alpha) u) / (sqrt(alpha) u), which is sqrt(a) E for an
+    ellipse, sqrt(-a) H for a hyperbola and sqrt(p) tan(f / 2) for a parabola.
+    """
+    u = np.sqrt(q / (1 + e)) * np.tan(f / 2)
+    chi = 2 * u * _arctan_ratio(alpha * u ** 2)
+    _, S = stumpff(alpha * chi ** 2)
+    return (q * chi + e * chi ** 3 * S) / np.sqrt(mu)
@@ -16,6 +16,9 @@ To run: python main.py
 Controls:
 - Menu: SPACE to start, Q to quit
 - Game: UP and DOWN arrow keys increase or decrease orbit, SPACE to pause, ESC for quit
+- X engages the autopilot: plans the cheapest burn sequence to the debris and flies it
+- V toggles the maneuver preview: ghost orbits of candidate burns, closest debris pass highlighted
+- Time: . and , raise or lower time warp; 1, 2, 3 skip to next periapsis, apoapsis, close approach
 """
 # TODO limited maneuvers
 # TODO random initial orbits
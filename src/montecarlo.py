@@ -0,0 +1,234 @@
+"""
+Monte Carlo rendezvous statistics
+=================================
+
+Runs a fixed burn sequence against many perturbed copies of the initial ship
+and debris states and reports how often, how soon and at what delta-v cost the
+debris is caught. Everything is headless: no pygame, no OrbitRenderer.
+
+Trials are simulated in batches, one Fleet row per ship and per debris, with the
+same swept closest-approach check GameModel uses, so a batch of thousands of
+trials costs about as much as one. Batches are spread over a process pool.
+The perturbed initial states are written once into shared memory and every
+worker reads its slice from there and writes its results back the same way.
+
+Sampling is reproducible: chunk k of a run draws from child k of
+numpy.random.SeedSequence(seed), so results depend on the seed and chunk size
+but not on the number of workers or the order they finish in.
+
+To run: python -m src.montecarlo --trials 1000000 --burn 0 250 --burn 2900 -250
+"""
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+import numpy as np
+
+from src.collision import rendezvous_outcome
+from src.config import OrbitConfig
+from src.orbit_model import Fleet, GameModel
+from src.planner import Burn
+
+STATE_COLUMNS = 8  # ship x, y, vx, vy, debris x, y, vx, vy
+RESULT_DTYPE = np.dtype([('caught', '?'), ('crashed', '?'), ('catch_time', 'f8'), ('delta_v', 'f8')])
+
+
+def nominal_states(config):
+    """The (8,) initial state vector of the config: ship r, v then debris r, v."""
+    return np.concatenate([config.ship_position, config.ship_velocity,
+                           config.debris_position, config.debris_velocity]).astype(float)
+
+
+def sample_states(config, trials, sigma_position, sigma_velocity, seed=0, chunk_size=4096, out=None):
+    """Gaussian perturbations of the nominal states, shape (trials, 8), drawn chunk by chunk."""
+    out = np.empty((trials, STATE_COLUMNS)) if out is None else out
+    sigma = np.tile(np.repeat([sigma_position, sigma_velocity], 2), 2)
+    nominal = nominal_states(config)
+    chunks = range(0, trials, chunk_size)
+    for start, child in zip(chunks, np.random.SeedSequence(seed).spawn(len(chunks))):
+        stop = min(start + chunk_size, trials)
+        out[start:stop] = nominal + sigma * np.random.default_rng(child).standard_normal((stop - start, STATE_COLUMNS))
+    return out
+
+
+def simulate(config, burns, states, horizon, samples_per_orbit=60):
+    """Run a batch of trials at once; return a RESULT_DTYPE array, one entry per row of `states`.
+
+    Burns are tangential, at times measured from the start of the trial. A trial
+    ends at its first catch or star collision; delta_v counts the burns made
+    before that. The range rate is sampled samples_per_orbit times per orbit of
+    the fastest ship, like the planner does, rather than per tick.
+    """
+    count = len(states)
+    results = np.zeros(count, dtype=RESULT_DTYPE)
+    results['catch_time'] = np.nan
+    if count == 0:
+        return results
+
+    fleet = Fleet(config.mu, capacity=2 * count, solver=config.kepler_solver)
+    ship = fleet.add_states(states[:, 0:2], states[:, 2:4])
+    debris = fleet.add_states(states[:, 4:6], states[:, 6:8])
+    catch_reach = (config.ship_radius + config.debris_radius) * config.world_radius
+    star_reach = (config.planet_radius + config.ship_radius) * config.world_radius
+
+    active = np.ones(count, dtype=bool)
+    burns = sorted((burn for burn in burns if burn.time < horizon), key=lambda burn: burn.time)
+    time = 0.0
+    for end, burn in zip([burn.time for burn in burns] + [horizon], burns + [None]):
+        duration = end - time
+        rows = np.nonzero(active)[0]
+        if duration > 0 and len(rows):
+            orbits = duration * fleet.n[ship[rows]].max() / (2 * np.pi)
+            samples = max(int(np.ceil(samples_per_orbit * orbits)), 8)
+            caught, crashed, t_catch = rendezvous_outcome(fleet, ship[rows], debris[rows], catch_reach, star_reach,
+                                                          duration, samples)
+            results['caught'][rows[caught]] = True
+            results['catch_time'][rows[caught]] = time + t_catch[caught]
+            results['crashed'][rows[crashed]] = True
+            active[rows[caught | crashed]] = False
+            fleet.propagate(duration)
+            time = end
+        if burn is not None:
+            rows = ship[active]
+            r, v = fleet.get_states(rows)
+            fleet.set_states(rows, r, v + burn.delta_v * v / np.linalg.norm(v, axis=1)[:, None])
+            results['delta_v'][active] += abs(burn.delta_v)
+    return results
+
+
+def run_trial(config, burns, horizon):
+    """Step one GameModel tick by tick through the burn sequence; reference for simulate().
+
+    Returns (caught, crashed, catch_time, delta_v).
+    """
+    model = GameModel(config)
+    model.pending_burns = sorted((Burn(burn.time, burn.delta_v) for burn in burns), key=lambda burn: burn.time)
+    while model.time < horizon and not (model.collided_with_star or model.caught_satellite):
+        model.update()
+    delta_v = sum(abs(burn.delta_v) for burn in burns if burn.time <= model.time)
+    catch_time = model.time if model.caught_satellite else np.nan
+    return model.caught_satellite, model.collided_with_star, catch_time, delta_v
+
+
+@dataclass
+class MonteCarloResult:
+    caught: np.ndarray
+    crashed: np.ndarray
+    catch_time: np.ndarray  # seconds after the start, nan unless caught
+    delta_v: np.ndarray  # m/s spent before the trial ended
+
+    @property
+    def catch_rate(self):
+        return float(np.mean(self.caught)) if len(self.caught) else 0.0
+
+    @property
+    def crash_rate(self):
+        return float(np.mean(self.crashed)) if len(self.crashed) else 0.0
+
+    def summary(self, percentiles=(5, 50, 95)):
+        """Catch and crash rates and percentiles of time-to-catch and delta-v over the caught trials."""
+        times = self.catch_time[self.caught]
+        spent = self.delta_v[self.caught]
+        summary = {'trials': len(self.caught), 'catch_rate': self.catch_rate, 'crash_rate': self.crash_rate}
+        for name, values in (('catch_time', times), ('delta_v', spent)):
+            summary[name] = {f"p{p}": float(value) for p, value in
+                             zip(percentiles, np.percentile(values, percentiles))} if len(values) else {}
+        return summary
+
+
+# worker side: views onto the shared blocks, set once per process by _attach
+_shared = {}
+
+
+def _attach(states_name, results_name, trials, config, burns, horizon):
+    for key, name, shape, dtype in (('states', states_name, (trials, STATE_COLUMNS), np.float64),
+                                    ('results', results_name, (trials,), RESULT_DTYPE)):
+        block = shared_memory.SharedMemory(name=name)
+        _shared[key + '_block'] = block  # keep the mapping alive
+        _shared[key] = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+    _shared['states'].flags.writeable = False
+    _shared.update(config=config, burns=burns, horizon=horizon)
+
+
+def _run_chunk(start, stop):
+    _shared['results'][start:stop] = simulate(_shared['config'], _shared['burns'], _shared['states'][start:stop],
+                                              _shared['horizon'])
+    return stop - start
+
+
+class MonteCarloRunner:
+    """Statistics of one burn sequence over perturbed initial conditions."""
+
+    def __init__(self, config=None, burns=(), horizon=None, sigma_position=1000.0, sigma_velocity=1.0,
+                 chunk_size=4096, workers=None):
+        self.config = config or OrbitConfig()
+        self.burns = list(burns)
+        if horizon is None:
+            # long enough for the burns and two more ship orbits
+            model = GameModel(self.config)
+            period = 2 * np.pi / model.ships[0].n
+            horizon = max((burn.time for burn in self.burns), default=0.0) + 2 * period
+        self.horizon = horizon
+        self.sigma_position = sigma_position
+        self.sigma_velocity = sigma_velocity
+        self.chunk_size = chunk_size
+        self.workers = os.cpu_count() if workers is None else workers
+
+    def run(self, trials, seed=0):
+        states_block = shared_memory.SharedMemory(create=True, size=trials * STATE_COLUMNS * 8 or 1)
+        results_block = shared_memory.SharedMemory(create=True, size=trials * RESULT_DTYPE.itemsize or 1)
+        try:
+            states = np.ndarray((trials, STATE_COLUMNS), dtype=np.float64, buffer=states_block.buf)
+            results = np.ndarray((trials,), dtype=RESULT_DTYPE, buffer=results_block.buf)
+            sample_states(self.config, trials, self.sigma_position, self.sigma_velocity, seed, self.chunk_size,
+                          out=states)
+            chunks = [(start, min(start + self.chunk_size, trials)) for start in range(0, trials, self.chunk_size)]
+            if self.workers <= 1:
+                for start, stop in chunks:
+                    results[start:stop] = simulate(self.config, self.burns, states[start:stop], self.horizon)
+            else:
+                initargs = (states_block.name, results_block.name, trials, self.config, self.burns, self.horizon)
+                with ProcessPoolExecutor(self.workers, initializer=_attach, initargs=initargs) as pool:
+                    list(pool.map(_run_chunk, *zip(*chunks)))
+            result = MonteCarloResult(results['caught'].copy(), results['crashed'].copy(),
+                                      results['catch_time'].copy(), results['delta_v'].copy())
+            del states, results  # release the exported buffers before closing
+        finally:
+            for block in (states_block, results_block):
+                block.close()
+                block.unlink()
+        return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Monte Carlo statistics of a rendezvous burn sequence")
+    parser.add_argument("--trials", type=int, default=100_000)
+    parser.add_argument("--burn", type=float, nargs=2, action="append", default=[], metavar=("TIME", "DELTA_V"),
+                        help="tangential burn, seconds after the start and m/s; repeatable")
+    parser.add_argument("--autopilot", action="store_true", help="use the rendezvous planner's nominal plan")
+    parser.add_argument("--sigma-position", type=float, default=1000.0, help="m")
+    parser.add_argument("--sigma-velocity", type=float, default=1.0, help="m/s")
+    parser.add_argument("--horizon", type=float, help="seconds simulated per trial")
+    parser.add_argument("--workers", type=int, help="processes, default one per CPU")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    config = OrbitConfig()
+    burns = [Burn(time, delta_v) for time, delta_v in args.burn]
+    if args.autopilot:
+        from src.planner import RendezvousPlanner
+        plan = RendezvousPlanner(GameModel(config)).search()
+        burns = plan.burns if plan is not None else []
+    runner = MonteCarloRunner(config, burns, args.horizon, args.sigma_position, args.sigma_velocity,
+                              workers=args.workers)
+    summary = runner.run(args.trials, args.seed).summary()
+    print(f"{summary['trials']} trials: caught {summary['catch_rate']:.1%}, crashed {summary['crash_rate']:.1%}")
+    for name in ('catch_time', 'delta_v'):
+        print(f"  {name}: " + ", ".join(f"{p} {value:.1f}" for p, value in summary[name].items()))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,51 @@
 import pygame
+from time import perf_counter
 
 from src.orbit_model import GameModel
 from src.orbit_view import OrbitRenderer
+from src.planner import RendezvousPlanner
+from src.profiling import FrameProfiler, NullProfiler
+from src.replay import Action, InputRecorder, apply_action
+from src.server import SessionClient
 from src.config import OrbitConfig
 
+KEY_ACTIONS = {
+    pygame.K_UP: Action.PROGRADE,
+    pygame.K_DOWN: Action.RETROGRADE,
+    pygame.K_PERIOD: Action.WARP_UP,
+    pygame.K_COMMA: Action.WARP_DOWN,
+    pygame.K_1: Action.SKIP_PERIAPSIS,
+    pygame.K_2: Action.SKIP_APOAPSIS,
+    pygame.K_3: Action.SKIP_APPROACH,
+}
+
+
+class FramePacer:
+    """Sleep out the rest of each frame, stretching frames under sustained load.
+
+    The target frame interval is 1 / fps. When a frame's work keeps taking
+    longer than that, the interval grows towards the smoothed work time, up to
+    1 / min_fps, so an overloaded host gets evenly spaced frames and some idle
+    time instead of a loop running flat out. It shrinks back as the load eases.
+    """
+
+    HEADROOM = 1.25  # interval kept above the smoothed work time
+
+    def __init__(self, fps, min_fps, smoothing=0.1):
+        self.target = 1.0 / fps
+        self.longest = 1.0 / min(min_fps, fps)
+        self.smoothing = smoothing
+        self.work = 0.0  # smoothed seconds of work per frame
+        self.interval = self.target
+
+    def wait(self, work_time):
+        """Sleep for what is left of the frame after `work_time` seconds of work."""
+        self.work += self.smoothing * (work_time - self.work)
+        self.interval = min(max(self.target, self.HEADROOM * self.work), self.longest)
+        remaining = self.interval - work_time
+        if remaining > 0:
+            pygame.time.wait(int(remaining * 1000))
+
 
 class OrbitController:
     """Handles user input and coordinates between model and view."""
@@ -12,15 +54,43 @@ class OrbitController:
 
         self.config = config or OrbitConfig()
         self.model = GameModel(self.config)
+        if self.config.history_spill_path:
+            self.model.enable_history_spill(self.config.history_spill_path)
         self.view = OrbitRenderer(self.config)
-        self.clock = pygame.time.Clock()
         self.fps = self.config.fps
+        self.pacer = FramePacer(self.fps, self.config.min_fps)
         self.running = True
         self.paused = self.config.paused
-
-    def handle_events(self):
-        """Process all pygame events"""
-        for event in pygame.event.get():
+        self.redraw = True  # something changed that a paused game has not shown yet
+        self.tick_length = 1.0 / self.config.physics_rate
+        self.accumulator = 0.0
+        self.planner = None  # active autopilot search, if any
+        self.recorder = InputRecorder(self.config.record_path, self.config) if self.config.record_path else None
+        # with a server the model is a mirror of the server's session, only burns are forwarded
+        self.client = SessionClient.connect(self.config.server_address) if self.config.server_address else None
+        if self.client is not None:
+            # the server's VectorOrbitEnv is two-body only; a perturbed mirror would drift between keyframes
+            self.model.fleet.propagator = None
+        if self.config.profile:
+            self.profiler = FrameProfiler(window=self.config.profile_window)
+            self.view.profiler = self.profiler
+        else:
+            self.profiler = NullProfiler()
+
+    def handle_events(self, timeout=None):
+        """Process all pygame events.
+
+        With a timeout in seconds, and no events queued, block until the next
+        event arrives or the timeout expires, sleeping rather than spinning.
+        """
+        events = pygame.event.get()
+        if not events and timeout:
+            event = pygame.event.wait(int(timeout * 1000))
+            if event.type != pygame.NOEVENT:
+                events = [event] + pygame.event.get()
+        for event in events:
+            if event.type != pygame.MOUSEMOTION:
+                self.redraw = True
             if event.type == pygame.QUIT:
                 self.running = False
             elif event.type == pygame.KEYDOWN:
@@ -28,26 +98,122 @@ class OrbitController:
                     self.paused = not self.paused
                 elif event.key == pygame.K_ESCAPE:
                     self.running = False
-                elif event.key == pygame.K_DOWN:
-                    self.model.change_orbit(False)
-                elif event.key == pygame.K_UP:
-                    self.model.change_orbit(True)
+                elif event.key in KEY_ACTIONS:
+                    self.perform(KEY_ACTIONS[event.key])
+                elif event.key == pygame.K_x:
+                    self.start_autopilot()
+                elif event.key == pygame.K_v:
+                    self.view.show_preview = not self.view.show_preview
+
+    def perform(self, action):
+        """Apply a model-changing action, recording it when a session log is open.
+
+        An autopilot search in progress is restarted from the changed state, so
+        the plan it hands over, like the replayed AUTOPILOT action, starts from
+        the state after every action before it.
+        """
+        if self.client is not None:
+            self.client.send(action)
+            return
+        if self.recorder is not None:
+            self.recorder.record(self.model.tick, action)
+        apply_action(self.model, action)
+        if self.planner is not None:
+            game_over = self.model.collided_with_star or self.model.caught_satellite
+            self.planner = None if game_over else RendezvousPlanner(self.model)
+
+    def start_autopilot(self):
+        """Start searching for a rendezvous plan, spread over the next frames."""
+        if self.client is not None:
+            print("Autopilot: not available when playing on a server")
+            return
+        self.planner = RendezvousPlanner(self.model)
+
+    def step_autopilot(self):
+        """Run one frame's share of the plan search; hand a finished plan to the model."""
+        plan = self.planner.step(self.config.planner_time_budget)
+        if self.planner.done:
+            self.planner = None
+            if plan is None:
+                print("Autopilot: no rendezvous plan found")
+            else:
+                if self.recorder is not None:
+                    self.recorder.record(self.model.tick, Action.AUTOPILOT)
+                self.model.execute_plan(plan)
+                print(f"Autopilot: {len(plan.burns)} burn(s), {plan.total_delta_v:.0f} m/s")
+
+    def step(self, frame_time):
+        """Advance physics by whole ticks for `frame_time` real seconds.
+
+        Leftover time is carried to the next frame. At most max_substeps ticks run
+        per frame; beyond that the backlog is dropped, so a slow frame cannot snowball.
+        Physics holds still while the autopilot is planning from its snapshot.
+        Returns the interpolation factor between the last two physics states.
+        On a server the server's ticks are applied instead, as they arrive.
+        """
+        if self.client is not None:
+            self.client.poll(self.model)
+            if not self.client.connected:
+                self.running = False
+            return 1.0
+        if self.planner is not None:
+            self.step_autopilot()
+            return self.accumulator / self.tick_length
+        self.accumulator += frame_time
+        steps = 0
+        while self.accumulator >= self.tick_length:
+            if steps == self.config.max_substeps:
+                self.accumulator = 0.0
+                break
+            self.model.update()
+            self.accumulator -= self.tick_length
+            steps += 1
+            if self.model.collided_with_star or self.model.caught_satellite:
+                self.accumulator = 0.0
+                return 1.0
+        return self.accumulator / self.tick_length
 
     def run(self):
-        """Main game loop."""
+        """Main game loop: fixed-rate physics, rendering at fps.
 
-        while self.running:
-
-            # Handle input
-            self.handle_events()
+        While paused the loop sleeps in handle_events until input arrives and
+        redraws only when something changed.
+        """
 
-            if not self.paused:
+        profiler = self.profiler
+        previous = perf_counter()
+        was_paused = self.paused
+        alpha = 1.0
+        while self.running:
+            profiler.begin_frame()
+            frame_start = perf_counter()
+
+            # Handle input, blocking while there is nothing to do
+            idle = self.paused and not self.redraw
+            self.handle_events(self.config.idle_timeout if idle else None)
+            profiler.mark('events')
+
+            now = perf_counter()
+            # time spent paused is not played back on resume
+            frame_time = 0.0 if was_paused else now - previous
+            previous = now
+            was_paused = self.paused
+
+            if self.paused:
+                if not self.redraw:
+                    continue  # woke up for nothing; the wait is not a frame
+                self.view.render(self.model, alpha)
+                self.redraw = False
+                profiler.mark('render')
+            else:
 
                 # Update game logic
-                self.model.update()
+                alpha = self.step(frame_time)
+                profiler.mark('update')
 
                 # Render
-                self.view.render(self.model)
+                self.view.render(self.model, alpha)
+                profiler.mark('render')
 
                 # exit conditions
                 if self.model.collided_with_star:
@@ -57,7 +223,18 @@ class OrbitController:
                     self.running = False
                     print("Caught the satellite, you win")
 
-                self.clock.tick(self.fps)
+                self.redraw = False
+                self.pacer.wait(perf_counter() - frame_start)
+                profiler.mark('idle')
+            profiler.end_frame()
+
+        if profiler.enabled and self.config.profile_export:
+            profiler.export(self.config.profile_export)
+        if self.recorder is not None:
+            self.recorder.close(self.model)
+        self.model.close_history()
+        if self.client is not None:
+            self.client.close()
         self.cleanup()
 
     @staticmethod
@@ -1,20 +1,272 @@
 # from random import randrange
 # from copy import deepcopy
 # random.seed(1)
+from dataclasses import dataclass
 import numpy as np
 from src.config import OrbitConfig
+from src.collision import ConjunctionFilter, broad_phase, closest_approach
+from src.history import TrajectoryHistory
+from src.kepler import NewtonSolver, get_solver, propagate_universal, time_since_periapsis
+from src.perturbations import PerturbedPropagator
 
 # screen is square
 # sizes are relative to the screen: -1 to 1
 
+# Orbits from this eccentricity on, open ones included, go through the universal-variable
+# path: Kepler's equation in E converges slowly near e = 1 and has no solution beyond.
+# Open orbits keep the same elements with a < 0, n = sqrt(mu / |a|^3) and the
+# hyperbolic mean anomaly M = e sinh(H) - H, which grows without wrapping.
+# Within about 1e-9 of e = 1 the periapsis distance a (1 - e) keeps only some
+# seven digits; an exact parabola (zero energy) has no finite a at all.
+UNIVERSAL_ECCENTRICITY = 0.95
+
+
+def elements_from_state(r, v, mu):
+    """Convert Cartesian states of shape (N, 2) to orbital elements (a, e, omega, M, n)."""
+    r = np.atleast_2d(np.asarray(r, dtype=float))
+    v = np.atleast_2d(np.asarray(v, dtype=float))
+    rnorm = np.linalg.norm(r, axis=1)
+    vnorm = np.linalg.norm(v, axis=1)
+
+    # Specific orbital energy → semi-major axis
+    energy = vnorm ** 2 / 2 - mu / rnorm
+    with np.errstate(divide='ignore'):
+        a = -mu / (2 * energy)
+
+    # Eccentricity vector
+    r_dot_v = np.einsum('ij,ij->i', r, v)
+    e_vec = (1 / mu) * ((vnorm ** 2 - mu / rnorm)[:, None] * r - r_dot_v[:, None] * v)
+    e = np.linalg.norm(e_vec, axis=1)
+
+    # argument of periapsis
+    omega = np.arctan2(e_vec[:, 1], e_vec[:, 0])
+
+    # true anomaly
+    f = np.arctan2(r[:, 1], r[:, 0]) - omega
+
+    # eccentric anomaly
+    with np.errstate(invalid='ignore'):
+        E = 2 * np.arctan(np.tan(f / 2) * np.sqrt((1 - e) / (1 + e)))
+    E = np.where(E < 0, E + 2 * np.pi, E)
+
+    # mean anomaly
+    M = E - e * np.sin(E)
+
+    # Mean motion
+    n = np.sqrt(mu / np.abs(a) ** 3)
+
+    universal = e >= UNIVERSAL_ECCENTRICITY
+    if universal.any():
+        # time since periapsis from the universal anomaly, with q from the angular momentum
+        # rather than a (1 - e), which loses every digit near a parabola
+        h = r[universal, 0] * v[universal, 1] - r[universal, 1] * v[universal, 0]
+        e_u = e[universal]
+        t = time_since_periapsis(h ** 2 / (mu * (1 + e_u)), e_u, -2 * energy[universal] / mu, f[universal], mu)
+        M_u = n[universal] * t
+        M[universal] = np.where(e_u < 1, np.mod(M_u, 2 * np.pi), M_u)
+    return a, e, omega, M, n
+
+
+def solve_kepler(M, e, tol=1e-10, max_iter=50):
+    """Solve Kepler's equation E - e sin(E) = M element-wise by Newton's method."""
+    return NewtonSolver(tol, max_iter)(M, e)
+
+
+def state_from_elements(a, e, omega, M, mu, solver=None):
+    """Return (r, v), each of shape (N, 2), from arrays of orbital elements.
+
+    Elements with e >= UNIVERSAL_ECCENTRICITY are propagated from their
+    periapsis with universal variables; the solver only sees the others.
+    """
+    a, e, omega, M = np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in (a, e, omega, M)))
+    universal = e >= UNIVERSAL_ECCENTRICITY
+    if not universal.any():
+        return _elliptic_state(a, e, omega, M, mu, solver)
+    r = np.empty(a.shape + (2,))
+    v = np.empty(a.shape + (2,))
+    elliptic = ~universal
+    r[elliptic], v[elliptic] = _elliptic_state(a[elliptic], e[elliptic], omega[elliptic], M[elliptic], mu, solver)
+    r[universal], v[universal] = _universal_state(a[universal], e[universal], omega[universal], M[universal], mu)
+    return r, v
+
+
+def _universal_state(a, e, omega, M, mu):
+    """State M / n seconds after periapsis, for any conic."""
+    n = np.sqrt(mu / np.abs(a) ** 3)
+    # the nearest periapsis of an ellipse keeps the universal anomaly small
+    M = np.where(e < 1, np.mod(M + np.pi, 2 * np.pi) - np.pi, M)
+    q = a * (1 - e)
+    cos_w, sin_w = np.cos(omega), np.sin(omega)
+    r0 = q[:, None] * np.column_stack([cos_w, sin_w])
+    v0 = np.sqrt(mu * (1 + e) / q)[:, None] * np.column_stack([-sin_w, cos_w])
+    return propagate_universal(r0, v0, M / n, mu)
+
+
+def _elliptic_state(a, e, omega, M, mu, solver=None):
+    # Solve Kepler’s equation
+    E = get_solver(solver)(M, e)
+    cos_E, sin_E = np.cos(E), np.sin(E)
+
+    # True anomaly
+    f = 2 * np.arctan(np.sqrt((1 + e) / (1 - e)) * np.tan(E / 2))
+
+    # Radius
+    r_mag = a * (1 - e * cos_E)
+
+    # Position and velocity in perifocal coords
+    r_pf = np.stack([r_mag * np.cos(f), r_mag * np.sin(f)], axis=-1)
+    rdot = (np.sqrt(mu * a) / r_mag)[..., None] * np.stack([-sin_E, np.sqrt(1 - e ** 2) * cos_E], axis=-1)
+
+    # Rotate by omega
+    cos_w, sin_w = np.cos(omega), np.sin(omega)
+    r = np.stack([cos_w * r_pf[..., 0] - sin_w * r_pf[..., 1],
+                  sin_w * r_pf[..., 0] + cos_w * r_pf[..., 1]], axis=-1)
+    v = np.stack([cos_w * rdot[..., 0] - sin_w * rdot[..., 1],
+                  sin_w * rdot[..., 0] + cos_w * rdot[..., 1]], axis=-1)
+    return r, v
+
+
+class Fleet:
+    """Structure-of-arrays store of orbital elements for many bodies.
+
+    Each element (a, e, omega, M, n) is a contiguous float array with one row
+    per body, so propagation and state evaluation run as single NumPy calls.
+    """
+
+    ELEMENTS = ('a', 'e', 'omega', 'M', 'n')
+
+    def __init__(self, mu, capacity=8, solver=None, propagator=None):
+        self.mu = mu
+        self.solver = get_solver(solver)
+        self.propagator = propagator  # None: two-body motion only
+        self.size = 0
+        self._storage = {name: np.full(max(capacity, 1), np.nan) for name in self.ELEMENTS}
+
+    def __len__(self):
+        return self.size
+
+    @property
+    def a(self):
+        return self._storage['a'][:self.size]
+
+    @property
+    def e(self):
+        return self._storage['e'][:self.size]
+
+    @property
+    def omega(self):
+        return self._storage['omega'][:self.size]
+
+    @property
+    def M(self):
+        return self._storage['M'][:self.size]
+
+    @property
+    def n(self):
+        return self._storage['n'][:self.size]
+
+    def _reserve(self, count):
+        capacity = len(self._storage['a'])
+        if self.size + count <= capacity:
+            return
+        while capacity < self.size + count:
+            capacity *= 2
+        for name, column in self._storage.items():
+            grown = np.full(capacity, np.nan)
+            grown[:self.size] = column[:self.size]
+            self._storage[name] = grown
+
+    def add(self, count=1):
+        """Append `count` rows with undefined elements, return the index of the first one."""
+        self._reserve(count)
+        first = self.size
+        self.size += count
+        return first
+
+    def add_states(self, r, v):
+        """Append bodies from Cartesian states of shape (N, 2), return their indices."""
+        elements = elements_from_state(r, v, self.mu)
+        first = self.add(len(elements[0]))
+        rows = np.arange(first, self.size)
+        self.set_elements(rows, *elements)
+        return rows
+
+    def set_elements(self, idx, a, e, omega, M, n):
+        self.a[idx] = a
+        self.e[idx] = e
+        self.omega[idx] = omega
+        self.M[idx] = M
+        self.n[idx] = n
+
+    def set_states(self, idx, r, v):
+        """Overwrite the elements of rows `idx` from Cartesian states."""
+        self.set_elements(idx, *elements_from_state(r, v, self.mu))
+
+    def propagate(self, dt):
+        """Advance every body by dt seconds.
+
+        Two-body motion only updates the mean anomaly. With a perturbation
+        propagator, the bodies it finds significantly perturbed are integrated
+        instead and get new osculating elements.
+        """
+        perturbed = None
+        if self.propagator is not None and dt:
+            perturbed = self.propagator.perturbed_rows(self)
+            r, v = self.get_states(perturbed)
+        M = self.M
+        M += self.n * dt
+        # open orbits never come round again
+        np.mod(M, 2 * np.pi, out=M, where=self.e < 1)
+        if perturbed is not None and len(perturbed):
+            self.set_states(perturbed, *self.propagator.integrate(r, v, dt))
+
+    def get_states(self, idx=None, dt=0.0):
+        """Return (r, v) arrays of shape (N, 2) for all bodies, or for rows `idx`.
+
+        A non-zero dt (scalar or one value per row) evaluates the states that many
+        seconds after the current epoch without changing the stored elements.
+        """
+        if idx is None:
+            idx = slice(None)
+        M = self.M[idx]
+        if np.any(dt):
+            M = M + self.n[idx] * dt
+            M = np.where(self.e[idx] < 1, np.mod(M, 2 * np.pi), M)
+        return state_from_elements(self.a[idx], self.e[idx], self.omega[idx], M, self.mu, self.solver)
+
+
+class _Element:
+    """Scalar attribute of a Planet backed by one column of its fleet."""
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, planet, owner=None):
+        if planet is None:
+            return self
+        return getattr(planet.fleet, self.name)[planet.index]
+
+    def __set__(self, planet, value):
+        getattr(planet.fleet, self.name)[planet.index] = value
+
 
 class Planet:
+    a = _Element()
+    e = _Element()
+    omega = _Element()
+    M = _Element()
+    n = _Element()
 
-    def __init__(self, name, position, velocity, mu, color, radius_ratio):
+    def __init__(self, name, position, velocity, mu, color, radius_ratio, fleet=None):
         r = np.array(position, dtype=float)
         v = np.array(velocity, dtype=float)
         self.mu = mu
-        self.M = self.a = self.e = self.omega = self.n = None
+        self.fleet = fleet if fleet is not None else Fleet(mu, capacity=1)
+        self.index = self.fleet.add()
+        # memoized (key, (r, v)) of the last evaluated epoch
+        self._state_cache = None
+        self.cache_hits = 0
+        self.cache_misses = 0
         if r[0]:
             self.set_state(r, v)
         self.name = name
@@ -26,73 +278,49 @@ class Planet:
 
     def propagate(self, dt):
         """Advance epoch by dt seconds (update mean anomaly only)."""
-        self.M = (self.M + self.n * dt) % (2 * np.pi)
+        M = self.M + self.n * dt
+        self.M = M % (2 * np.pi) if self.e < 1 else M
+        self._state_cache = None
 
-    def get_state(self):
-        """Return (r, v) from stored orbital elements."""
-
-        # Solve Kepler’s equation
-        E = self.solve_kepler(self.M, self.e)
-
-        # True anomaly
-        f = 2 * np.arctan(np.sqrt((1 + self.e) / (1 - self.e)) * np.tan(E / 2))
-
-        # Radius
-        r_mag = self.a * (1 - self.e * np.cos(E))
-        r_pf = np.array([r_mag * np.cos(f), r_mag * np.sin(f)])
+    def state_at(self, dt):
+        """Return (r, v) dt seconds from the current epoch without changing it."""
+        r, v = self.fleet.get_states([self.index], dt)
+        return r[0], v[0]
 
-        # Velocity in perifocal coords
-        rdot = np.sqrt(self.mu * self.a) / r_mag * np.array([-np.sin(E), np.sqrt(1 - self.e ** 2) * np.cos(E)])
+    def _state_key(self):
+        return self.M, self.a, self.e, self.omega
 
-        # Rotate by omega
-        R = np.array([[np.cos(self.omega), -np.sin(self.omega)],
-                      [np.sin(self.omega), np.cos(self.omega)]])
-
-        r = R @ r_pf
-        v = R @ rdot
+    def get_state(self):
+        """Return (r, v) from stored orbital elements.
+
+        The result is memoized on the current mean anomaly and element set, so
+        every consumer within one tick shares a single evaluation. The returned
+        arrays are read-only.
+        """
+        key = self._state_key()
+        if self._state_cache is not None and self._state_cache[0] == key:
+            self.cache_hits += 1
+            return self._state_cache[1]
+        self.cache_misses += 1
+        r, v = self.fleet.get_states([self.index])
+        return self.cache_state(r[0], v[0])
+
+    def cache_state(self, r, v):
+        """Store an externally evaluated (r, v) for the current epoch, e.g. from a fleet-wide call."""
+        r, v = np.array(r, dtype=float), np.array(v, dtype=float)
+        r.setflags(write=False)
+        v.setflags(write=False)
+        self._state_cache = (self._state_key(), (r, v))
         return r, v
 
     def set_state(self, r, v):
         # convert Cartesian state -> orbital elements
-        rnorm = np.linalg.norm(r)
-        vnorm = np.linalg.norm(v)
-
-        # Specific orbital energy → semi-major axis
-        energy = vnorm ** 2 / 2 - self.mu / rnorm
-        self.a = -self.mu / (2 * energy)
-
-        # Eccentricity vector
-        e_vec = (1 / self.mu) * ((vnorm ** 2 - self.mu / rnorm) * r - np.dot(r, v) * v)
-        self.e = np.linalg.norm(e_vec)
-
-        # argument of periapsis
-        self.omega = np.arctan2(e_vec[1], e_vec[0])
-
-        # true anomaly
-        f = np.arctan2(r[1], r[0]) - self.omega
-
-        # eccentric anomaly
-        E = 2 * np.arctan(np.tan(f / 2) * np.sqrt((1 - self.e) / (1 + self.e)))
-        if E < 0:
-            E += 2 * np.pi
-
-        # mean anomaly
-        self.M = E - self.e * np.sin(E)
-
-        # Mean motion
-        self.n = np.sqrt(self.mu / self.a ** 3)
+        self.fleet.set_states([self.index], np.asarray(r)[None], np.asarray(v)[None])
+        self._state_cache = None
 
     @staticmethod
     def solve_kepler(M, e, tol=1e-10, max_iter=50):
-        E = M if e < 0.8 else np.pi
-        for _ in range(max_iter):
-            f = E - e * np.sin(E) - M
-            fprime = 1 - e * np.cos(E)
-            dE = -f / fprime
-            E += dE
-            if abs(dE) < tol:
-                break
-        return E
+        return float(solve_kepler(M, e, tol, max_iter))
 
     def add_delta_v(self, delta_v):
         """Apply instantaneous delta_v (updates elements via set_state)."""
@@ -105,7 +333,27 @@ class Planet:
         return self.a * (1 - self.e), self.omega
 
     def apoapsis(self):
-        return self.a * (1 + self.e), (self.omega + np.pi) % (2*np.pi)
+        # open orbits never turn back
+        distance = self.a * (1 + self.e) if self.e < 1 else np.inf
+        return distance, (self.omega + np.pi) % (2*np.pi)
+
+
+@dataclass
+class ManeuverPreview:
+    """Predicted outcome of each candidate tangential burn, one row per candidate."""
+
+    delta_v: np.ndarray
+    a: np.ndarray
+    e: np.ndarray
+    omega: np.ndarray
+    min_distance: np.ndarray  # metres
+    time_of_min: np.ndarray  # absolute model time of the closest approach
+    computed_at: float
+
+    @property
+    def best(self):
+        """Row of the candidate that passes closest to the debris."""
+        return int(np.argmin(self.min_distance))
 
 
 class GameModel:
@@ -113,15 +361,86 @@ class GameModel:
     def __init__(self, config: OrbitConfig = None):
         self.config = config or OrbitConfig()
 
+        propagator = None
+        if self.config.propagator == 'perturbed':
+            propagator = PerturbedPropagator.from_config(self.config)
+        elif self.config.propagator != 'kepler':
+            raise ValueError(f"unknown propagator {self.config.propagator!r}, expected 'kepler' or 'perturbed'")
+        self.fleet = Fleet(self.config.mu, solver=self.config.kepler_solver, propagator=propagator)
         self.star = Planet("Star", (0.0, 0.0), (0.0, 0.0), self.config.mu,
                            self.config.planet_color, self.config.planet_radius)
         self.ships = \
             [Planet("ship1", self.config.ship_position, self.config.ship_velocity, self.config.mu,
-                    self.config.ship_color, self.config.ship_radius),
+                    self.config.ship_color, self.config.ship_radius, self.fleet),
              Planet("debris", self.config.debris_position, self.config.debris_velocity, self.config.mu,
-                    self.config.debris_color, self.config.debris_radius)]
+                    self.config.debris_color, self.config.debris_radius, self.fleet)]
+        # body index 0 is the star, index k + 1 is fleet row k;
+        # bodies lists the Planet views, bulk debris rows have none
+        self.bodies = [self.star] + self.ships
+        self.radii = np.array([body.radius_ratio for body in self.bodies])
+        self.colors = np.array([body.color for body in self.bodies], dtype=np.uint8)
+        self.collisions = (np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp))
+        # bodies whose orbits can reach the player's, screened by periapsis/apoapsis shells
+        self.conjunctions = ConjunctionFilter(subjects=[self.ships[0].index])
         self.collided_with_star = False
         self.caught_satellite = False
+        self.tick = 0
+        self.time = 0.0  # simulated seconds since start
+        self.warp_level = 0  # index into config.time_warp_levels
+        self._preview = None  # (elements key, ManeuverPreview)
+
+        # debris catalog: memory-mapped now, paged into the fleet as the game runs
+        self.catalog = None
+        self.catalog_rows = np.empty(0, dtype=np.intp)  # fleet rows of the catalog bodies loaded so far
+        if self.config.catalog_path:
+            from src.catalog import Catalog
+            self.catalog = Catalog(self.config.catalog_path)
+        self.pending_burns = []  # autopilot burns (objects with .time and .delta_v), sorted by time
+
+        # trajectory history, created on the first tick once the fleet is complete
+        self.history = None
+        self.history_rows = None  # fleet rows recorded, in history body order
+        self.history_spill_path = None  # set by enable_history_spill
+        self._states = None  # (time, r, v) of the last fleet-wide evaluation
+
+    def add_debris(self, r, v, radius_ratio=None, color=None):
+        """Add many debris bodies from Cartesian states of shape (N, 2), return their fleet rows."""
+        rows = self.fleet.add_states(r, v)
+        radius_ratio = self.config.debris_radius if radius_ratio is None else radius_ratio
+        color = self.config.debris_color if color is None else color
+        self.radii = np.concatenate([self.radii, np.broadcast_to(radius_ratio, (len(rows),))])
+        self.colors = np.concatenate([self.colors, np.broadcast_to(np.asarray(color, dtype=np.uint8),
+                                                                   (len(rows), 3))])
+        return rows
+
+    def field_rows(self):
+        """Fleet rows of the bulk debris, i.e. the bodies without a Planet view."""
+        field = np.ones(len(self.fleet), dtype=bool)
+        field[[ship.index for ship in self.ships]] = False
+        return np.nonzero(field)[0]
+
+    def load_catalog(self, count=None):
+        """Copy the next `count` (default catalog_page_rows) catalog bodies into the fleet.
+
+        Called on every evaluation of the fleet, so a large catalog streams in
+        over the first frames instead of delaying the first one. Catalog
+        elements are at time 0; bodies join at the model's current time.
+        """
+        if self.catalog is None:
+            return
+        start = len(self.catalog_rows)
+        stop = min(start + (self.config.catalog_page_rows if count is None else count), len(self.catalog))
+        if stop <= start:
+            return
+        first = self.fleet.add(stop - start)
+        rows = np.arange(first, len(self.fleet))
+        a, e, omega, M, n = self.catalog.elements(start, stop)
+        M = M + n * self.time
+        np.mod(M, 2 * np.pi, out=M, where=e < 1)
+        self.fleet.set_elements(rows, a, e, omega, M, n)
+        self.catalog_rows = np.concatenate([self.catalog_rows, rows])
+        self.radii = np.concatenate([self.radii, self.catalog.radii(start, stop)])
+        self.colors = np.concatenate([self.colors, self.catalog.colors(start, stop)])
 
     def change_orbit(self, is_increase):
         if is_increase:
@@ -129,11 +448,240 @@ class GameModel:
         else:
             self.ships[0].add_delta_v(-self.config.delta_v)
 
+    @property
+    def time_warp(self):
+        return self.config.time_warp_levels[self.warp_level]
+
+    @property
+    def tick_duration(self):
+        """Simulated seconds advanced by one update at the current warp."""
+        return self.config.dt * self.time_warp
+
+    def change_time_warp(self, is_increase):
+        step = 1 if is_increase else -1
+        self.warp_level = min(max(self.warp_level + step, 0), len(self.config.time_warp_levels) - 1)
+
+    def preview_maneuvers(self):
+        """Predict the closest debris approach for every candidate burn.
+
+        Candidates are -preview_burns..+preview_burns multiples of delta_v, each
+        evaluated over preview_orbits of the current ship orbit in one batched
+        propagation. The burn happens where the ship is now, so the result
+        depends on the epoch as well as on the orbits: it is cached only until
+        the time or the ship's or the debris' elements change.
+        """
+        ship, debris = self.ships[0], self.ships[1]
+        key = (self.time, ship.a, ship.e, ship.omega, debris.a, debris.e, debris.omega)
+        if self._preview is not None and self._preview[0] == key:
+            return self._preview[1]
+
+        multiples = np.arange(-self.config.preview_burns, self.config.preview_burns + 1)
+        delta_v = multiples * self.config.delta_v
+        r, v = ship.get_state()
+        v_candidates = v + delta_v[:, None] * (v / np.linalg.norm(v))
+        r_candidates = np.broadcast_to(r, v_candidates.shape)
+
+        candidates = Fleet(self.config.mu, capacity=len(delta_v) + 1, solver=self.fleet.solver)
+        rows = candidates.add_states(r_candidates, v_candidates)
+        target = candidates.add_states(*[state[None] for state in debris.get_state()])
+
+        # escape candidates included: the universal-variable path propagates them like the others
+        horizon = self.config.preview_orbits * 2 * np.pi / ship.n
+        samples = self.config.preview_orbits * self.config.preview_samples_per_orbit
+        t_min, min_distance = closest_approach(candidates, rows, np.full(len(rows), target[0]), horizon,
+                                               samples=samples)
+        time_of_min = self.time + t_min
+
+        preview = ManeuverPreview(delta_v, candidates.a[rows].copy(), candidates.e[rows].copy(),
+                                  candidates.omega[rows].copy(), min_distance, time_of_min, self.time)
+        self._preview = (key, preview)
+        return preview
+
     def update(self):
+        self.advance(self.tick_duration)
+        self.tick += 1
+        self.record_history()
+
+    def record_history(self):
+        """Append the current states to the trajectory history."""
+        if not self.config.history_length:
+            return
+        if self.history is None:
+            if self.config.history_all_bodies:
+                # the whole catalog at once, so a spilling history keeps one body count
+                self.load_catalog(len(self.catalog) if self.catalog is not None else 0)
+                self.history_rows = np.arange(len(self.fleet))
+            else:
+                self.history_rows = np.array([ship.index for ship in self.ships])
+            self.history = TrajectoryHistory(self.config.history_length, len(self.history_rows),
+                                             self.history_spill_path)
+        elif self.config.history_all_bodies and len(self.history_rows) < len(self.fleet):
+            # debris added since the last tick
+            self.history_rows = np.arange(len(self.fleet))
+            self.history.grow(len(self.history_rows))
+        if self._states is not None and self._states[0] == self.time and len(self._states[1]) == len(self.fleet):
+            _, r, v = self._states
+        else:
+            r, v = self.fleet.get_states()
+        self.history.record(self.time, r, v, self.history_rows)
+
+    def trail(self, ship, count=None):
+        """(times, positions) of `ship` over its latest `count` recorded ticks, as views into the history."""
+        if self.history is None:
+            return np.empty(0), np.empty((0, 2))
+        body = np.nonzero(self.history_rows == ship.index)[0]
+        if not len(body):
+            return np.empty(0), np.empty((0, 2))
+        window = self.history.window(count)
+        return window['time'], window['r'][:, body[0]]
+
+    def enable_history_spill(self, path):
+        """Spill the history to a new file at `path`; call before the first tick.
+
+        Only the owner of a session does this, so models built for replays or
+        Monte Carlo trials from the same config never touch the file.
+        """
+        if self.history is not None:
+            raise ValueError("the history spill must be enabled before the first tick")
+        self.history_spill_path = path
+
+    def close_history(self):
+        if self.history is not None:
+            self.history.close()
+
+    def execute_plan(self, plan):
+        """Queue the burns of a planner.ManeuverPlan to fire at their exact times."""
+        self.pending_burns = sorted(plan.burns, key=lambda burn: burn.time)
+
+    def advance(self, duration):
+        """Jump every body `duration` seconds ahead analytically.
+
+        One swept check covers the whole interval, so the cost grows with the
+        number of orbits covered rather than with the number of ticks; on a hit
+        the model stops at the moment of the hit instead.
+        Pending autopilot burns inside the interval fire at their exact times.
+        """
+        self.load_catalog()
+        end = self.time + duration
+        while self.pending_burns and self.pending_burns[0].time <= end:
+            burn = self.pending_burns.pop(0)
+            self._coast(max(burn.time - self.time, 0.0))
+            if self.collided_with_star or self.caught_satellite:
+                self.pending_burns = []
+                return
+            self.ships[0].add_delta_v(burn.delta_v)
+        self._coast(end - self.time)
+
+    def _coast(self, duration):
+        swept_star = swept_catch = False
+        if self.config.swept_collisions and duration > 0:
+            swept_star, swept_catch, hit_time = self.detect_swept_collision(duration)
+            if hit_time is not None:
+                duration = hit_time
+        self.fleet.propagate(duration)
+        self.time += duration
+        self.collisions = self.detect_collisions()
+        collided_with_star, caught_satellite = self.player_hits(*self.collisions)
+        self.collided_with_star = collided_with_star or swept_star
+        self.caught_satellite = caught_satellite or swept_catch
+
+    def time_to_periapsis(self, ship=None):
+        """Seconds until the next periapsis passage (a full period if at periapsis now)."""
+        ship = ship or self.ships[0]
+        if ship.e >= 1:
+            # inf once past periapsis for good
+            return -ship.M / ship.n if ship.M < 0 else np.inf
+        return (2 * np.pi - ship.M) / ship.n
+
+    def time_to_apoapsis(self, ship=None):
+        """Seconds until the next apoapsis passage, inf on an open orbit."""
+        ship = ship or self.ships[0]
+        if ship.e >= 1:
+            return np.inf
+        return ((np.pi - ship.M) % (2 * np.pi) or 2 * np.pi) / ship.n
+
+    def time_to_close_approach(self, horizon=None):
+        """Seconds until the closest predicted player-debris approach within `horizon`.
+
+        The default horizon is the longer of the two orbital periods.
+        """
+        player, debris = self.ships[0], self.ships[1]
+        if horizon is None:
+            horizon = 2 * np.pi / min(player.n, debris.n)
+        t_min, _ = closest_approach(self.fleet, [player.index], [debris.index], horizon,
+                                    samples=self.swept_samples(horizon, [player.index, debris.index]))
+        return float(t_min[0])
+
+    def skip_to(self, event):
+        """Jump straight to the next 'periapsis', 'apoapsis' or 'approach'; return the time skipped."""
+        events = {'periapsis': self.time_to_periapsis,
+                  'apoapsis': self.time_to_apoapsis,
+                  'approach': self.time_to_close_approach}
+        duration = events[event]()
+        if not np.isfinite(duration):
+            return 0.0
+        start = self.time
+        self.advance(duration)
+        return self.time - start
+
+    def positions(self):
+        """Normalized [-1, 1] positions of all bodies, star first."""
+        self.load_catalog()
+        r, v = self.fleet.get_states()
+        # share this tick's evaluation with later Planet.get_state callers and the history
         for ship in self.ships:
-            ship.propagate(self.config.dt)
-        self.collided_with_star = self.detect_collision([self.ships[0], self.star])
-        self.caught_satellite = self.detect_collision([self.ships[0], self.ships[1]])
+            ship.cache_state(r[ship.index], v[ship.index])
+        self._states = (self.time, r, v)
+        positions = np.zeros((len(self.fleet) + 1, 2))
+        positions[1:] = r / self.config.world_radius
+        return positions
+
+    def detect_collisions(self):
+        """Return index arrays (i, j) into self.bodies of every overlapping pair."""
+        return broad_phase(self.positions(), self.radii)
+
+    def swept_samples(self, duration, rows):
+        """Range-rate samples for a swept check of fleet `rows` over `duration` seconds.
+
+        swept_samples_per_orbit per orbit of the fastest of the bodies, and at least 8.
+        """
+        orbits = duration * self.fleet.n[rows].max() / (2 * np.pi)
+        return max(int(np.ceil(self.config.swept_samples_per_orbit * orbits)), 8)
+
+    def conjunction_candidates(self):
+        """Fleet rows whose orbits can come within reach of the player's at all."""
+        self.conjunctions.update(self.fleet.a, self.fleet.e, self.radii[1:] * self.config.world_radius)
+        return self.conjunctions.partners(self.ships[0].index)
+
+    def detect_swept_collision(self, duration):
+        """Check the player against the star and every candidate body over the next `duration` seconds.
+
+        Uses the closest approach of the analytic orbits, so passes that happen
+        entirely between two ticks are still caught. Bodies on orbits that can
+        never meet the player's are screened out first.
+        Returns (collided_with_star, caught_satellite, hit_time) for the first
+        hit only, hit_time being None when nothing is hit.
+        """
+        player = self.ships[0]
+        candidates = self.conjunction_candidates()
+        j = np.concatenate([[-1], candidates])
+        t_min, d_min = closest_approach(self.fleet, np.full(len(j), player.index), j, duration,
+                                        samples=self.swept_samples(duration, np.append(candidates, player.index)))
+        # radii of the star and of the candidates
+        reach = player.radius_ratio + np.concatenate([self.radii[:1], self.radii[candidates + 1]])
+        hit = d_min / self.config.world_radius <= reach
+        if not hit.any():
+            return False, False, None
+        # the model stops at the first hit, so later ones in the interval have not happened
+        hit_time = t_min[hit].min()
+        first = hit & (t_min == hit_time)
+        return bool(first[0]), bool(np.any(first[1:])), float(hit_time)
+
+    def player_hits(self, i, j):
+        """Reduce collision pairs to (collided_with_star, caught_satellite) for the player ship."""
+        player = self.ships[0].index + 1
+        other = np.concatenate([j[i == player], i[j == player]])
+        return bool(np.any(other == 0)), bool(np.any(other != 0))
 
     def detect_collision(self, ships):
         positions = []
@@ -1,9 +1,54 @@
 import pygame
+import numpy as np
+from src.assets import load_background
 from src.config import OrbitConfig
 from math import cos, sin
 
 BLACK = (0, 0, 0)
 WHITE = (255, 255, 255)
+OVERLAY_REFRESH = 10  # frames between profiler overlay text updates
+
+
+class OrbitPathCache:
+    """Screen-space polylines of full orbits, rebuilt only when a body's (a, e, omega) changes."""
+
+    def __init__(self, config: OrbitConfig = None):
+        self.config = config or OrbitConfig()
+        self.width = self.config.screen_width
+        self.height = self.config.screen_height
+        self._paths = {}  # body -> ((a, e, omega), points)
+        self.rebuilds = 0
+
+    def points(self, ship):
+        key = (ship.a, ship.e, ship.omega)
+        cached = self._paths.get(ship)
+        if cached is None or cached[0] != key:
+            cached = (key, self.build(*key))
+            self._paths[ship] = cached
+            self.rebuilds += 1
+        return cached[1]
+
+    def build(self, a, e, omega):
+        """Sample the ellipse uniformly in eccentric anomaly and project it to pixels.
+
+        Open orbits are sampled in hyperbolic anomaly along the branch, out to
+        twice the world radius; their polyline is not closed.
+        """
+        if e < 1:
+            E = np.linspace(0, 2 * np.pi, self.config.orbit_path_points, endpoint=False)
+            x_pf = a * (np.cos(E) - e)
+            y_pf = a * np.sqrt(1 - e ** 2) * np.sin(E)
+        else:
+            # r = |a| (e cosh H - 1) reaches 2 world radii at H_max
+            H_max = np.arccosh((2 * self.config.world_radius / abs(a) + 1) / e)
+            H = np.linspace(-H_max, H_max, self.config.orbit_path_points)
+            x_pf = -a * (e - np.cosh(H))
+            y_pf = -a * np.sqrt(e ** 2 - 1) * np.sinh(H)
+        x = cos(omega) * x_pf - sin(omega) * y_pf
+        y = sin(omega) * x_pf + cos(omega) * y_pf
+        screen = np.column_stack([self.width // 2 * (1 + x / self.config.world_radius),
+                                  self.height // 2 * (1 + y / self.config.world_radius)])
+        return screen.tolist()
 
 
 class OrbitRenderer:
@@ -13,42 +58,241 @@ class OrbitRenderer:
 
         self.width = self.config.screen_width
         self.height = self.config.screen_height
-        pygame.init()
+        # only the display is needed up front; fonts start with the profiler overlay
+        pygame.display.init()
         self.window = pygame.display.set_mode((self.width, self.height))
         pygame.display.set_caption("Orbit Rendezvous")
-        self.bg_img = pygame.image.load("stars-galaxy.jpg")
+        # scaled and in display format, so every blit is a plain same-format copy
+        self.bg_img = load_background(self.config.background_image, (self.width, self.height),
+                                      self.config.asset_cache_dir)
+        self.orbit_paths = OrbitPathCache(self.config)
+
+        # dirty-rect bookkeeping
+        self._frame_rects = []  # rects of moving items drawn this frame
+        self._previous_rects = None  # None until a full frame has been drawn
+        self._orbit_rects = {}  # ship -> (points, rect) of the last drawn orbit
+        self._changed_orbit_rects = []
+        self._lag = 0.0  # seconds between the displayed and the latest physics state
+
+        # maneuver preview ghosts
+        self.show_preview = False
+        self._preview_paths = None  # (orbits key, ManeuverPreview, polylines)
+        self._preview_rects = []
+
+        # frame-time overlay, drawn when a profiler is attached
+        self.profiler = None
+        self._overlay_font = None
+        self._overlay_lines = []
+
+    def draw_orbit(self, ship):
+        points = self.orbit_paths.points(ship)
+        rect = pygame.draw.lines(self.window, ship.color, ship.e < 1, points)
+        previous = self._orbit_rects.get(ship)
+        if previous is None or previous[0] is not points:
+            # a new path must be pushed, and the old one erased, even though orbits are static
+            if previous is not None:
+                self._changed_orbit_rects.append(previous[1])
+            self._changed_orbit_rects.append(rect)
+            self._orbit_rects[ship] = (points, rect)
+
+    def draw_preview(self, model):
+        """Ghost trajectories of the candidate burns, the closest-approach one highlighted.
+
+        The ghosts are rebuilt, and their regions pushed, only when the ship's
+        or the debris' orbit or the candidate burns change, not on every tick.
+        """
+        ship, debris = model.ships[0], model.ships[1]
+        key = (ship.a, ship.e, ship.omega, debris.a, debris.e, debris.omega,
+               self.config.preview_burns, self.config.delta_v)
+        changed = self._preview_paths is None or self._preview_paths[0] != key
+        if changed:
+            preview = model.preview_maneuvers()
+            paths = [self.orbit_paths.build(a, e, omega) for a, e, omega in zip(preview.a, preview.e, preview.omega)]
+            self._preview_paths = (key, preview, paths)
+            self._changed_orbit_rects.extend(self._preview_rects)
+        _, preview, paths = self._preview_paths
+        rects = []
+        for k, points in enumerate(paths):
+            color = self.config.epochs_color if k == preview.best else self.config.preview_color
+            rects.append(pygame.draw.lines(self.window, color, preview.e[k] < 1, points))
+        if changed:
+            self._changed_orbit_rects.extend(rects)
+        self._preview_rects = rects
+
+    def draw_profiler_overlay(self):
+        """Frame-time percentiles in ms in the top-left corner."""
+        if self._overlay_font is None:
+            pygame.font.init()
+            self._overlay_font = pygame.font.SysFont(None, 18)
+        if self.profiler.frames % OVERLAY_REFRESH == 0 or not self._overlay_lines:
+            stats = self.profiler.percentiles()
+            self._overlay_lines = [
+                f"{column:6s} " + " ".join(f"{name} {value * 1e3:6.2f}" for name, value in values.items())
+                for column, values in stats.items()]
+        y = 4
+        for line in self._overlay_lines:
+            text = self._overlay_font.render(line, True, self.config.overlay_color)
+            self._frame_rects.append(self.window.blit(text, (4, y)))
+            y += text.get_height()
 
     def draw_epochs(self, ship):
-        # apoapsis
+        # apoapsis, none on an open orbit
         apsis, apsis_angle = ship.apoapsis()
-        apo_x = self.width // 2 * (1 + apsis * cos(apsis_angle) / self.config.world_radius)
-        apo_y = self.width // 2 * (1 + apsis * sin(apsis_angle) / self.config.world_radius)
-        pygame.draw.circle(self.window, self.config.epochs_color, (apo_x, apo_y),
-                           self.config.epochs_radius * self.width // 2)
+        if np.isfinite(apsis):
+            apo_x = self.width // 2 * (1 + apsis * cos(apsis_angle) / self.config.world_radius)
+            apo_y = self.width // 2 * (1 + apsis * sin(apsis_angle) / self.config.world_radius)
+            self._frame_rects.append(pygame.draw.circle(self.window, self.config.epochs_color, (apo_x, apo_y),
+                                                        self.config.epochs_radius * self.width // 2))
         # periapsis
         apsis, apsis_angle = ship.periapsis()
         apo_x = self.width // 2 * (1 + apsis * cos(apsis_angle) / self.config.world_radius)
         apo_y = self.width // 2 * (1 + apsis * sin(apsis_angle) / self.config.world_radius)
-        pygame.draw.circle(self.window, self.config.epochs_color, (apo_x, apo_y),
-                           self.config.epochs_radius * self.width // 2)
+        self._frame_rects.append(pygame.draw.circle(self.window, self.config.epochs_color, (apo_x, apo_y),
+                                                    self.config.epochs_radius * self.width // 2))
 
     def draw_ship(self, ship):
         if ship.name == 'Star':
             r = [0.0, 0.0]
         else:
-            r, v = ship.get_state()
+            r, v = self.displayed_state(ship)
         x = self.width // 2 * (1 + r[0] / self.config.world_radius)
         y = self.height // 2 * (1 + r[1] / self.config.world_radius)
         radius = ship.radius_ratio * self.width // 2
-        pygame.draw.circle(self.window, ship.color, (x, y), radius)
+        self._frame_rects.append(pygame.draw.circle(self.window, ship.color, (x, y), radius))
         if ship.name == 'ship1':
             self.draw_epochs(ship)
 
-    def render(self, model):
-        self.window.blit(self.bg_img, (0, 0))
+    def draw_field(self, model):
+        """Bulk debris with level of detail.
+
+        All positions are projected in one array operation. A body gets a circle
+        if it is near the player, or if it is at least lod_pixel_radius across
+        and its lod_cell screen cell is not crowded; at most lod_max_circles are
+        drawn, nearest the player first. The rest are written straight into the
+        window's pixel array, with one dirty rect per occupied cell.
+        """
+        rows = model.field_rows()
+        if not len(rows):
+            return
+        r, v = model.fleet.get_states(rows, dt=-self._lag)
+        center = np.array([self.width // 2, self.height // 2])
+        screen = center * (1 + r / self.config.world_radius)
+        radius = model.radii[rows + 1] * (self.width // 2)
+        colors = model.colors[rows + 1]
+
+        player, _ = self.displayed_state(model.ships[0])
+        distance = np.hypot(*(r - player).T)
+        near = distance < self.config.lod_near_radius * self.config.world_radius
+        cell = self.config.lod_cell
+        columns, lines = -(-self.width // cell), -(-self.height // cell)
+        cx = np.clip(screen[:, 0] // cell, -1, columns).astype(int) + 1
+        cy = np.clip(screen[:, 1] // cell, -1, lines).astype(int) + 1
+        key = cx * (lines + 2) + cy  # off-screen bodies share the border cells
+        crowded = np.bincount(key)[key] > self.config.lod_cell_circles
+        circles = near | ((radius >= self.config.lod_pixel_radius) & ~crowded)
+        drawn = np.nonzero(circles)[0]
+        if len(drawn) > self.config.lod_max_circles:
+            drawn = drawn[np.argsort(distance[drawn])[:self.config.lod_max_circles]]
+            circles[:] = False
+            circles[drawn] = True
+        for k in drawn:
+            self._frame_rects.append(pygame.draw.circle(self.window, colors[k], screen[k], radius[k]))
+
+        x, y = np.floor(screen[~circles]).astype(int).T
+        visible = (x >= 0) & (x < self.width) & (y >= 0) & (y < self.height)
+        if not visible.any():
+            return
+        x, y = x[visible], y[visible]
+        pixels = pygame.surfarray.pixels3d(self.window)
+        pixels[x, y] = colors[~circles][visible]
+        del pixels  # unlocks the surface
+        for key in np.nonzero(np.bincount((x // cell) * lines + y // cell))[0]:
+            self._frame_rects.append(pygame.Rect(key // lines * cell, key % lines * cell, cell, cell))
+
+    def draw_trail(self, model, ship):
+        """Recent positions of a ship from the model's history, fading out towards the oldest.
+
+        The trail is cut at the displayed time and joined to the displayed
+        position, so it never runs ahead of an interpolated ship. Each of
+        trail_fade_steps stretches is one polyline in a darker shade.
+        """
+        times, r = model.trail(ship, self.config.trail_length)
+        shown = times <= model.time - self._lag
+        if not shown.any():
+            return
+        center = np.array([self.width // 2, self.height // 2])
+        head, _ = self.displayed_state(ship)
+        screen = np.vstack([center * (1 + r[shown] / self.config.world_radius),
+                            center * (1 + np.asarray(head) / self.config.world_radius)])
+        steps = max(min(self.config.trail_fade_steps, len(screen) - 1), 1)
+        bounds = np.linspace(0, len(screen) - 1, steps + 1).round().astype(int)
+        color = np.array(ship.color, dtype=float)
+        for k in range(steps):
+            start, stop = bounds[k], bounds[k + 1]
+            if stop <= start:
+                continue
+            shade = color * (k + 1) / steps
+            # consecutive stretches share their end point, so the trail has no gaps
+            self._frame_rects.append(pygame.draw.lines(self.window, shade.astype(int), False,
+                                                       screen[start:stop + 1].tolist()))
+
+    def displayed_state(self, ship):
+        """State of a ship as displayed, i.e. lagging the physics by the interpolation offset."""
+        return ship.state_at(-self._lag) if self._lag else ship.get_state()
+
+    def draw_scene(self, model):
+        self._frame_rects = []
+        self._changed_orbit_rects = []
+        if self.show_preview:
+            self.draw_preview(model)
+        elif self._preview_paths is not None:
+            # preview switched off: erase the ghosts
+            self._changed_orbit_rects.extend(self._preview_rects)
+            self._preview_paths = None
+            self._preview_rects = []
+        if self.config.show_orbit_paths:
+            for ship in model.ships:
+                self.draw_orbit(ship)
 
         self.draw_ship(model.star)
+        self.draw_field(model)
+        if self.config.show_trails:
+            for ship in model.ships:
+                self.draw_trail(model, ship)
         for ship in model.ships:
             self.draw_ship(ship)
 
+        if self.profiler is not None:
+            self.draw_profiler_overlay()
+
+    def render(self, model, alpha=1.0):
+        """Draw the model, interpolated `alpha` of the way from the previous physics state to the latest."""
+        self._lag = (1.0 - alpha) * model.tick_duration
+        if self.config.dirty_rects and self._previous_rects is not None:
+            self.render_dirty(model)
+            return
+
+        self.window.blit(self.bg_img, (0, 0))
+        self.draw_scene(model)
+        self._previous_rects = self._frame_rects
         pygame.display.flip()
+
+    def render_dirty(self, model):
+        """Restore and push only the regions that changed since the last frame.
+
+        Everything is redrawn, which is cheap, but the background is copied back
+        only under last frame's items and only the old and new item rects are
+        sent to the display.
+        """
+        for rect in self._previous_rects:
+            self.window.blit(self.bg_img, rect, rect)
+        self.draw_scene(model)
+        # erasing an old orbit path needs the scene drawn over it again
+        changed_orbits = self._changed_orbit_rects
+        if changed_orbits:
+            for rect in changed_orbits:
+                self.window.blit(self.bg_img, rect, rect)
+            self.draw_scene(model)
+        dirty = self._previous_rects + self._frame_rects + changed_orbits
+        self._previous_rects = self._frame_rects
+        pygame.display.update(dirty)
@@ -0,0 +1,156 @@
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import List
+import numpy as np
+
+from src.collision import closest_approach
+from src.orbit_model import Fleet, elements_from_state, state_from_elements
+
+# Rendezvous planning: grid search over tangential burn sequences.
+# Candidates are evaluated in batches of increasing total delta-v, so the first
+# batch that reaches the debris holds the cheapest plan on the grid and the
+# search can stop there.
+
+APSIS_MARGIN = 0.1  # rad of mean anomaly
+
+
+@dataclass
+class Burn:
+    time: float  # absolute model time
+    delta_v: float  # tangential, m/s
+
+
+@dataclass
+class ManeuverPlan:
+    burns: List[Burn] = field(default_factory=list)
+    total_delta_v: float = 0.0
+    catch_time: float = 0.0  # absolute model time of the closest approach
+    min_distance: float = 0.0  # metres
+
+
+class RendezvousPlanner:
+    """Search one- and two-burn sequences that bring the player ship to the debris.
+
+    Single burns (phasing) are tried at burn_times points over one ship orbit
+    with magnitudes up to planner_max_delta_v. Two-burn transfers add a second
+    burn at the next apsis of the transfer orbit, Hohmann style. The search works
+    on a snapshot of the model taken at construction and can be spread over
+    frames with step(time_budget).
+    """
+
+    def __init__(self, model):
+        self.config = model.config
+        self.start_time = model.time
+        ship, debris = model.ships[0], model.ships[1]
+        self.solver = model.fleet.solver
+        self.mu = self.config.mu
+
+        # snapshot of the two orbits
+        self.ship_elements = (ship.a, ship.e, ship.omega, ship.M)
+        self.debris_state = debris.get_state()
+        self.debris_shell = (debris.a * (1 - debris.e), debris.a * (1 + debris.e))
+        self.period = 2 * np.pi / ship.n
+        self.catch_radius = (ship.radius_ratio + debris.radius_ratio) * self.config.world_radius
+        self.safe_radius = (model.star.radius_ratio + ship.radius_ratio) * self.config.world_radius
+
+        self.plan = None
+        self.done = False
+        self.evaluated = 0
+        self._batches = self._candidate_batches()
+
+    def _candidate_batches(self):
+        """Yield (t1, dv1, dv2) arrays, cheapest candidates first."""
+        config = self.config
+        t1 = np.linspace(0.0, self.period, config.planner_burn_times, endpoint=False)
+        steps = np.arange(config.planner_delta_v_step, config.planner_max_delta_v + 1, config.planner_delta_v_step)
+        magnitudes = np.concatenate([-steps[::-1], steps])
+        second = np.concatenate([[0.0], magnitudes])
+
+        t1, dv1, dv2 = (grid.ravel() for grid in np.meshgrid(t1, magnitudes, second, indexing='ij'))
+        order = np.argsort(np.abs(dv1) + np.abs(dv2), kind='stable')
+        for start in range(0, len(order), config.planner_batch_size):
+            batch = order[start:start + config.planner_batch_size]
+            yield t1[batch], dv1[batch], dv2[batch]
+
+    def step(self, time_budget=None):
+        """Evaluate batches until time_budget seconds have passed; return the plan once done."""
+        if self.done:
+            return self.plan
+        time_budget = self.config.planner_time_budget if time_budget is None else time_budget
+        deadline = perf_counter() + time_budget
+        for t1, dv1, dv2 in self._batches:
+            self.plan = self.evaluate(t1, dv1, dv2)
+            self.evaluated += len(t1)
+            if self.plan is not None or perf_counter() >= deadline:
+                break
+        else:
+            self.done = True
+        if self.plan is not None:
+            self.done = True
+        return self.plan
+
+    def search(self):
+        """Run the whole search in one call."""
+        while not self.done:
+            self.step(np.inf)
+        return self.plan
+
+    def _burn(self, v, delta_v):
+        return v + delta_v[:, None] * v / np.linalg.norm(v, axis=1)[:, None]
+
+    def evaluate(self, t1, dv1, dv2):
+        """Return the cheapest plan in the batch that catches the debris, or None."""
+        count = len(t1)
+        a0, e0, omega0, M0 = (np.full(count, value) for value in self.ship_elements)
+        n0 = np.sqrt(self.mu / np.abs(a0) ** 3)  # a < 0 on an open orbit
+
+        # first burn
+        r1, v1 = state_from_elements(a0, e0, omega0, M0 + n0 * t1, self.mu, self.solver)
+        a1, e1, omega1, M1, n1 = elements_from_state(r1, self._burn(v1, dv1), self.mu)
+
+        # optional second burn at the next apsis of the transfer orbit; a tangential burn on a
+        # near-circular orbit leaves an apsis at (or a few degrees from) the burn point, skip that one
+        to_apsis = np.stack([(np.pi - M1) % (2 * np.pi), (2 * np.pi - M1) % (2 * np.pi)])
+        to_apsis[to_apsis < APSIS_MARGIN] = 2 * np.pi
+        coast = to_apsis.min(axis=0) / n1
+        two_burns = dv2 != 0
+        t_last = np.where(two_burns, t1 + coast, t1)
+        r2, v2 = state_from_elements(a1, e1, omega1, M1 + n1 * coast, self.mu, self.solver)
+        v2 = np.where(two_burns[:, None], self._burn(v2, dv2), v2)
+        a2, e2, omega2, M2, n2 = elements_from_state(r2, v2, self.mu)
+        a2, e2, omega2, M2, n2 = (np.where(two_burns, final, transfer) for final, transfer in
+                                  zip((a2, e2, omega2, M2, n2), (a1, e1, omega1, M1, n1)))
+
+        # both legs must stay bound and clear of the star, and the final orbit's
+        # radial range must reach the debris' range at all
+        periapsis, apoapsis = a2 * (1 - e2), a2 * (1 + e2)
+        feasible = ((e1 < 1) & (a1 * (1 - e1) > self.safe_radius) &
+                    (e2 < 1) & (periapsis > self.safe_radius) &
+                    (periapsis <= self.debris_shell[1] + self.catch_radius) &
+                    (apoapsis >= self.debris_shell[0] - self.catch_radius))
+        if not feasible.any():
+            return None
+        rows = np.nonzero(feasible)[0]
+
+        # final orbits referred back to the snapshot epoch, with the debris as the last row
+        fleet = Fleet(self.mu, capacity=len(rows) + 1, solver=self.solver)
+        first = fleet.add(len(rows))
+        fleet.set_elements(np.arange(first, len(rows)), a2[rows], e2[rows], omega2[rows],
+                           np.mod(M2[rows] - n2[rows] * t_last[rows], 2 * np.pi), n2[rows])
+        debris = fleet.add_states(*[state[None] for state in self.debris_state])[0]
+
+        horizon = self.config.planner_orbits * self.period
+        samples = self.config.planner_orbits * self.config.planner_samples_per_orbit
+        t_min, d_min = closest_approach(fleet, np.arange(len(rows)), np.full(len(rows), debris), horizon,
+                                        samples=samples, start=t_last[rows])
+        caught = d_min <= self.catch_radius
+        if not caught.any():
+            return None
+
+        cost = np.abs(dv1[rows]) + np.abs(dv2[rows])
+        best = np.nonzero(caught)[0][np.argmin(cost[caught])]
+        k = rows[best]
+        burns = [Burn(self.start_time + float(t1[k]), float(dv1[k]))]
+        if two_burns[k]:
+            burns.append(Burn(self.start_time + float(t_last[k]), float(dv2[k])))
+        return ManeuverPlan(burns, float(cost[best]), self.start_time + float(t_min[best]), float(d_min[best]))
@@ -0,0 +1,91 @@
+import csv
+import json
+from time import perf_counter
+import numpy as np
+
+# Opt-in frame profiling for the game loop.
+# The controller marks the end of each phase of a frame; a disabled loop uses
+# NullProfiler, whose methods do nothing, so the instrumentation costs a few
+# no-op calls per frame.
+
+PHASES = ('events', 'update', 'render', 'idle')
+PERCENTILES = (50, 95, 99)
+
+
+class FrameProfiler:
+    """Per-phase frame timers kept in a rolling window of the last `window` frames."""
+
+    enabled = True
+
+    def __init__(self, phases=PHASES, window=1000):
+        self.phases = tuple(phases)
+        self.columns = self.phases + ('frame',)
+        self._index = {phase: k for k, phase in enumerate(self.phases)}
+        self._samples = np.zeros((window, len(self.columns)))  # seconds
+        self.frames = 0  # frames recorded since start
+        self._current = np.zeros(len(self.columns))
+        self._frame_start = self._last = perf_counter()
+
+    def begin_frame(self):
+        self._current[:] = 0.0
+        self._frame_start = self._last = perf_counter()
+
+    def mark(self, phase):
+        """Charge the time since the previous mark to `phase`."""
+        now = perf_counter()
+        self._current[self._index[phase]] += now - self._last
+        self._last = now
+
+    def end_frame(self):
+        self._current[-1] = perf_counter() - self._frame_start
+        self._samples[self.frames % len(self._samples)] = self._current
+        self.frames += 1
+
+    def samples(self):
+        """Recorded frames in the window, oldest first, one column per phase plus the frame total."""
+        window = len(self._samples)
+        if self.frames <= window:
+            return self._samples[:self.frames].copy()
+        start = self.frames % window
+        return np.concatenate([self._samples[start:], self._samples[:start]])
+
+    def percentiles(self, percentiles=PERCENTILES):
+        """{column: {'p50': seconds, ...}} over the window."""
+        samples = self.samples()
+        if not len(samples):
+            return {}
+        values = np.percentile(samples, percentiles, axis=0)
+        return {column: {f"p{p}": float(values[k, c]) for k, p in enumerate(percentiles)}
+                for c, column in enumerate(self.columns)}
+
+    def histogram(self, bins=20):
+        """(counts, edges) of frame times over the window."""
+        return np.histogram(self.samples()[:, -1], bins=bins)
+
+    def export(self, path):
+        """Write the window as .json (summary and samples) or .csv (one row per frame)."""
+        samples = self.samples()
+        if str(path).endswith('.csv'):
+            with open(path, 'w', newline='') as file:
+                writer = csv.writer(file)
+                writer.writerow(self.columns)
+                writer.writerows(samples.tolist())
+        else:
+            with open(path, 'w') as file:
+                json.dump({'frames': self.frames, 'columns': self.columns, 'percentiles': self.percentiles(),
+                           'samples': samples.tolist()}, file)
+
+
+class NullProfiler:
+    """Stand-in used when profiling is off."""
+
+    enabled = False
+
+    def begin_frame(self):
+        pass
+
+    def mark(self, phase):
+        pass
+
+    def end_frame(self):
+        pass
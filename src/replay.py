@@ -0,0 +1,213 @@
+"""
+Input recording and headless replay
+===================================
+
+A session log is the initial OrbitConfig followed by compact (tick, action)
+records, where tick is GameModel.tick when the action was applied, and ends
+with the final tick and a checksum of the model state.
+
+Log layout (little endian):
+    8 bytes   magic b"ORBLOG1\\0"
+    uint32    length of the config JSON, then the JSON itself
+    5 bytes   per record: uint32 tick, uint8 action
+    5 bytes   END record: uint32 final tick, uint8 0
+    32 bytes  SHA-256 of the final state
+
+To replay: python -m src.replay session.orblog [--seek TICK]
+"""
+import argparse
+import hashlib
+import json
+import struct
+import sys
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import List, Tuple
+import numpy as np
+
+from src.config import OrbitConfig
+from src.orbit_model import GameModel
+from src.planner import RendezvousPlanner
+
+MAGIC = b"ORBLOG1\0"
+RECORD = struct.Struct("<IB")
+LENGTH = struct.Struct("<I")
+
+
+class Action(IntEnum):
+    END = 0
+    PROGRADE = 1
+    RETROGRADE = 2
+    WARP_UP = 3
+    WARP_DOWN = 4
+    SKIP_PERIAPSIS = 5
+    SKIP_APOAPSIS = 6
+    SKIP_APPROACH = 7
+    AUTOPILOT = 8  # a plan was found and handed to the model at this tick
+
+
+def apply_action(model, action):
+    """Apply one recorded action to the model, the same way the controller does."""
+    if action == Action.PROGRADE:
+        model.change_orbit(True)
+    elif action == Action.RETROGRADE:
+        model.change_orbit(False)
+    elif action == Action.WARP_UP:
+        model.change_time_warp(True)
+    elif action == Action.WARP_DOWN:
+        model.change_time_warp(False)
+    elif action == Action.SKIP_PERIAPSIS:
+        model.skip_to('periapsis')
+    elif action == Action.SKIP_APOAPSIS:
+        model.skip_to('apoapsis')
+    elif action == Action.SKIP_APPROACH:
+        model.skip_to('approach')
+    elif action == Action.AUTOPILOT:
+        plan = RendezvousPlanner(model).search()
+        if plan is not None:
+            model.execute_plan(plan)
+    else:
+        raise ValueError(f"unknown action {action!r}")
+
+
+def config_to_dict(config):
+    """All public settings of a config, including the class-level physics constants."""
+    settings = {}
+    for name in dir(config):
+        value = getattr(config, name)
+        if name.startswith('_') or callable(value):
+            continue
+        settings[name] = value.tolist() if isinstance(value, np.ndarray) else value
+    return settings
+
+
+def config_from_dict(settings):
+    config = OrbitConfig()
+    for name, value in settings.items():
+        default = getattr(OrbitConfig, name, None)
+        if isinstance(default, np.ndarray):
+            value = np.array(value, dtype=default.dtype)
+        elif isinstance(default, tuple):
+            value = tuple(value)
+        setattr(config, name, value)
+    return config
+
+
+def state_checksum(model):
+    """SHA-256 over the exact bits of every fleet element and the game clock and flags."""
+    digest = hashlib.sha256()
+    for name in model.fleet.ELEMENTS:
+        digest.update(np.ascontiguousarray(getattr(model.fleet, name)).tobytes())
+    digest.update(struct.pack("<dI??", model.time, model.tick, model.collided_with_star, model.caught_satellite))
+    return digest.digest()
+
+
+class InputRecorder:
+    """Append (tick, action) records to a session log as they happen."""
+
+    def __init__(self, path, config):
+        self.file = open(path, "wb")
+        settings = json.dumps(config_to_dict(config)).encode()
+        self.file.write(MAGIC + LENGTH.pack(len(settings)) + settings)
+
+    def record(self, tick, action):
+        self.file.write(RECORD.pack(tick, action))
+
+    def close(self, model):
+        """Finish the log with the final tick and state checksum."""
+        self.file.write(RECORD.pack(model.tick, Action.END) + state_checksum(model))
+        self.file.close()
+
+
+@dataclass
+class SessionLog:
+    config: OrbitConfig
+    records: List[Tuple[int, Action]]
+    final_tick: int
+    checksum: bytes
+
+
+def read_log(path):
+    with open(path, "rb") as file:
+        data = file.read()
+    if not data.startswith(MAGIC):
+        raise ValueError(f"{path} is not a session log")
+    offset = len(MAGIC)
+    (length,) = LENGTH.unpack_from(data, offset)
+    offset += LENGTH.size
+    config = config_from_dict(json.loads(data[offset:offset + length]))
+    offset += length
+
+    records = []
+    while True:
+        tick, action = RECORD.unpack_from(data, offset)
+        offset += RECORD.size
+        if action == Action.END:
+            return SessionLog(config, records, tick, data[offset:offset + 32])
+        records.append((tick, Action(action)))
+
+
+class Replay:
+    """Re-run a session log headless, without rendering or frame pacing."""
+
+    def __init__(self, path):
+        self.log = read_log(path)
+
+    def run(self):
+        """Step tick by tick exactly as the session did; return (model, checksum matches)."""
+        model = GameModel(self.log.config)
+        for tick, action in self.log.records:
+            while model.tick < tick:
+                model.update()
+            apply_action(model, action)
+        while model.tick < self.log.final_tick:
+            model.update()
+        return model, state_checksum(model) == self.log.checksum
+
+    def seek(self, tick):
+        """Return the model at `tick`, jumping analytically between recorded actions.
+
+        Each gap is covered by one GameModel.advance instead of one update per
+        tick, so the cost depends on the number of actions, not on the tick.
+        The result matches stepping up to floating point rounding.
+        """
+        model = GameModel(self.log.config)
+        for record_tick, action in self.log.records:
+            if record_tick > tick:
+                break
+            self._jump(model, record_tick)
+            apply_action(model, action)
+        self._jump(model, min(tick, self.log.final_tick))
+        return model
+
+    @staticmethod
+    def _jump(model, tick):
+        ticks = tick - model.tick
+        if ticks > 0 and not (model.collided_with_star or model.caught_satellite):
+            model.advance(ticks * model.tick_duration)
+        model.tick = max(model.tick, tick)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay a recorded orbit rendezvous session")
+    parser.add_argument("log", help="session log written with OrbitConfig.record_path")
+    parser.add_argument("--seek", type=int, help="jump analytically to this tick instead of a full replay")
+    args = parser.parse_args(argv)
+
+    replay = Replay(args.log)
+    if args.seek is not None:
+        model = replay.seek(args.seek)
+        print(f"tick {model.tick}, time {model.time:.0f} s")
+        for ship in model.ships:
+            r, v = ship.get_state()
+            print(f"  {ship.name}: r = {r}, v = {v}")
+        return 0
+
+    model, verified = replay.run()
+    print(f"replayed {model.tick} ticks, {len(replay.log.records)} actions, "
+          f"checksum {'OK' if verified else 'MISMATCH'}")
+    return 0 if verified else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
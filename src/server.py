@@ -0,0 +1,316 @@
+"""
+Simulation server for many concurrent sessions
+==============================================
+
+One asyncio process owns the game state of every connected session and
+advances all of them each tick in one batched VectorOrbitEnv step. Clients
+send burn commands and receive compact binary deltas; they keep a local
+GameModel mirror only to render it.
+
+Protocol, over loopback TCP, little endian:
+    client -> server   1 byte per command: replay.Action.PROGRADE or RETROGRADE
+    server -> client   one frame per tick:
+        header  uint32 tick, float64 time, uint8 flags (1 crashed, 2 caught), uint8 count
+        count body records: uint8 body (0 ship, 1 debris), float64 a, e, omega, M, n
+
+Bodies are only sent when their orbit changed (a burn, a new game) and in a
+full keyframe every KEYFRAME_TICKS. In between, the client advances the mean
+anomalies itself with Fleet.propagate, which reproduces the server's values
+exactly. A frame with flags set is the last one of the session.
+
+To serve:      python -m src.server --port 5555
+To play:       set OrbitConfig.server_address = "127.0.0.1:5555"
+To load test:  python -m src.server --load-test 200 --ticks 100
+"""
+import argparse
+import asyncio
+import socket
+import struct
+import sys
+from collections import deque
+from time import perf_counter
+import numpy as np
+
+from src.config import OrbitConfig
+from src.replay import Action
+from src.vector_env import NO_BURN, PROGRADE, RETROGRADE, VectorOrbitEnv
+
+HEADER = struct.Struct("<IdBB")
+BODY = struct.Struct("<B5d")
+CRASHED, CAUGHT = 1, 2
+KEYFRAME_TICKS = 50
+COMMANDS = {Action.PROGRADE: PROGRADE, Action.RETROGRADE: RETROGRADE}
+ELEMENTS = ('a', 'e', 'omega', 'M', 'n')
+
+
+def encode_frame(tick, time, flags, bodies):
+    """bodies: iterable of (body, a, e, omega, M, n)."""
+    bodies = list(bodies)
+    return HEADER.pack(tick, time, flags, len(bodies)) + b"".join(BODY.pack(*body) for body in bodies)
+
+
+def decode_frames(buffer):
+    """Split complete frames off the front of `buffer`; return (frames, bytes consumed)."""
+    frames = []
+    offset = 0
+    while len(buffer) - offset >= HEADER.size:
+        tick, time, flags, count = HEADER.unpack_from(buffer, offset)
+        end = offset + HEADER.size + count * BODY.size
+        if len(buffer) < end:
+            break
+        bodies = [BODY.unpack_from(buffer, offset + HEADER.size + k * BODY.size) for k in range(count)]
+        frames.append((tick, time, flags, bodies))
+        offset = end
+    return frames, offset
+
+
+def apply_frame(model, frame):
+    """Advance a GameModel mirror to the frame's tick and take over its changes."""
+    tick, time, flags, bodies = frame
+    while model.tick < tick:
+        model.fleet.propagate(model.config.dt)
+        model.tick += 1
+    model.time = time
+    for body, *elements in bodies:
+        model.fleet.set_elements([model.ships[body].index], *np.array(elements)[:, None])
+    model.collided_with_star = bool(flags & CRASHED)
+    model.caught_satellite = bool(flags & CAUGHT)
+
+
+class Session:
+    def __init__(self, slot, writer):
+        self.slot = slot
+        self.writer = writer
+        self.commands = []  # pending env actions, one applied per tick
+
+
+class SimulationServer:
+    """Owns up to `capacity` sessions as slots of one VectorOrbitEnv."""
+
+    def __init__(self, config=None, capacity=256, tick_rate=None):
+        self.config = config or OrbitConfig()
+        self.env = VectorOrbitEnv(capacity, self.config, max_steps=None)
+        self.tick_length = 1.0 / (tick_rate or self.config.physics_rate)
+        self.sessions = {}  # slot -> Session
+        self.free = list(range(capacity - 1, -1, -1))
+        self.ticks = 0
+        # seconds of work per tick, batched step plus encoding, for the latest profile_window ticks
+        self.tick_times = deque(maxlen=self.config.profile_window)
+        self.tick_started = 0.0  # perf_counter at the start of the latest tick
+        self._sent = self._elements()  # elements as each row's client knows them
+        self._server = None
+
+    def _elements(self):
+        fleet = self.env.fleet
+        return np.column_stack([getattr(fleet, name) for name in ELEMENTS])
+
+    def _bodies(self, slot, elements, changed=None):
+        rows = (self.env.ship[slot], self.env.debris[slot])
+        return [(body, *elements[row]) for body, row in enumerate(rows) if changed is None or changed[row]]
+
+    async def handle(self, reader, writer):
+        if not self.free:
+            writer.close()
+            return
+        slot = self.free.pop()
+        self.env.reset([slot])
+        session = self.sessions[slot] = Session(slot, writer)
+        # only this slot's rows changed since the last tick, and its client gets them in full;
+        # the other clients keep their pending changes
+        rows = [self.env.ship[slot], self.env.debris[slot]]
+        self._sent[rows] = self._elements()[rows]
+        writer.write(encode_frame(0, 0.0, 0, self._bodies(slot, self._sent)))
+        try:
+            while True:
+                data = await reader.read(64)
+                if not data:
+                    break
+                session.commands.extend(COMMANDS[command] for command in data if command in COMMANDS)
+        except ConnectionError:
+            pass
+        finally:
+            self._close(slot)
+
+    def _close(self, slot):
+        session = self.sessions.pop(slot, None)
+        if session is not None:
+            session.writer.close()
+            self.free.append(slot)
+
+    def tick(self):
+        """Advance every session one tick and send the frames."""
+        self.tick_started = start = perf_counter()
+        actions = np.full(self.env.num_envs, NO_BURN)
+        for slot, session in self.sessions.items():
+            if session.commands:
+                actions[slot] = session.commands.pop(0)
+        steps = self.env.steps.copy()
+        _, _, dones, info = self.env.step(actions)
+        self.ticks += 1
+
+        elements = self._elements()
+        keyframe = self.ticks % KEYFRAME_TICKS == 0
+        changed = np.any(elements[:, [0, 1, 2, 4]] != self._sent[:, [0, 1, 2, 4]], axis=1)
+        self._sent = elements
+        for slot, session in list(self.sessions.items()):
+            tick = int(steps[slot]) + 1
+            if dones[slot]:
+                flags = CRASHED * bool(info['crashed'][slot]) | CAUGHT * bool(info['caught'][slot])
+                session.writer.write(encode_frame(tick, tick * self.config.dt, flags, []))
+                self._close(slot)
+                continue
+            bodies = self._bodies(slot, elements, None if keyframe else changed)
+            session.writer.write(encode_frame(tick, tick * self.config.dt, 0, bodies))
+        self.tick_times.append(perf_counter() - start)
+
+    async def start(self, host="127.0.0.1", port=0):
+        """Listen and return the bound port."""
+        self._server = await asyncio.start_server(self.handle, host, port, backlog=self.env.num_envs)
+        return self._server.sockets[0].getsockname()[1]
+
+    async def run(self, ticks=None):
+        """Tick at the fixed rate, `ticks` times or until cancelled."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time()
+        count = 0
+        while ticks is None or count < ticks:
+            deadline += self.tick_length
+            self.tick()
+            count += 1
+            await asyncio.sleep(max(deadline - loop.time(), 0.0))
+
+    async def stop(self):
+        for slot in list(self.sessions):
+            self._close(slot)
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+
+class SessionClient:
+    """Non-blocking client for the pygame loop: send commands, poll frames into a GameModel."""
+
+    def __init__(self, sock):
+        self.sock = sock
+        self.sock.setblocking(False)
+        self._buffer = bytearray()
+        self.connected = True
+
+    @classmethod
+    def connect(cls, address):
+        host, port = address.rsplit(":", 1)
+        return cls(socket.create_connection((host, int(port))))
+
+    def send(self, action):
+        """Forward a burn; other actions are not available against a server."""
+        if action in COMMANDS and self.connected:
+            self.sock.setblocking(True)
+            self.sock.sendall(bytes([action]))
+            self.sock.setblocking(False)
+
+    def poll(self, model):
+        """Apply every frame received so far to `model`; return how many there were."""
+        while self.connected:
+            try:
+                data = self.sock.recv(65536)
+            except BlockingIOError:
+                break
+            if not data:
+                self.connected = False
+                break
+            self._buffer.extend(data)
+        frames, consumed = decode_frames(self._buffer)
+        del self._buffer[:consumed]
+        for frame in frames:
+            apply_frame(model, frame)
+        return len(frames)
+
+    def close(self):
+        self.connected = False
+        self.sock.close()
+
+
+async def _simulated_client(port, ticks, latencies, server, burn_every, seed):
+    """Read frames for `ticks` ticks, burning now and then; record each frame's delivery latency.
+
+    Latency runs from the start of the server tick to the frame being decoded,
+    both clocks being the same process's perf_counter.
+    """
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    rng = np.random.default_rng(seed)
+    received = 0
+    try:
+        while received <= ticks:
+            header = await reader.readexactly(HEADER.size)
+            tick, _, flags, count = HEADER.unpack(header)
+            await reader.readexactly(count * BODY.size)
+            if tick:
+                latencies.append(perf_counter() - server.tick_started)
+            received += 1
+            if flags:
+                break
+            if rng.integers(burn_every) == 0:
+                writer.write(bytes([rng.choice([Action.PROGRADE, Action.RETROGRADE])]))
+    except asyncio.IncompleteReadError:
+        pass
+    finally:
+        writer.close()
+    return received
+
+
+async def load_test(clients=200, ticks=100, tick_rate=None, burn_every=20):
+    """Drive `clients` simulated sessions for `ticks` ticks; return latency statistics in seconds."""
+    server = SimulationServer(capacity=clients, tick_rate=tick_rate)
+    port = await server.start()
+    latencies = []
+    tasks = [asyncio.create_task(_simulated_client(port, ticks, latencies, server, burn_every, seed))
+             for seed in range(clients)]
+    while len(server.sessions) < clients:
+        await asyncio.sleep(0.001)
+    await server.run(ticks)
+    await asyncio.sleep(server.tick_length)
+    for task in tasks:
+        task.cancel()
+    await server.stop()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stats(values):
+        values = np.asarray(values)
+        return {"p50": float(np.percentile(values, 50)), "p95": float(np.percentile(values, 95)),
+                "p99": float(np.percentile(values, 99)), "max": float(values.max())} if len(values) else {}
+
+    return {"clients": clients, "ticks": server.ticks, "frames": len(latencies),
+            "tick_time": stats(server.tick_times), "delivery_latency": stats(latencies)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Batched simulation server for orbit rendezvous sessions")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5555)
+    parser.add_argument("--capacity", type=int, default=256, help="maximum concurrent sessions")
+    parser.add_argument("--load-test", type=int, metavar="CLIENTS", help="run a local load test instead of serving")
+    parser.add_argument("--ticks", type=int, default=100, help="ticks to run in the load test")
+    args = parser.parse_args(argv)
+
+    if args.load_test:
+        report = asyncio.run(load_test(args.load_test, args.ticks))
+        print(f"{report['clients']} clients, {report['ticks']} ticks, {report['frames']} frames delivered")
+        for name in ("tick_time", "delivery_latency"):
+            print(f"  {name}: " + ", ".join(f"{p} {value * 1e3:.2f} ms" for p, value in report[name].items()))
+        return 0
+
+    async def serve():
+        server = SimulationServer(capacity=args.capacity)
+        port = await server.start(args.host, args.port)
+        print(f"serving on {args.host}:{port}")
+        await server.run()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+"""
+Batched environments for training control policies
+==================================================
+
+VectorOrbitEnv holds B independent games as rows of one Fleet: ship k is row k
+and its debris is row B + k. A step applies one action per game, advances all
+games by one tick and checks every ship against its debris and the star with
+the same swept closest-approach test GameModel uses, all in array operations.
+Finished games are reset in place, so the caller never loops over games.
+
+Actions:       0 no burn, 1 prograde, 2 retrograde (OrbitConfig.delta_v each)
+Observations:  one row per game, columns named in OBSERVATION
+Rewards:       catch_reward on a catch, crash_reward on hitting the star,
+               minus fuel_cost per m/s burnt
+"""
+import numpy as np
+
+from src.collision import rendezvous_outcome
+from src.config import OrbitConfig
+from src.orbit_model import Fleet, elements_from_state
+
+NO_BURN, PROGRADE, RETROGRADE = 0, 1, 2
+OBSERVATION = ('dx', 'dy', 'dvx', 'dvy',  # debris relative to ship, m and m/s
+               'a', 'e', 'omega', 'M',  # ship elements
+               'debris_a', 'debris_e', 'debris_omega', 'debris_M')
+
+
+class VectorOrbitEnv:
+    """B rendezvous games stepped together, one tick of config.dt per step."""
+
+    def __init__(self, num_envs, config=None, max_steps=1000, catch_reward=1.0, crash_reward=-1.0, fuel_cost=0.0,
+                 sigma_position=0.0, sigma_velocity=0.0, seed=None):
+        self.num_envs = num_envs
+        self.config = config or OrbitConfig()
+        self.max_steps = max_steps  # ticks before a game is cut off, None: never
+        self.catch_reward = catch_reward
+        self.crash_reward = crash_reward
+        self.fuel_cost = fuel_cost
+        # spread of the initial states around the configured ones
+        self.sigma = np.repeat([sigma_position, sigma_velocity], 2)
+        self.rng = np.random.default_rng(seed)
+
+        self.fleet = Fleet(self.config.mu, capacity=2 * num_envs, solver=self.config.kepler_solver)
+        self.ship = np.arange(self.fleet.add(num_envs), num_envs)
+        self.debris = np.arange(self.fleet.add(num_envs), 2 * num_envs)
+        self.catch_reach = (self.config.ship_radius + self.config.debris_radius) * self.config.world_radius
+        self.star_reach = (self.config.planet_radius + self.config.ship_radius) * self.config.world_radius
+        self.steps = np.zeros(num_envs, dtype=int)
+        self.reset()
+
+    def _initial_states(self, count, position, velocity):
+        nominal = np.concatenate([position, velocity]).astype(float)
+        states = nominal + self.sigma * self.rng.standard_normal((count, 4))
+        return states[:, :2], states[:, 2:]
+
+    def reset(self, envs=None):
+        """Start games `envs` (default all) over; return the observations of all games."""
+        envs = np.arange(self.num_envs) if envs is None else np.asarray(envs)
+        if len(envs):
+            config = self.config
+            for rows, position, velocity in ((self.ship[envs], config.ship_position, config.ship_velocity),
+                                             (self.debris[envs], config.debris_position, config.debris_velocity)):
+                self.fleet.set_elements(rows, *elements_from_state(*self._initial_states(len(envs), position,
+                                                                                          velocity), config.mu))
+            self.steps[envs] = 0
+        return self.observe()
+
+    def observe(self):
+        r, v = self.fleet.get_states()
+        fleet = self.fleet
+        return np.column_stack([r[self.debris] - r[self.ship], v[self.debris] - v[self.ship],
+                                *(getattr(fleet, name)[self.ship] for name in ('a', 'e', 'omega', 'M')),
+                                *(getattr(fleet, name)[self.debris] for name in ('a', 'e', 'omega', 'M'))])
+
+    def step(self, actions):
+        """Apply one action per game and advance one tick.
+
+        Returns (observations, rewards, dones, info). For games that ended this
+        step the observation is already that of the fresh game; info holds
+        'final_observation' for them, and boolean arrays 'caught', 'crashed' and
+        'truncated'.
+        """
+        actions = np.asarray(actions)
+        delta_v = np.select([actions == PROGRADE, actions == RETROGRADE], [1.0, -1.0], 0.0) * self.config.delta_v
+
+        # tangential burns, as Planet.add_delta_v
+        burning = np.nonzero(delta_v)[0]
+        if len(burning):
+            rows = self.ship[burning]
+            r, v = self.fleet.get_states(rows)
+            v = v + delta_v[burning, None] * v / np.linalg.norm(v, axis=1)[:, None]
+            self.fleet.set_states(rows, r, v)
+
+        duration = self.config.dt
+        caught, crashed, _ = rendezvous_outcome(self.fleet, self.ship, self.debris, self.catch_reach,
+                                                self.star_reach, duration)
+        self.fleet.propagate(duration)
+        self.steps += 1
+
+        truncated = np.zeros(self.num_envs, dtype=bool)
+        if self.max_steps is not None:
+            truncated = (self.steps >= self.max_steps) & ~caught & ~crashed
+        dones = caught | crashed | truncated
+        rewards = (self.catch_reward * caught + self.crash_reward * crashed -
+                   self.fuel_cost * np.abs(delta_v))
+
+        observations = self.observe()
+        info = {'caught': caught, 'crashed': crashed, 'truncated': truncated}
+        ended = np.nonzero(dones)[0]
+        if len(ended):
+            info['final_observation'] = observations[ended]
+            observations = self.reset(ended)
+        return observations, rewards, dones, info
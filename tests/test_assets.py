@@ -0,0 +1,45 @@
+import os
+from unittest.mock import patch
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame  # noqa: E402
+import pytest  # noqa: E402
+
+from src.assets import ASSET_DIR, cache_path, load_background  # noqa: E402
+from src.config import OrbitConfig  # noqa: E402
+
+SIZE = (64, 48)
+
+
+@pytest.fixture
+def display():
+    pygame.display.init()
+    pygame.display.set_mode(SIZE)
+    yield
+    pygame.display.quit()
+
+
+class TestBackgroundCache:
+    def test_second_load_skips_decoding(self, display, tmp_path):
+        name = OrbitConfig.background_image
+        first = load_background(name, SIZE, tmp_path)
+        assert os.path.exists(cache_path(os.path.join(ASSET_DIR, name), SIZE, tmp_path))
+
+        with patch('pygame.image.load') as mock_load, patch('pygame.transform.scale') as mock_scale:
+            second = load_background(name, SIZE, tmp_path)
+        mock_load.assert_not_called()
+        mock_scale.assert_not_called()
+
+        assert second.get_size() == SIZE
+        assert pygame.image.tobytes(second, "RGB") == pygame.image.tobytes(first, "RGB")
+
+    def test_keyed_by_resolution(self, tmp_path):
+        source = os.path.join(ASSET_DIR, OrbitConfig.background_image)
+        assert cache_path(source, (600, 600), tmp_path) != cache_path(source, (800, 600), tmp_path)
+
+    def test_unwritable_cache_still_loads(self, display, tmp_path):
+        blocked = tmp_path / "file"
+        blocked.write_text("not a directory")
+        surface = load_background(OrbitConfig.background_image, SIZE, blocked)
+        assert surface.get_size() == SIZE
@@ -0,0 +1,35 @@
+from benchmarks.run_benchmarks import build_model, compare, main, run
+
+
+class TestBenchmarks:
+
+    def test_build_model_size(self):
+        model = build_model(50, 0.3)
+        assert len(model.fleet) == 50
+        assert len(model.radii) == 51  # star first
+
+    def test_compare_flags_slowdowns(self):
+        baseline = {"results": [{"name": "update", "n": 2, "e": 0.0, "median": 1.0},
+                                {"name": "render", "n": 2, "e": 0.0, "median": 1.0}]}
+        results = [{"name": "update", "n": 2, "e": 0.0, "median": 1.1},
+                   {"name": "render", "n": 2, "e": 0.0, "median": 2.0},
+                   {"name": "new", "n": 2, "e": 0.0, "median": 9.0}]
+        regressions = compare(results, baseline, threshold=1.25)
+        assert [case["name"] for case in regressions] == ["render"]
+        assert regressions[0]["ratio"] == 2.0
+
+    def test_run_and_compare_round_trip(self, tmp_path):
+        output = tmp_path / "bench.json"
+        args = ["--sizes", "2", "--eccentricities", "0.1", "--min-time", "0", "--no-render"]
+        assert main(args + ["--output", str(output)]) == 0
+        assert output.exists()
+        assert main(args + ["--baseline", str(output), "--threshold", "1e9"]) == 0
+
+    def test_run_covers_hot_paths(self):
+        names = {case["name"] for case in run([2], [0.0], min_time=0, render=False)}
+        assert {"Planet.get_state", "GameModel.update", "GameModel.detect_collisions",
+                "solve_kepler[newton]"} <= names
+
+    def test_kepler_cases_report_convergence(self):
+        cases = [case for case in run([100], [0.5], min_time=0, render=False) if case["name"].startswith("solve_kepler")]
+        assert cases and all(case["mean_iterations"] >= 1 and case["max_residual"] < 1e-8 for case in cases)
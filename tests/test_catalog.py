@@ -0,0 +1,144 @@
+import numpy as np
+import pytest
+
+from src.catalog import CATALOG_DTYPE, Catalog, import_csv
+from src.config import OrbitConfig
+from src.orbit_model import Fleet, GameModel, state_from_elements
+
+
+def write_states(path, count, extra_columns=None, seed=0):
+    """CSV of `count` random bound orbits; returns the (r, v) arrays written."""
+    mu = OrbitConfig.mu
+    rng = np.random.default_rng(seed)
+    r, v = state_from_elements(rng.uniform(6e6, 9e6, count), rng.uniform(0, 0.3, count),
+                               rng.uniform(0, 2 * np.pi, count), rng.uniform(0, 2 * np.pi, count), mu)
+    header = ['x', 'y', 'vx', 'vy']
+    columns = [r, v]
+    for name, values in (extra_columns or {}).items():
+        header.append(name)
+        columns.append(np.reshape(values, (count, -1)))
+    np.savetxt(path, np.column_stack(columns), delimiter=',', header=','.join(header), comments='')
+    return r, v
+
+
+class TestCatalog:
+    def test_round_trip_states(self, tmp_path):
+        r, v = write_states(tmp_path / "states.csv", 50)
+        assert import_csv(tmp_path / "states.csv", tmp_path / "debris.npy") == 50
+
+        catalog = Catalog(tmp_path / "debris.npy")
+        fleet = Fleet(OrbitConfig.mu)
+        fleet.set_elements(np.arange(fleet.add(len(catalog)), len(catalog)), *catalog.elements())
+        r2, v2 = fleet.get_states()
+        assert np.allclose(r2, r, rtol=1e-9)
+        assert np.allclose(v2, v, rtol=1e-9)
+
+    def test_chunked_import_matches_single_chunk(self, tmp_path):
+        write_states(tmp_path / "states.csv", 103)
+        import_csv(tmp_path / "states.csv", tmp_path / "one.npy")
+        import_csv(tmp_path / "states.csv", tmp_path / "many.npy", chunk_size=10)
+        assert np.array_equal(np.load(tmp_path / "one.npy"), np.load(tmp_path / "many.npy"))
+
+    def test_optional_columns(self, tmp_path):
+        colors = np.tile([1, 2, 3], (4, 1))
+        write_states(tmp_path / "states.csv", 4, {'radius': np.full(4, 0.005), 'r': colors[:, 0],
+                                                  'g': colors[:, 1], 'b': colors[:, 2]})
+        import_csv(tmp_path / "states.csv", tmp_path / "debris.npy")
+        catalog = Catalog(tmp_path / "debris.npy")
+        assert np.allclose(catalog.radii(), 0.005)
+        assert np.array_equal(catalog.colors(), colors)
+
+    def test_defaults_from_config(self, tmp_path):
+        write_states(tmp_path / "states.csv", 3)
+        import_csv(tmp_path / "states.csv", tmp_path / "debris.npy")
+        catalog = Catalog(tmp_path / "debris.npy")
+        assert np.allclose(catalog.radii(), OrbitConfig.debris_radius)
+        assert np.array_equal(catalog.colors()[0], OrbitConfig.debris_color)
+
+    def test_comment_lines_skipped(self, tmp_path):
+        r, v = write_states(tmp_path / "states.csv", 5)
+        lines = (tmp_path / "states.csv").read_text().splitlines()
+        commented = ["# exported debris states", lines[0], "# first batch"] + lines[1:3] + ["  # more"] + lines[3:]
+        (tmp_path / "commented.csv").write_text("\n".join(commented) + "\n")
+        assert import_csv(tmp_path / "commented.csv", tmp_path / "debris.npy", chunk_size=2) == 5
+        import_csv(tmp_path / "states.csv", tmp_path / "plain.npy")
+        assert np.array_equal(np.load(tmp_path / "debris.npy"), np.load(tmp_path / "plain.npy"))
+
+    def test_missing_state_column(self, tmp_path):
+        (tmp_path / "bad.csv").write_text("x,y,vx\n1,2,3\n")
+        with pytest.raises(ValueError):
+            import_csv(tmp_path / "bad.csv", tmp_path / "debris.npy")
+        assert not (tmp_path / "debris.npy").exists()
+
+    def test_bad_row_leaves_no_catalog(self, tmp_path):
+        (tmp_path / "bad.csv").write_text("x,y,vx,vy\n7e6,0,0,7600\n7e6,0,oops,7600\n")
+        with pytest.raises(ValueError):
+            import_csv(tmp_path / "bad.csv", tmp_path / "debris.npy")
+        assert not (tmp_path / "debris.npy").exists()
+
+    def test_rejects_other_arrays(self, tmp_path):
+        np.save(tmp_path / "other.npy", np.zeros(3))
+        with pytest.raises(ValueError):
+            Catalog(tmp_path / "other.npy")
+
+    def test_opens_memory_mapped(self, tmp_path):
+        write_states(tmp_path / "states.csv", 5)
+        import_csv(tmp_path / "states.csv", tmp_path / "debris.npy")
+        catalog = Catalog(tmp_path / "debris.npy")
+        assert isinstance(catalog.rows, np.memmap)
+        assert catalog.rows.dtype == CATALOG_DTYPE
+
+
+class TestGameModelCatalog:
+    def test_catalog_loaded_on_first_update(self, tmp_path):
+        write_states(tmp_path / "states.csv", 20)
+        import_csv(tmp_path / "states.csv", tmp_path / "debris.npy")
+        config = OrbitConfig()
+        config.catalog_path = str(tmp_path / "debris.npy")
+
+        model = GameModel(config)
+        assert len(model.fleet) == 2  # only opened at startup
+
+        model.update()
+        assert len(model.fleet) == 22
+        assert len(model.radii) == 23
+        assert np.array_equal(model.catalog_rows, np.arange(2, 22))
+
+        model.update()
+        assert len(model.fleet) == 22  # loaded once
+
+    def test_large_catalog_paged_in(self, tmp_path):
+        r, v = write_states(tmp_path / "states.csv", 25)
+        import_csv(tmp_path / "states.csv", tmp_path / "debris.npy")
+        config = OrbitConfig()
+        config.catalog_path = str(tmp_path / "debris.npy")
+        config.catalog_page_rows = 10
+
+        model = GameModel(config)
+        model.positions()
+        assert len(model.catalog_rows) == 10
+        while len(model.catalog_rows) < 25:
+            model.update()
+        assert len(model.catalog_rows) == 25
+        assert len(model.radii) == len(model.fleet) + 1
+
+        # bodies paged in later are where the catalog orbits put them at the current time
+        reference = Fleet(OrbitConfig.mu)
+        reference.add_states(r, v)
+        reference.propagate(model.time)
+        r_model, _ = model.fleet.get_states(model.catalog_rows)
+        assert np.allclose(r_model, reference.get_states()[0], rtol=1e-6)
+
+    def test_whole_fleet_history_loads_catalog_first(self, tmp_path):
+        write_states(tmp_path / "states.csv", 25)
+        import_csv(tmp_path / "states.csv", tmp_path / "debris.npy")
+        config = OrbitConfig()
+        config.catalog_path = str(tmp_path / "debris.npy")
+        config.catalog_page_rows = 10
+        config.history_all_bodies = True
+        model = GameModel(config)
+        model.enable_history_spill(str(tmp_path / "history.bin"))
+        model.update()
+        model.update()
+        assert model.history.bodies == len(model.fleet) == 27
+        model.close_history()
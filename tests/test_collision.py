@@ -0,0 +1,262 @@
+import numpy as np
+import pytest
+
+from src.collision import (ConjunctionFilter, broad_phase, closest_approach, first_contact, rendezvous_outcome,
+                           shell_bounds, shell_pairs)
+from src.orbit_model import Fleet, GameModel
+
+
+class TestBroadPhase:
+    def test_matches_brute_force(self):
+        rng = np.random.default_rng(1)
+        positions = rng.uniform(-1, 1, (300, 2))
+        radii = rng.uniform(0, 0.04, 300)
+
+        i, j = broad_phase(positions, radii)
+
+        distance = np.linalg.norm(positions[:, None] - positions[None], axis=2)
+        expected = np.triu(distance <= radii[:, None] + radii[None], 1)
+        assert set(zip(i.tolist(), j.tolist())) == set(zip(*np.nonzero(expected)))
+        assert np.all(i < j)
+
+    def test_spread_of_radii_matches_brute_force(self):
+        rng = np.random.default_rng(2)
+        positions = rng.uniform(-1, 1, (400, 2))
+        # three decades of radii, a few zero, and one star-sized body
+        radii = 10 ** rng.uniform(-4, -1, 400)
+        radii[:5] = 0.0
+        radii[5] = 0.5
+
+        i, j = broad_phase(positions, radii)
+
+        distance = np.linalg.norm(positions[:, None] - positions[None], axis=2)
+        expected = np.triu(distance <= radii[:, None] + radii[None], 1)
+        assert sorted(zip(i.tolist(), j.tolist())) == sorted(zip(*(k.tolist() for k in np.nonzero(expected))))
+
+    def test_no_bodies_no_pairs(self):
+        i, j = broad_phase(np.zeros((1, 2)), 0.1)
+        assert len(i) == len(j) == 0
+
+
+class TestGameModelCollisions:
+    def test_no_collision_at_start(self):
+        game = GameModel()
+        game.update()
+        i, j = game.collisions
+        assert len(i) == 0
+        assert game.collided_with_star is False
+        assert game.caught_satellite is False
+
+    def test_ship_on_debris_is_caught(self):
+        game = GameModel()
+        r, v = game.ships[1].get_state()
+        game.ships[0].set_state(r, v * 1.01)
+        game.update()
+        assert game.caught_satellite is True
+        assert game.collided_with_star is False
+
+    def test_ship_in_star_collides(self):
+        game = GameModel()
+        # low circular orbit inside the star's radius
+        r = 500e3
+        game.ships[0].set_state(np.array([r, 0.0]), np.array([0.0, np.sqrt(game.config.mu / r)]))
+        game.update()
+        assert game.collided_with_star is True
+
+
+def cross_orbits(ship, debris, t_cross):
+    """Put the ship on a retrograde orbit that meets the debris t_cross seconds from now."""
+    r, v = debris.fleet.get_states([debris.index], t_cross)
+    r, v = r[0], v[0]
+    ship.set_state(r, 0.3 * np.array([-v[1], v[0]]) - 0.9 * v)
+    ship.propagate(-t_cross)
+
+
+class TestClosestApproach:
+    def test_finds_pass_between_ticks(self):
+        game = GameModel()
+        game.config.dt = 2000
+        ship, debris = game.ships
+
+        # retrograde crossing at the debris position half way through the tick
+        cross_orbits(ship, debris, 1000)
+        assert game.detect_collisions()[0].size == 0
+
+        t_min, d_min = closest_approach(game.fleet, [ship.index], [debris.index], 2000)
+        assert t_min[0] == pytest.approx(1000, abs=1)
+        assert d_min[0] < 1.0
+
+        game.update()
+        assert game.caught_satellite is True
+
+    def test_stops_at_first_hit_only(self):
+        game = GameModel()
+        ship, debris = game.ships
+        # meet the debris at t=1000 on a slow retrograde orbit that then falls into the star
+        r, v = debris.fleet.get_states([debris.index], 1000)
+        ship.set_state(r[0], -0.2 * v[0])
+        ship.propagate(-1000)
+        assert ship.periapsis()[0] < (game.star.radius_ratio + ship.radius_ratio) * game.config.world_radius
+
+        game.advance(6000)
+        assert game.time == pytest.approx(1000, abs=1)
+        assert game.caught_satellite is True
+        assert game.collided_with_star is False
+
+    def test_sampled_check_misses_it(self):
+        game = GameModel()
+        game.config.dt = 2000
+        game.config.swept_collisions = False
+        ship, debris = game.ships
+        cross_orbits(ship, debris, 1000)
+        game.update()
+        assert game.caught_satellite is False
+
+    def test_central_body(self):
+        game = GameModel()
+        ship = game.ships[0]
+        _, d_min = closest_approach(game.fleet, [ship.index], [-1], 100)
+        r, _ = ship.get_state()
+        # circular-ish orbit: minimum distance to the origin is about the radius
+        assert d_min[0] == pytest.approx(np.linalg.norm(r), rel=0.01)
+
+    def test_bulk_debris_is_caught(self):
+        game = GameModel()
+        r, v = game.ships[0].get_state()
+        rows = game.add_debris(np.array([[1.0e7, 0.0], r]), np.array([[0.0, 6000.0], v * 1.01]), 0.005)
+        game.update()
+        assert game.caught_satellite is True
+        assert len(game.radii) == len(game.fleet) + 1
+        i, j = game.collisions
+        assert rows[1] + 1 in set(i.tolist()) | set(j.tolist())
+
+
+def plunge_and_catch_up(mu=3.986e14):
+    """A ship on a star-grazing orbit and a target just ahead on a slower one, over 1.3 ship periods.
+
+    Their separation dips to about 4.7 km near the first apoapsis, peaks while
+    the ship passes periapsis 300 km from the star, and closes to nothing one
+    ship period later.
+    """
+    ra, rp = 4.0e6, 3.0e5
+    a, e = (ra + rp) / 2, (ra - rp) / (ra + rp)
+    a_target = a * 1.001
+    n, n_target = np.sqrt(mu / a ** 3), np.sqrt(mu / a_target ** 3)
+    fleet = Fleet(mu)
+    fleet.add(2)
+    # same apoapsis; the target leads by what the ship gains in one period
+    fleet.set_elements(np.arange(2), np.array([a, a_target]), np.array([e, ra / a_target - 1]), np.zeros(2),
+                       np.array([np.pi, np.pi + 2 * np.pi * (1 - n_target / n)]), np.array([n, n_target]))
+    fleet.propagate(-150.0)
+    return fleet, 1.3 * 2 * np.pi / n
+
+
+def brute_force_first(fleet, i, j, reach, duration):
+    taus = np.linspace(0.0, duration, 200_001)
+    r_i, _ = fleet.get_states(np.full(len(taus), i), taus)
+    r_j = fleet.get_states(np.full(len(taus), j), taus)[0] if j >= 0 else 0.0
+    inside = np.nonzero(np.linalg.norm(r_i - r_j, axis=1) <= reach)[0]
+    return taus[inside[0]] if len(inside) else np.inf
+
+
+class TestFirstContact:
+    def test_matches_dense_sampling(self):
+        fleet, duration = plunge_and_catch_up()
+        for j, reach in ((1, 4.8e3), (1, 5.8e3), (1, 1e3), (-1, 1.0e6), (1, 1.0)):
+            t_first = first_contact(fleet, [0], [j], reach, duration)[0]
+            expected = brute_force_first(fleet, 0, j, reach, duration)
+            assert t_first == pytest.approx(expected, abs=0.1)
+
+    def test_shallow_dip_between_samples(self):
+        fleet, duration = plunge_and_catch_up()
+        # the whole dip below 4.8 km lies between two of the 9 samples
+        t_first = first_contact(fleet, [0], [1], 4.8e3, duration, samples=8)[0]
+        assert 0 < t_first < duration / 8
+
+    def test_never_and_already_inside(self):
+        fleet, duration = plunge_and_catch_up()
+        # periapsis 300 km from the star's centre
+        assert first_contact(fleet, [0, 0], [-1, 1], [2e5, 1e5], duration).tolist() == [np.inf, 0.0]
+
+    def test_earliest_contact_decides_outcome(self):
+        # a shallow catch before the star pass wins over the deeper approach after it
+        fleet, duration = plunge_and_catch_up()
+        _, d_min = closest_approach(fleet, [0, 0], [1, -1], duration, samples=64)
+        assert d_min[0] < 1.0 and d_min[1] < 1.0e6
+        caught, crashed, t_catch = rendezvous_outcome(fleet, np.array([0]), np.array([1]), 4.8e3, 1.0e6, duration)
+        assert caught[0] and not crashed[0]
+        assert t_catch[0] < duration / 8
+
+        # without the early dip the star comes first
+        caught, crashed, _ = rendezvous_outcome(fleet, np.array([0]), np.array([1]), 4.0e3, 1.0e6, duration)
+        assert crashed[0] and not caught[0]
+
+
+def brute_force_shells(a, e, reach):
+    lo, hi = shell_bounds(a, e, reach)
+    overlap = np.triu((lo[None] <= hi[:, None]) & (lo[:, None] <= hi[None]), 1)
+    return set(zip(*(index.tolist() for index in np.nonzero(overlap))))
+
+
+def random_orbits(rng, count):
+    return rng.uniform(6000e3, 9000e3, count), rng.uniform(0, 0.3, count)
+
+
+class TestConjunctionFilter:
+    def test_sweep_matches_brute_force(self):
+        rng = np.random.default_rng(2)
+        a, e = random_orbits(rng, 400)
+        e[:3] = [1.5, 1.0, np.nan]  # hyperbola, parabola, unset row
+        a[0] = -7000e3
+        reach = rng.uniform(0, 50e3, 400)
+        i, j = shell_pairs(*shell_bounds(a, e, reach))
+        assert set(zip(i.tolist(), j.tolist())) == brute_force_shells(a, e, reach)
+        assert np.all(i < j)
+
+    def test_incremental_update_matches_fresh_screen(self):
+        rng = np.random.default_rng(3)
+        a, e = random_orbits(rng, 300)
+        conjunctions = ConjunctionFilter()
+        conjunctions.update(a, e, 10e3)
+        a, e = a.copy(), e.copy()
+        a[[5, 17]] *= 1.2
+        e[17] = 0.6
+        a, e = np.append(a, 7000e3), np.append(e, 0.1)  # a new body
+        i, j = conjunctions.update(a, e, 10e3)
+        assert conjunctions.rescreened == 3
+        assert len(i) == len(set(zip(i.tolist(), j.tolist())))
+        assert set(zip(np.minimum(i, j).tolist(), np.maximum(i, j).tolist())) == brute_force_shells(a, e, 10e3)
+
+        conjunctions.update(a, e, 10e3)
+        assert conjunctions.rescreened == 0
+
+    def test_subjects_only(self):
+        rng = np.random.default_rng(4)
+        a, e = random_orbits(rng, 200)
+        conjunctions = ConjunctionFilter(subjects=[0, 1])
+        conjunctions.update(a, e, 10e3)
+        a = a.copy()
+        a[[0, 50]] *= 0.9
+        i, j = conjunctions.update(a, e, 10e3)
+        expected = {pair for pair in brute_force_shells(a, e, 10e3) if {0, 1} & set(pair)}
+        assert set(zip(i.tolist(), j.tolist())) == expected
+        assert len(i) == len(expected)
+
+    def test_swept_check_skips_unreachable_orbits(self):
+        game = GameModel()
+        # one body far outside the player's orbit, one on it
+        r, v = game.ships[0].get_state()
+        rows = game.add_debris(np.array([[5.0e7, 0.0], r]), np.array([[0.0, 2800.0], v * 1.01]), 0.005)
+        candidates = game.conjunction_candidates()
+        assert rows[0] not in candidates
+        assert rows[1] in candidates
+        game.update()
+        assert game.caught_satellite is True
+        assert game.conjunctions.rescreened == 0  # nothing burned since the first screen
+
+    def test_swept_samples_follow_orbits_not_ticks(self):
+        game = GameModel()
+        rows = [ship.index for ship in game.ships]
+        period = 2 * np.pi / game.fleet.n[rows].max()
+        assert game.swept_samples(game.config.dt, rows) == 8
+        assert game.swept_samples(3 * period, rows) == 3 * game.config.swept_samples_per_orbit
@@ -175,3 +175,224 @@ class TestGameController:
         # Verify coordination
         controller_with_mocks.mock_model.update.assert_called()
         controller_with_mocks.mock_view.render.assert_called_with(controller_with_mocks.mock_model)
+
+    # =============================================
+    # 5. FIXED TIMESTEP TESTING
+    # =============================================
+
+    def test_step_runs_whole_ticks_and_returns_alpha(self, controller_with_mocks):
+        """Test accumulated frame time is consumed in whole physics ticks"""
+        controller_with_mocks.mock_model.collided_with_star = False
+        controller_with_mocks.mock_model.caught_satellite = False
+        tick = controller_with_mocks.tick_length
+
+        alpha = controller_with_mocks.step(2.5 * tick)
+        assert controller_with_mocks.mock_model.update.call_count == 2
+        assert alpha == pytest.approx(0.5)
+
+        # leftover carries into the next frame
+        controller_with_mocks.step(0.6 * tick)
+        assert controller_with_mocks.mock_model.update.call_count == 3
+
+    def test_step_caps_catch_up(self, controller_with_mocks):
+        """Test a long stall runs at most max_substeps ticks and drops the backlog"""
+        controller_with_mocks.mock_model.collided_with_star = False
+        controller_with_mocks.mock_model.caught_satellite = False
+        max_substeps = controller_with_mocks.config.max_substeps
+
+        controller_with_mocks.step(100 * max_substeps * controller_with_mocks.tick_length)
+        assert controller_with_mocks.mock_model.update.call_count == max_substeps
+        assert controller_with_mocks.accumulator == 0.0
+
+    def test_step_stops_on_game_end(self, controller_with_mocks):
+        """Test no more ticks run after the game ended"""
+        controller_with_mocks.mock_model.collided_with_star = True
+        controller_with_mocks.step(3 * controller_with_mocks.tick_length)
+        controller_with_mocks.mock_model.update.assert_called_once()
+
+    # =============================================
+    # 6. AUTOPILOT TESTING
+    # =============================================
+
+    @patch('src.orbit_controller.RendezvousPlanner')
+    def test_autopilot_hands_plan_to_model(self, MockPlanner, controller_with_mocks):
+        """Test physics waits while planning and the finished plan is executed"""
+        planner = MockPlanner.return_value
+        planner.done = False
+        controller_with_mocks.start_autopilot()
+
+        controller_with_mocks.step(10 * controller_with_mocks.tick_length)
+        controller_with_mocks.mock_model.update.assert_not_called()
+        assert controller_with_mocks.planner is planner
+
+        planner.done = True
+        plan = Mock(burns=[Mock()], total_delta_v=10.0)
+        planner.step.return_value = plan
+        controller_with_mocks.step(0.0)
+        controller_with_mocks.mock_model.execute_plan.assert_called_once_with(plan)
+        assert controller_with_mocks.planner is None
+
+    @patch('src.orbit_controller.RendezvousPlanner')
+    def test_burn_while_planning_restarts_search(self, MockPlanner, controller_with_mocks):
+        """Test a burn during the search restarts it from the changed state"""
+        from src.replay import Action
+        MockPlanner.return_value.done = False
+        controller_with_mocks.mock_model.collided_with_star = False
+        controller_with_mocks.mock_model.caught_satellite = False
+        controller_with_mocks.start_autopilot()
+
+        controller_with_mocks.perform(Action.PROGRADE)
+        controller_with_mocks.mock_model.change_orbit.assert_called_once_with(True)
+        assert MockPlanner.call_count == 2
+        MockPlanner.assert_called_with(controller_with_mocks.mock_model)
+
+    @patch('src.orbit_controller.OrbitRenderer')
+    def test_replay_matches_burn_while_planning(self, MockView, tmp_path):
+        """Test a session with a burn during the search replays to the same state"""
+        from src.replay import Action, Replay
+        config = OrbitConfig()
+        config.record_path = str(tmp_path / "session.orblog")
+        controller = OrbitController(config)
+        for _ in range(3):
+            controller.model.update()
+        controller.start_autopilot()
+        controller.planner.step(0.0)
+        controller.perform(Action.PROGRADE)
+        while controller.planner is not None:
+            controller.step_autopilot()
+        for _ in range(20):
+            controller.model.update()
+        controller.recorder.close(controller.model)
+
+        model, verified = Replay(config.record_path).run()
+        assert verified is True
+        assert model.time == controller.model.time
+
+    # =============================================
+    # 7. PROFILING TESTING
+    # =============================================
+
+    def test_profiling_off_by_default(self, controller_with_mocks):
+        """Test the loop uses the no-op profiler unless profiling is enabled"""
+        assert controller_with_mocks.profiler.enabled is False
+
+    def test_profiling_attaches_overlay(self, mock_pygame):
+        """Test enabling profiling hands the profiler to the view for the overlay"""
+        config = OrbitConfig()
+        config.profile = True
+        controller = OrbitController(config)
+        assert controller.profiler.enabled is True
+        assert controller.view.profiler is controller.profiler
+
+    # =============================================
+    # 8. RECORDING TESTING
+    # =============================================
+
+    @patch('pygame.event.get')
+    def test_actions_are_recorded(self, mock_get_events, controller_with_mocks):
+        """Test model-changing keys are written to the session log with the current tick"""
+        from src.replay import Action
+        controller_with_mocks.recorder = Mock()
+        controller_with_mocks.mock_model.tick = 7
+        up_event = MagicMock()
+        up_event.type = pygame.KEYDOWN
+        up_event.key = pygame.K_UP
+        mock_get_events.return_value = [up_event]
+
+        controller_with_mocks.handle_events()
+        controller_with_mocks.recorder.record.assert_called_once_with(7, Action.PROGRADE)
+        controller_with_mocks.mock_model.change_orbit.assert_called_once_with(True)
+
+    # =============================================
+    # 9. IDLE AND PACING TESTING
+    # =============================================
+
+    @patch('pygame.event.wait')
+    @patch('pygame.event.get')
+    def test_handle_events_blocks_only_with_timeout(self, mock_get_events, mock_wait, controller_with_mocks):
+        """Test an empty queue is waited on only when a timeout is given"""
+        mock_get_events.return_value = []
+        controller_with_mocks.handle_events()
+        mock_wait.assert_not_called()
+
+        space_event = MagicMock()
+        space_event.type = pygame.KEYDOWN
+        space_event.key = pygame.K_SPACE
+        mock_wait.return_value = space_event
+        controller_with_mocks.handle_events(0.5)
+        mock_wait.assert_called_once_with(500)
+        assert controller_with_mocks.paused is True
+
+    @patch('pygame.quit')
+    @patch('pygame.event.wait')
+    @patch('pygame.event.get')
+    def test_paused_loop_sleeps_and_renders_on_demand(self, mock_get_events, mock_wait, mock_quit, mock_pygame):
+        """Test a paused game blocks on input, draws once, and runs no physics"""
+        config = OrbitConfig()
+        config.paused = True
+        controller = OrbitController(config)
+        quit_event = MagicMock()
+        quit_event.type = pygame.QUIT
+        mock_get_events.return_value = []
+        mock_wait.side_effect = [MagicMock(type=pygame.NOEVENT)] * 3 + [quit_event]
+
+        controller.run()
+        assert mock_wait.call_count == 4
+        assert controller.view.render.call_count == 2  # the first frame, then the QUIT wake-up
+        controller.model.update.assert_not_called()
+
+    @patch('pygame.time.wait')
+    def test_pacer_sleeps_rest_of_frame(self, mock_sleep):
+        """Test the pacer sleeps out the frame budget left after the work"""
+        from src.orbit_controller import FramePacer
+        pacer = FramePacer(fps=10, min_fps=2)
+        pacer.wait(0.03)
+        mock_sleep.assert_called_once_with(70)
+
+    @patch('pygame.time.wait')
+    def test_pacer_stretches_under_load(self, mock_sleep):
+        """Test sustained overruns lengthen the frame interval, bounded by min_fps, and recover"""
+        from src.orbit_controller import FramePacer
+        pacer = FramePacer(fps=10, min_fps=2)
+        for _ in range(100):
+            pacer.wait(0.2)
+        assert pacer.interval == pytest.approx(0.25, rel=1e-3)
+        for _ in range(100):
+            pacer.wait(1.0)
+        assert pacer.interval == 0.5
+        for _ in range(200):
+            pacer.wait(0.01)
+        assert pacer.interval == pytest.approx(0.1)
+
+    # =============================================
+    # 10. SERVER CLIENT TESTING
+    # =============================================
+
+    @patch('src.orbit_controller.OrbitRenderer')
+    @patch('src.orbit_controller.SessionClient')
+    def test_client_mirror_propagates_like_server(self, MockClient, MockView):
+        """Test the mirror model stays two-body like the server, even with perturbations configured"""
+        config = OrbitConfig()
+        config.propagator = 'perturbed'
+        config.server_address = "127.0.0.1:5555"
+        controller = OrbitController(config)
+        assert controller.model.fleet.propagator is None
+
+    @patch('src.orbit_controller.SessionClient')
+    def test_client_mode_forwards_burns_and_polls(self, MockClient, mock_pygame):
+        """Test a controller on a server sends actions and takes ticks from the server"""
+        from src.replay import Action
+        config = OrbitConfig()
+        config.server_address = "127.0.0.1:5555"
+        controller = OrbitController(config)
+        client = MockClient.connect.return_value
+        MockClient.connect.assert_called_once_with("127.0.0.1:5555")
+
+        controller.perform(Action.PROGRADE)
+        client.send.assert_called_once_with(Action.PROGRADE)
+        controller.model.change_orbit.assert_not_called()
+
+        client.connected = True
+        assert controller.step(1.0) == 1.0
+        client.poll.assert_called_once_with(controller.model)
+        controller.model.update.assert_not_called()
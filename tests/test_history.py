@@ -0,0 +1,148 @@
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from src.config import OrbitConfig
+from src.history import TrajectoryHistory, read_spill
+from src.orbit_model import GameModel
+
+
+def fill(history, count, bodies=3, seed=0):
+    """Record `count` random ticks at times 0..count-1; return the positions recorded."""
+    r = np.random.default_rng(seed).standard_normal((count, bodies, 2))
+    for k in range(count):
+        history.record(float(k), r[k], -r[k])
+    return r
+
+
+class TestTrajectoryHistory:
+    @pytest.mark.parametrize("count", [3, 5, 6, 12, 13])
+    def test_window_is_latest_samples_in_order(self, count):
+        history = TrajectoryHistory(5, 3)
+        r = fill(history, count)
+        kept = min(count, 5)
+        assert len(history) == kept
+        assert history.times().tolist() == list(range(count - kept, count))
+        assert np.array_equal(history.positions(), r[count - kept:])
+        assert np.array_equal(history.velocities(2), -r[count - 2:])
+
+    def test_views_share_the_buffer(self):
+        history = TrajectoryHistory(4, 3)
+        fill(history, 7)
+        positions = history.positions()
+        assert np.shares_memory(positions, history._buffer)
+        with pytest.raises(ValueError):
+            positions[0, 0, 0] = 1.0
+
+    def test_records_selected_rows(self):
+        history = TrajectoryHistory(4, 2)
+        r = np.arange(10.0).reshape(5, 2)
+        history.record(0.0, r, 2 * r, rows=np.array([3, 1]))
+        assert np.array_equal(history.positions()[0], r[[3, 1]])
+        assert np.array_equal(history.velocities()[0], 2 * r[[3, 1]])
+
+    def test_recording_does_not_allocate(self):
+        history = TrajectoryHistory(100, 50)
+        r = np.ones((200, 2))
+        rows = np.arange(0, 200, 4)
+        history.record(0.0, r, r, rows)
+        tracemalloc.start()
+        for k in range(1000):
+            history.record(float(k), r, r, rows)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        assert peak < 10_000  # bytes; one tick of states alone is 1600
+
+    def test_spill_keeps_every_sample(self, tmp_path):
+        path = tmp_path / "history.bin"
+        history = TrajectoryHistory(4, 3, spill_path=path)
+        r = fill(history, 10)
+        assert history.spilled == 8  # two full laps
+        assert history.spilled_records()['time'].tolist() == list(range(8))
+
+        history.close()
+        records = read_spill(path, 3)
+        assert isinstance(records, np.memmap)
+        assert records['time'].tolist() == list(range(10))
+        assert np.array_equal(records['r'], r)
+
+    def test_spill_never_overwrites(self, tmp_path):
+        path = tmp_path / "history.bin"
+        path.write_bytes(b"earlier run")
+        with pytest.raises(FileExistsError):
+            TrajectoryHistory(4, 3, spill_path=path)
+        assert path.read_bytes() == b"earlier run"
+
+    def test_rows_out_of_range_rejected(self):
+        history = TrajectoryHistory(4, 2)
+        with pytest.raises(IndexError):
+            history.record(0.0, np.zeros((3, 2)), np.zeros((3, 2)), rows=np.array([0, 3]))
+
+    def test_grow_keeps_samples(self):
+        history = TrajectoryHistory(4, 3)
+        r = fill(history, 6)
+        history.grow(5)
+        assert history.bodies == 5
+        assert np.array_equal(history.positions()[:, :3], r[2:])
+        assert np.isnan(history.positions()[:, 3:]).all()
+        history.record(6.0, np.ones((5, 2)), np.ones((5, 2)))
+        assert history.times().tolist() == [3.0, 4.0, 5.0, 6.0]
+        assert np.array_equal(history.positions()[-1], np.ones((5, 2)))
+
+    def test_spilling_history_cannot_grow(self, tmp_path):
+        history = TrajectoryHistory(4, 3, spill_path=tmp_path / "history.bin")
+        with pytest.raises(ValueError):
+            history.grow(5)
+        history.close()
+
+    def test_capacity_checked(self):
+        with pytest.raises(ValueError):
+            TrajectoryHistory(0, 1)
+
+
+class TestGameModelHistory:
+    def test_ships_recorded_every_tick(self):
+        model = GameModel()
+        for _ in range(5):
+            model.update()
+        assert len(model.history) == 5
+        assert model.history.bodies == len(model.ships)
+        times, r = model.trail(model.ships[1])
+        assert np.allclose(times, model.tick_duration * np.arange(1, 6))
+        assert np.array_equal(r[-1], model.ships[1].get_state()[0])
+
+    def test_spill_only_when_enabled(self, tmp_path):
+        config = OrbitConfig()
+        config.history_spill_path = str(tmp_path / "history.bin")
+        GameModel(config).update()  # e.g. a replay or a Monte Carlo trial of the same config
+        assert not (tmp_path / "history.bin").exists()
+
+        model = GameModel(config)
+        model.enable_history_spill(config.history_spill_path)
+        model.update()
+        model.close_history()
+        assert read_spill(config.history_spill_path, len(model.ships))['time'].tolist() == [model.time]
+        with pytest.raises(ValueError):
+            model.enable_history_spill(config.history_spill_path)
+
+    def test_whole_fleet_and_disabled(self):
+        config = OrbitConfig()
+        config.history_all_bodies = True
+        model = GameModel(config)
+        model.add_debris(np.array([[8e6, 0.0]]), np.array([[0.0, 7000.0]]))
+        model.update()
+        assert model.history.bodies == len(model.fleet)
+        # debris added later is recorded from then on
+        model.add_debris(np.array([[9e6, 0.0]]), np.array([[0.0, 6600.0]]))
+        model.update()
+        assert model.history.bodies == len(model.fleet)
+        assert np.isnan(model.history.positions()[0, -1]).all()
+        assert np.array_equal(model.history.positions()[1, -1], model.fleet.get_states()[0][-1])
+
+        config = OrbitConfig()
+        config.history_length = 0
+        model = GameModel(config)
+        model.update()
+        assert model.history is None
+        assert len(model.trail(model.ships[0])[0]) == 0
@@ -0,0 +1,109 @@
+import numpy as np
+import pytest
+
+from src.kepler import (SOLVERS, get_solver, NewtonSolver, TableSolver, propagate_universal, solve_universal,
+                        stumpff)
+from src.orbit_model import Fleet, state_from_elements
+
+MU = 3.986e14
+
+
+class TestKeplerSolvers:
+    @pytest.mark.parametrize("name", sorted(SOLVERS))
+    def test_solvers_agree_with_reference(self, name):
+        rng = np.random.default_rng(2)
+        M = rng.uniform(0, 2 * np.pi, 2000)
+        e = rng.uniform(0, 0.9, 2000)
+
+        reference = NewtonSolver(tol=1e-14).solve(M, e)
+        solution = get_solver(name).solve(M, e)
+
+        assert np.allclose(solution.E, reference.E, atol=1e-8)
+        assert solution.max_residual < 1e-8
+        assert solution.iterations.shape == M.shape
+
+    def test_higher_order_needs_fewer_iterations(self):
+        M = np.linspace(0, 2 * np.pi, 500)
+        newton = get_solver('newton').solve(M, 0.5)
+        halley = get_solver('halley').solve(M, 0.5)
+        assert halley.total_iterations < newton.total_iterations
+
+    def test_table_falls_back_above_range(self):
+        solver = TableSolver(e_max=0.5)
+        M = np.array([0.5, 2.0])
+        e = np.array([0.3, 0.97])
+        solution = solver.solve(M, e)
+        assert solution.iterations[0] == 1
+        assert solution.iterations[1] > 1
+        assert solution.max_residual < 1e-9
+
+    def test_full_turns_preserved(self):
+        E = get_solver('halley')(np.array([1.0 + 4 * np.pi]), 0.2)
+        assert E[0] - 0.2 * np.sin(E[0]) == pytest.approx(1.0 + 4 * np.pi)
+
+    def test_unknown_solver(self):
+        with pytest.raises(ValueError):
+            get_solver('bisection')
+
+    def test_fleet_uses_selected_solver(self):
+        r = np.array([[7000e3, 0.0], [0.0, 8000e3]])
+        v = np.array([[0.0, 7546.0], [-8000.0, 0.0]])
+        reference, table = Fleet(3.986e14), Fleet(3.986e14, solver='table')
+        reference.add_states(r, v)
+        table.add_states(r, v)
+        assert isinstance(table.solver, TableSolver)
+        assert np.allclose(table.get_states()[0], reference.get_states()[0])
+
+
+def periapsis_states(q, e):
+    """States at periapsis on the x axis for periapsis distances q and eccentricities e."""
+    q, e = np.broadcast_arrays(np.asarray(q, dtype=float), np.asarray(e, dtype=float))
+    r = np.column_stack([q, np.zeros_like(q)])
+    v = np.column_stack([np.zeros_like(q), np.sqrt(MU * (1 + e) / q)])
+    return r, v
+
+
+def invariants(r, v):
+    energy = np.einsum('ij,ij->i', v, v) / 2 - MU / np.linalg.norm(r, axis=1)
+    return energy, r[:, 0] * v[:, 1] - r[:, 1] * v[:, 0]
+
+
+class TestUniversalVariables:
+    def test_stumpff_continuous_at_series_switch(self):
+        z = np.array([-1e-2 - 1e-12, -1e-2 + 1e-12, 1e-2 - 1e-12, 1e-2 + 1e-12, 0.0])
+        C, S = stumpff(z)
+        assert C[0] == pytest.approx(C[1], rel=1e-12) and C[2] == pytest.approx(C[3], rel=1e-12)
+        assert S[0] == pytest.approx(S[1], rel=1e-12) and S[2] == pytest.approx(S[3], rel=1e-12)
+        assert (C[4], S[4]) == (0.5, 1 / 6)
+
+    def test_matches_kepler_path_on_ellipses(self):
+        rng = np.random.default_rng(5)
+        a = rng.uniform(5e6, 2e7, 500)
+        e = rng.uniform(0, 0.9, 500)
+        M = rng.uniform(-np.pi, np.pi, 500)
+        r, v = propagate_universal(*periapsis_states(a * (1 - e), e), M / np.sqrt(MU / a ** 3), MU)
+        r_ref, v_ref = state_from_elements(a, e, np.zeros(500), M, MU)
+        assert np.allclose(r, r_ref, rtol=0, atol=1e-3)
+        assert np.allclose(v, v_ref, rtol=0, atol=1e-6)
+
+    def test_every_conic_round_trips(self):
+        # ellipse, near-parabolic on both sides, parabola, hyperbolas
+        e = np.array([0.97, 1 - 1e-9, 1.0, 1 + 1e-9, 1.5, 4.0])
+        r0, v0 = periapsis_states(7e6, e)
+        dt = np.array([3000.0, 5e4, -5e4, 2e5, 1e5, -1e5])
+        r, v = propagate_universal(r0, v0, dt, MU)
+        back_r, back_v = propagate_universal(r, v, -dt, MU)
+        assert np.all(np.isfinite(r)) and np.all(np.isfinite(v))
+        assert np.allclose(back_r, r0, rtol=0, atol=1e-2)
+        assert np.allclose(back_v, v0, rtol=0, atol=1e-6)
+        for before, after in zip(invariants(r0, v0), invariants(r, v)):
+            assert np.allclose(after, before, rtol=1e-9, atol=1e-6)
+
+    def test_fast_convergence_near_parabola(self):
+        rng = np.random.default_rng(6)
+        e = 1 + rng.uniform(-1e-3, 1e-3, 1000)
+        r0, v0 = periapsis_states(7e6, e)
+        radius = np.linalg.norm(r0, axis=1)
+        alpha = 2 / radius - np.einsum('ij,ij->i', v0, v0) / MU
+        _, iterations = solve_universal(radius, np.zeros(1000), alpha, rng.uniform(-1e5, 1e5, 1000), MU)
+        assert iterations.max() <= 8
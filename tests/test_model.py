@@ -2,7 +2,8 @@ import math
 from math import gamma
 
 import pytest
-from src.orbit_model import Planet, GameModel
+import numpy as np
+from src.orbit_model import Planet, GameModel, Fleet, solve_kepler, elements_from_state, state_from_elements
 
 
 class TestPlanet:
@@ -43,6 +44,89 @@ class TestPlanet:
         assert planet.period < prev_period
 
 
+class TestFleet:
+    def test_planet_is_view_on_fleet_row(self):
+        game = GameModel()
+        ship = game.ships[0]
+        assert ship.fleet is game.fleet
+        assert game.fleet.a[ship.index] == ship.a
+
+        # writing through the view updates the fleet
+        ship.M = 1.0
+        assert game.fleet.M[ship.index] == 1.0
+
+    def test_vectorized_states_match_planets(self):
+        game = GameModel()
+        r, v = game.fleet.get_states()
+        for ship in game.ships:
+            r_ship, v_ship = ship.get_state()
+            assert np.allclose(r[ship.index], r_ship)
+            assert np.allclose(v[ship.index], v_ship)
+
+    def test_add_states_round_trip(self):
+        fleet = Fleet(3.986e14)
+        r = np.array([[7000e3, 0.0], [0.0, 8000e3], [-6500e3, 1000e3]])
+        v = np.array([[0.0, 7546.0], [-7200.0, 0.0], [-1000.0, -7800.0]])
+        fleet.add_states(r, v)
+        r_out, v_out = fleet.get_states()
+        assert len(fleet) == 3
+        assert np.allclose(r_out, r, rtol=1e-6)
+        assert np.allclose(v_out, v, rtol=1e-6)
+
+    def test_propagate_advances_all_bodies(self):
+        game = GameModel()
+        M = game.fleet.M.copy()
+        game.fleet.propagate(10)
+        assert np.allclose(game.fleet.M, (M + game.fleet.n * 10) % (2 * np.pi))
+
+    def test_solve_kepler_vectorized(self):
+        M = np.linspace(0, 2 * np.pi, 50)
+        e = np.linspace(0, 0.95, 50)
+        E = solve_kepler(M, e)
+        assert np.allclose(E - e * np.sin(E), M, atol=1e-9)
+
+        # scalar API on Planet still returns a plain float
+        E_scalar = Planet.solve_kepler(1.0, 0.3)
+        assert isinstance(E_scalar, float)
+        assert E_scalar - 0.3 * np.sin(E_scalar) == pytest.approx(1.0)
+
+
+class TestStateCache:
+    def test_repeated_get_state_hits_cache(self):
+        game = GameModel()
+        ship = game.ships[0]
+        r1, _ = ship.get_state()
+        r2, _ = ship.get_state()
+        assert r1 is r2
+        assert ship.cache_misses == 1
+        assert ship.cache_hits == 1
+
+    def test_update_primes_cache(self):
+        game = GameModel()
+        game.update()
+        ship = game.ships[0]
+        ship.get_state()
+        assert ship.cache_misses == 0
+        assert ship.cache_hits == 1
+
+    def test_cache_invalidated_by_changes(self):
+        game = GameModel()
+        ship = game.ships[0]
+        r_start, _ = ship.get_state()
+
+        ship.propagate(100)
+        r_later, _ = ship.get_state()
+        assert not np.allclose(r_start, r_later)
+
+        ship.add_delta_v(100)  # reuses the cached state for the burn
+        ship.get_state()
+        game.fleet.propagate(100)  # bypasses the view, caught by the key
+        r_fleet, _ = ship.get_state()
+        assert np.allclose(r_fleet, game.fleet.get_states([ship.index])[0][0])
+        assert ship.cache_misses == 4
+        assert ship.cache_hits == 1
+
+
 class TestGameModel:
     def test_gamemodel_initialization(self):
 
@@ -76,3 +160,159 @@ class TestGameModel:
         game.ships[0].y = game.ships[0].radius_ratio / 2
         is_collision = game.detect_collision(game.ships[0], game.star)
         assert is_collision is True
+
+
+class TestTimeWarp:
+    def test_warp_scales_update(self):
+        game = GameModel()
+        game.change_time_warp(True)
+        assert game.time_warp == game.config.time_warp_levels[1]
+        game.update()
+        assert game.time == pytest.approx(game.config.dt * game.time_warp)
+        assert game.tick == 1
+
+        # clamped at the lowest level
+        game.change_time_warp(False)
+        game.change_time_warp(False)
+        assert game.warp_level == 0
+
+    def test_advance_matches_stepping(self):
+        stepped, jumped = GameModel(), GameModel()
+        for _ in range(50):
+            stepped.update()
+        jumped.advance(50 * jumped.config.dt)
+        assert np.allclose(jumped.fleet.M, stepped.fleet.M)
+        assert jumped.time == pytest.approx(stepped.time)
+
+    def test_skip_to_apsides(self):
+        game = GameModel()
+        game.change_orbit(True)  # make the orbit clearly elliptical
+        game.skip_to('apoapsis')
+        assert game.ships[0].M == pytest.approx(np.pi)
+        game.skip_to('periapsis')
+        assert np.cos(game.ships[0].M) == pytest.approx(1.0)
+
+    def test_skip_to_close_approach(self):
+        game = GameModel()
+        horizon = 2 * np.pi / min(game.ships[0].n, game.ships[1].n)
+        before = [np.linalg.norm(np.subtract(*[game.fleet.get_states([k], t)[0][0] for k in (0, 1)]))
+                  for t in np.linspace(0, horizon, 200)]
+        game.skip_to('approach')
+        r_ship, r_debris = game.ships[0].get_state()[0], game.ships[1].get_state()[0]
+        assert np.linalg.norm(r_ship - r_debris) <= min(before) + 1.0
+
+    def test_skip_stops_at_collision(self):
+        game = GameModel()
+        ship, debris = game.ships
+        r, v = debris.fleet.get_states([debris.index], 5000)
+        ship.set_state(r[0], 0.3 * np.array([-v[0, 1], v[0, 0]]) - 0.9 * v[0])
+        ship.propagate(-5000)
+        game.advance(20000)
+        assert game.caught_satellite is True
+        assert game.time == pytest.approx(5000, abs=1)
+
+
+class TestManeuverPreview:
+    def test_preview_candidates(self):
+        game = GameModel()
+        preview = game.preview_maneuvers()
+        count = 2 * game.config.preview_burns + 1
+        assert preview.delta_v.shape == (count,)
+        assert preview.min_distance.shape == (count,)
+
+        # the zero burn candidate reproduces the current orbit
+        zero = game.config.preview_burns
+        assert preview.a[zero] == pytest.approx(game.ships[0].a)
+        assert preview.e[zero] == pytest.approx(game.ships[0].e, abs=1e-9)
+
+    def test_preview_matches_committed_burn(self):
+        game = GameModel()
+        preview = game.preview_maneuvers()
+        best = preview.best
+        burns = int(round(preview.delta_v[best] / game.config.delta_v))
+        for _ in range(abs(burns)):
+            game.change_orbit(burns > 0)
+        assert game.ships[0].a == pytest.approx(preview.a[best], rel=1e-9)
+
+        # follow the committed orbit to the predicted time and check the distance
+        game.config.swept_collisions = False
+        game.advance(preview.time_of_min[best] - game.time)
+        r_ship, r_debris = game.ships[0].get_state()[0], game.ships[1].get_state()[0]
+        assert np.linalg.norm(r_ship - r_debris) == pytest.approx(preview.min_distance[best], rel=1e-3)
+
+    def test_preview_cached_until_tick_or_burn(self):
+        game = GameModel()
+        preview = game.preview_maneuvers()
+        assert game.preview_maneuvers() is preview
+        game.update()
+        ticked = game.preview_maneuvers()
+        assert ticked is not preview
+        assert ticked.computed_at == game.time
+        # the burn point moved along the orbit, so the candidate orbits differ
+        assert not np.allclose(ticked.omega, preview.omega)
+        game.change_orbit(True)
+        assert game.preview_maneuvers() is not ticked
+
+
+class TestOpenOrbits:
+    def escape(self, game):
+        ship = game.ships[0]
+        while ship.e < 1.2:
+            ship.add_delta_v(500)
+        return ship
+
+    def test_elements_round_trip_for_every_conic(self):
+        mu = 3.986e14
+        r = np.array([[7e6, 0.0], [0.0, -7e6], [5e6, 5e6], [-7e6, 0.0]])
+        speed = np.sqrt(mu / 7e6) * np.array([1.4, np.sqrt(2) * (1 + 1e-10), 1.8, 3.0])
+        directions = np.array([[0.0, 1.0], [1.0, 0.2], [-0.6, 0.7], [-1.0, -0.1]])
+        v = speed[:, None] * directions / np.linalg.norm(directions, axis=1)[:, None]
+        with np.errstate(all='raise'):
+            a, e, omega, M, n = elements_from_state(r, v, mu)
+            r_out, v_out = state_from_elements(a, e, omega, M, mu)
+        assert e[0] > 0.95 and e[1] == pytest.approx(1.0, abs=1e-6) and np.all(e[2:] > 1)
+        assert np.all(a[2:] < 0)
+        # a (1 - e) keeps fewer digits the closer e is to 1
+        for rows, rtol in (([0, 2, 3], 1e-8), ([1], 1e-6)):
+            assert np.allclose(r_out[rows], r[rows], rtol=rtol, atol=rtol * 7e6)
+            assert np.allclose(v_out[rows], v[rows], rtol=rtol)
+
+    def test_ship_escapes(self):
+        game = GameModel()
+        ship = self.escape(game)
+        assert ship.apoapsis()[0] == np.inf
+        distances, anomalies = [], []
+        for _ in range(50):
+            game.update()
+            distances.append(np.linalg.norm(ship.get_state()[0]))
+            anomalies.append(ship.M)
+        assert np.all(np.isfinite(distances))
+        assert np.all(np.diff(distances) > 0)
+        assert np.all(np.diff(anomalies) > 0)
+
+    def test_advance_on_open_orbit_matches_stepping(self):
+        stepped, jumped = GameModel(), GameModel()
+        self.escape(stepped)
+        self.escape(jumped)
+        for _ in range(20):
+            stepped.update()
+        jumped.advance(20 * jumped.tick_duration)
+        assert np.allclose(jumped.ships[0].get_state()[0], stepped.ships[0].get_state()[0], rtol=1e-9)
+
+    def test_skips_on_open_orbit(self):
+        game = GameModel()
+        self.escape(game)
+        game.update()
+        assert game.time_to_apoapsis() == np.inf
+        assert game.time_to_periapsis() == np.inf
+        assert game.skip_to('apoapsis') == 0.0
+
+
+class TestHeadless:
+    def test_model_does_not_import_pygame(self):
+        import subprocess
+        import sys
+        code = ("import sys; from src.orbit_model import GameModel; import src.replay, src.montecarlo; "
+                "GameModel().update(); print('pygame' in sys.modules)")
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        assert result.stdout.strip() == "False"
@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+
+from src.config import OrbitConfig
+from src.montecarlo import MonteCarloRunner, nominal_states, run_trial, sample_states, simulate
+from src.orbit_model import GameModel
+from src.planner import Burn, RendezvousPlanner
+
+
+@pytest.fixture(scope="module")
+def plan():
+    return RendezvousPlanner(GameModel()).search()
+
+
+class TestSimulate:
+    def test_matches_stepped_model(self, plan):
+        config = OrbitConfig()
+        horizon = plan.catch_time + 1000
+        caught, crashed, catch_time, delta_v = run_trial(config, plan.burns, horizon)
+        result = simulate(config, plan.burns, nominal_states(config)[None], horizon)[0]
+
+        assert caught and result['caught']
+        assert not crashed and not result['crashed']
+        assert result['delta_v'] == delta_v == plan.total_delta_v
+        # the model stops at the first overlapping tick, the batch at the closest approach
+        assert result['catch_time'] == pytest.approx(catch_time, rel=0.05)
+
+    def test_no_burns_no_catch(self):
+        config = OrbitConfig()
+        result = simulate(config, [], nominal_states(config)[None], 10000)[0]
+        assert not result['caught'] and not result['crashed']
+        assert np.isnan(result['catch_time'])
+        assert result['delta_v'] == 0
+
+    def test_falling_ship_crashes_and_skips_later_burns(self):
+        config = OrbitConfig()
+        states = nominal_states(config)[None].copy()
+        states[0, 2:4] *= 0.1  # nearly radial fall into the star
+        result = simulate(config, [Burn(1e5, 100.0)], states, 2e5)[0]
+        assert result['crashed'] and not result['caught']
+        assert result['delta_v'] == 0
+
+
+class TestMonteCarloRunner:
+    def test_sampling_is_reproducible(self):
+        config = OrbitConfig()
+        first = sample_states(config, 100, 1000.0, 1.0, seed=3, chunk_size=16)
+        assert np.array_equal(first, sample_states(config, 100, 1000.0, 1.0, seed=3, chunk_size=16))
+        assert not np.array_equal(first, sample_states(config, 100, 1000.0, 1.0, seed=4, chunk_size=16))
+
+    def test_zero_spread_repeats_nominal(self, plan):
+        runner = MonteCarloRunner(burns=plan.burns, sigma_position=0.0, sigma_velocity=0.0, workers=1)
+        result = runner.run(5)
+        assert result.catch_rate == 1.0
+        assert np.all(result.catch_time == result.catch_time[0])
+
+    def test_pool_matches_single_process(self, plan):
+        runner = MonteCarloRunner(burns=plan.burns, sigma_position=20e3, sigma_velocity=20.0, chunk_size=8,
+                                  workers=1)
+        single = runner.run(40, seed=1)
+        runner.workers = 2
+        pooled = runner.run(40, seed=1)
+
+        assert np.array_equal(single.caught, pooled.caught)
+        assert np.array_equal(single.catch_time, pooled.catch_time, equal_nan=True)
+        assert np.array_equal(single.delta_v, pooled.delta_v)
+
+    def test_summary(self, plan):
+        result = MonteCarloRunner(burns=plan.burns, sigma_position=20e3, sigma_velocity=20.0, workers=1).run(50)
+        summary = result.summary()
+        assert summary['trials'] == 50
+        assert 0 < summary['catch_rate'] <= 1
+        assert summary['delta_v']['p50'] == plan.total_delta_v
+        assert summary['catch_time']['p5'] <= summary['catch_time']['p95']
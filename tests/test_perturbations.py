@@ -0,0 +1,110 @@
+import numpy as np
+import pytest
+
+from src.config import OrbitConfig
+from src.orbit_model import Fleet, GameModel, elements_from_state, state_from_elements
+from src.perturbations import PerturbedPropagator
+
+MU = OrbitConfig.mu
+
+
+def states(a, e):
+    a, e = np.atleast_1d(a).astype(float), np.atleast_1d(e).astype(float)
+    zeros = np.zeros_like(a)
+    return state_from_elements(a, e, zeros, zeros, MU)
+
+
+class TestIntegrator:
+    def test_unperturbed_matches_kepler(self):
+        a, e = np.array([7e6, 8e6, 9e6]), np.array([0.0, 0.3, 0.7])
+        r, v = states(a, e)
+        duration = 5000.0
+        r1, v1 = PerturbedPropagator(MU).integrate(r, v, duration)
+        r2, v2 = state_from_elements(a, e, np.zeros(3), np.sqrt(MU / a ** 3) * duration, MU)
+        assert np.allclose(r1, r2, atol=10.0)
+        assert np.allclose(v1, v2, atol=1e-2)
+
+    def test_step_size_per_body(self):
+        # a hard body in the batch does not drag the easy one down to its step size
+        propagator = PerturbedPropagator(MU)
+        r, v = states([8e6, 8e6], [0.0, 0.8])
+        propagator.integrate(r, v, 20000.0)
+        circular, eccentric = propagator.steps
+        propagator.integrate(r[:1], v[:1], 20000.0)
+        assert propagator.steps[0] == circular
+        assert eccentric > circular
+
+    def test_j2_apsidal_precession(self):
+        config = OrbitConfig()
+        propagator = PerturbedPropagator(MU, j2=config.j2, body_radius=6378e3)
+        a, e = 8e6, 0.1
+        n = np.sqrt(MU / a ** 3)
+        duration = 10 * 2 * np.pi / n
+        r, v = propagator.integrate(*states(a, e), duration)
+        omega = elements_from_state(r, v, MU)[2][0]
+        # secular rate of the longitude of periapsis for an equatorial orbit
+        expected = 1.5 * n * config.j2 * (6378e3 / (a * (1 - e ** 2))) ** 2 * duration
+        assert omega == pytest.approx(expected, rel=0.05)
+
+    def test_out_of_steps_finishes_on_kepler(self):
+        a, e = np.array([7e6, 8e6]), np.array([0.0, 0.5])
+        propagator = PerturbedPropagator(MU, max_steps=3)
+        r, v = propagator.integrate(*states(a, e), 5000.0)
+        assert np.array_equal(propagator.exhausted, [0, 1])
+        r2, v2 = state_from_elements(a, e, np.zeros(2), np.sqrt(MU / a ** 3) * 5000.0, MU)
+        assert np.allclose(r, r2, atol=10.0)
+        assert np.allclose(v, v2, atol=1e-2)
+
+    def test_drag_lowers_orbit(self):
+        config = OrbitConfig()
+        radius = 800e3 + 400e3
+        kwargs = dict(density=config.atmosphere_density, density_altitude=400e3, ballistic_coefficient=0.02)
+        r, v = PerturbedPropagator(MU, **kwargs).integrate(*states(radius, 0.0), 1000.0)
+        assert elements_from_state(r, v, MU)[0][0] < radius - 1.0
+
+
+class TestPerturbedFleet:
+    def test_negligible_perturbations_stay_analytic(self):
+        propagator = PerturbedPropagator(MU, j2=0.0, ballistic_coefficient=0.0)
+        fleet = Fleet(MU, propagator=propagator)
+        reference = Fleet(MU)
+        for target in (fleet, reference):
+            target.add_states(*states([7e6, 9e6], [0.1, 0.2]))
+            target.propagate(1234.0)
+        assert not len(propagator.perturbed_rows(fleet))
+        for name in Fleet.ELEMENTS:
+            assert np.array_equal(getattr(fleet, name), getattr(reference, name))
+
+    def test_only_significant_bodies_integrated(self):
+        # J2 falls off as 1/r^2: the low orbit crosses the threshold, the high one does not
+        propagator = PerturbedPropagator(MU, j2=1e-3, body_radius=800e3, threshold=1e-5)
+        fleet = Fleet(MU, propagator=propagator)
+        fleet.add_states(*states([2e6, 2e8], [0.0, 0.0]))
+        assert np.array_equal(propagator.perturbed_rows(fleet), [0])
+        fleet.propagate(100.0)
+        assert len(propagator.steps) == 1
+
+    def test_default_threshold_spares_distant_bodies(self):
+        config = OrbitConfig()
+        propagator = PerturbedPropagator.from_config(config)
+        fleet = Fleet(MU, propagator=propagator)
+        # the player's orbit and one far beyond the edge of the screen
+        fleet.add_states(*states([4e6, 3 * config.world_radius], [0.0, 0.0]))
+        assert np.array_equal(propagator.perturbed_rows(fleet), [0])
+
+    def test_game_model_mode(self):
+        config = OrbitConfig()
+        config.propagator = 'perturbed'
+        perturbed, kepler = GameModel(config), GameModel()
+        for _ in range(20):
+            perturbed.update()
+            kepler.update()
+        r_perturbed, _ = perturbed.ships[0].get_state()
+        r_kepler, _ = kepler.ships[0].get_state()
+        assert 0 < np.linalg.norm(r_perturbed - r_kepler) < 0.01 * np.linalg.norm(r_kepler)
+
+    def test_unknown_propagator(self):
+        config = OrbitConfig()
+        config.propagator = 'nbody'
+        with pytest.raises(ValueError):
+            GameModel(config)
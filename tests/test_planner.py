@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from src.orbit_model import GameModel
+from src.planner import RendezvousPlanner, ManeuverPlan, Burn
+
+
+class TestRendezvousPlanner:
+    def test_plan_catches_debris(self):
+        game = GameModel()
+        plan = RendezvousPlanner(game).search()
+        assert plan is not None
+        assert plan.total_delta_v == pytest.approx(sum(abs(burn.delta_v) for burn in plan.burns))
+
+        game.execute_plan(plan)
+        while game.time < plan.catch_time + game.config.dt and not game.caught_satellite:
+            game.update()
+        assert game.caught_satellite is True
+        assert game.collided_with_star is False
+
+    def test_budgeted_steps_resume(self):
+        game = GameModel()
+        planner = RendezvousPlanner(game)
+        planner.step(0.0)  # one batch per call at minimum
+        assert planner.evaluated == game.config.planner_batch_size
+        while not planner.done:
+            planner.step(0.0)
+        assert planner.plan == RendezvousPlanner(game).search()
+
+    def test_no_plan_when_out_of_reach(self):
+        game = GameModel()
+        game.config.planner_max_delta_v = 100
+        game.config.planner_delta_v_step = 50
+        planner = RendezvousPlanner(game)
+        assert planner.search() is None
+        assert planner.done is True
+
+    def test_plan_from_open_orbit(self):
+        game = GameModel()
+        game.ships[0].add_delta_v(4300)
+        assert game.ships[0].e > 1
+        game.config.planner_max_delta_v = 1000
+        game.config.planner_delta_v_step = 250
+        with np.errstate(invalid='raise'):
+            plan = RendezvousPlanner(game).search()
+        assert plan is not None
+        assert plan.burns[0].delta_v < 0  # captured first
+
+
+class TestExecutePlan:
+    def test_burns_fire_at_exact_times(self):
+        game = GameModel()
+        reference = GameModel()
+        game.execute_plan(ManeuverPlan([Burn(250.0, 100.0)]))
+        game.update()
+        game.update()
+        game.update()
+        assert game.pending_burns == []
+
+        reference.advance(250.0)
+        reference.ships[0].add_delta_v(100.0)
+        reference.advance(50.0)
+        assert np.allclose(game.ships[0].get_state()[0], reference.ships[0].get_state()[0])
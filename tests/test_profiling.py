@@ -0,0 +1,71 @@
+import json
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from src.profiling import FrameProfiler, NullProfiler
+
+
+def record(profiler, durations):
+    """Record one frame per (events, update) pair of durations using a fake clock."""
+    clock = [0.0]
+    with patch('src.profiling.perf_counter', lambda: clock[0]):
+        for events, update in durations:
+            profiler.begin_frame()
+            clock[0] += events
+            profiler.mark('events')
+            clock[0] += update
+            profiler.mark('update')
+            profiler.end_frame()
+
+
+class TestFrameProfiler:
+    def test_phase_timings(self):
+        profiler = FrameProfiler(window=10)
+        record(profiler, [(0.001, 0.004)])
+        samples = profiler.samples()
+        assert samples.shape == (1, len(profiler.columns))
+        assert samples[0, profiler.columns.index('events')] == pytest.approx(0.001)
+        assert samples[0, profiler.columns.index('update')] == pytest.approx(0.004)
+        assert samples[0, -1] == pytest.approx(0.005)
+
+    def test_rolling_window(self):
+        profiler = FrameProfiler(window=4)
+        record(profiler, [(0.001 * k, 0.0) for k in range(1, 7)])
+        assert profiler.frames == 6
+        # oldest first, only the last four frames kept
+        assert np.allclose(profiler.samples()[:, 0], [0.003, 0.004, 0.005, 0.006])
+
+    def test_percentiles_and_histogram(self):
+        profiler = FrameProfiler(window=200)
+        record(profiler, [(0.0, 0.001 * k) for k in range(1, 101)])
+        stats = profiler.percentiles()
+        assert stats['frame']['p50'] == pytest.approx(0.0505)
+        assert stats['frame']['p99'] == pytest.approx(0.09901)
+        counts, edges = profiler.histogram(bins=10)
+        assert counts.sum() == 100
+
+    def test_export_csv_and_json(self, tmp_path):
+        profiler = FrameProfiler(window=10)
+        record(profiler, [(0.001, 0.002), (0.003, 0.004)])
+
+        csv_path = tmp_path / "frames.csv"
+        profiler.export(csv_path)
+        lines = csv_path.read_text().splitlines()
+        assert lines[0] == ",".join(profiler.columns)
+        assert len(lines) == 3
+
+        json_path = tmp_path / "frames.json"
+        profiler.export(json_path)
+        data = json.loads(json_path.read_text())
+        assert data['frames'] == 2
+        assert len(data['samples']) == 2
+        assert 'p95' in data['percentiles']['frame']
+
+    def test_null_profiler_is_inert(self):
+        profiler = NullProfiler()
+        profiler.begin_frame()
+        profiler.mark('events')
+        profiler.end_frame()
+        assert profiler.enabled is False
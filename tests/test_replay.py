@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+
+from src.config import OrbitConfig
+from src.orbit_model import GameModel
+from src.replay import Action, InputRecorder, Replay, apply_action, config_from_dict, config_to_dict, read_log
+
+
+def record_session(path, config, script, ticks):
+    """Play `script` ({tick: [actions]}) for `ticks` updates while recording, return the model."""
+    model = GameModel(config)
+    recorder = InputRecorder(path, config)
+    for tick in range(ticks):
+        for action in script.get(tick, []):
+            recorder.record(model.tick, action)
+            apply_action(model, action)
+        model.update()
+        if model.collided_with_star or model.caught_satellite:
+            break
+    recorder.close(model)
+    return model
+
+
+SCRIPT = {3: [Action.PROGRADE], 10: [Action.WARP_UP, Action.PROGRADE], 40: [Action.RETROGRADE],
+          55: [Action.SKIP_APOAPSIS], 60: [Action.WARP_DOWN]}
+
+
+class TestReplay:
+    def test_config_round_trip(self):
+        config = OrbitConfig()
+        config.dt = 37
+        config.ship_velocity = np.array([0.0, 9000.0])
+        restored = config_from_dict(config_to_dict(config))
+        assert restored.dt == 37
+        assert np.array_equal(restored.ship_velocity, config.ship_velocity)
+        assert restored.time_warp_levels == config.time_warp_levels
+
+    def test_log_is_compact(self, tmp_path):
+        path = tmp_path / "session.orblog"
+        record_session(path, OrbitConfig(), SCRIPT, 80)
+        log = read_log(path)
+        assert len(log.records) == 6
+        assert log.records[0] == (3, Action.PROGRADE)
+        assert log.final_tick == 80
+
+    def test_replay_reproduces_state(self, tmp_path):
+        path = tmp_path / "session.orblog"
+        original = record_session(path, OrbitConfig(), SCRIPT, 80)
+        model, verified = Replay(path).run()
+        assert verified is True
+        assert model.time == original.time
+        assert np.array_equal(model.fleet.M, original.fleet.M)
+
+    def test_tampered_log_fails_verification(self, tmp_path):
+        path = tmp_path / "session.orblog"
+        record_session(path, OrbitConfig(), SCRIPT, 80)
+        data = bytearray(path.read_bytes())
+        data[-32 - 5 - 1] = Action.PROGRADE  # action byte of the last record, was WARP_DOWN
+        path.write_bytes(bytes(data))
+        _, verified = Replay(path).run()
+        assert verified is False
+
+    def test_seek_matches_stepping(self, tmp_path):
+        path = tmp_path / "session.orblog"
+        record_session(path, OrbitConfig(), SCRIPT, 80)
+        replay = Replay(path)
+
+        stepped = GameModel(replay.log.config)
+        for tick in range(50):
+            for record_tick, action in replay.log.records:
+                if record_tick == tick:
+                    apply_action(stepped, action)
+            stepped.update()
+
+        seeked = replay.seek(50)
+        assert seeked.tick == 50
+        assert seeked.time == pytest.approx(stepped.time)
+        assert np.allclose(seeked.ships[0].get_state()[0], stepped.ships[0].get_state()[0], atol=1e-3)
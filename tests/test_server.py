@@ -0,0 +1,115 @@
+import asyncio
+
+import numpy as np
+
+from src.config import OrbitConfig
+from src.orbit_model import GameModel
+from src.replay import Action
+from src.server import (BODY, HEADER, KEYFRAME_TICKS, Session, SessionClient, SimulationServer, decode_frames,
+                        encode_frame, load_test)
+from src.vector_env import PROGRADE
+
+
+class FakeWriter:
+    def __init__(self):
+        self.data = bytearray()
+        self.closed = False
+
+    def write(self, data):
+        self.data.extend(data)
+
+    def close(self):
+        self.closed = True
+
+
+class EmptyReader:
+    async def read(self, size):
+        return b""
+
+
+class TestFrames:
+    def test_round_trip_and_partial_frames(self):
+        data = encode_frame(3, 300.0, 0, [(0, 1.0, 0.1, 0.2, 0.3, 0.4)]) + encode_frame(4, 400.0, 2, [])
+        frames, consumed = decode_frames(data[:-1])
+        assert consumed == HEADER.size + BODY.size
+        assert frames == [(3, 300.0, 0, [(0, 1.0, 0.1, 0.2, 0.3, 0.4)])]
+        frames, consumed = decode_frames(data)
+        assert consumed == len(data)
+        assert frames[1] == (4, 400.0, 2, [])
+
+
+class TestSimulationServer:
+    def test_only_changed_bodies_are_sent(self):
+        server = SimulationServer(capacity=3)
+        writers = [FakeWriter() for _ in range(2)]
+        for slot, writer in enumerate(writers):
+            server.sessions[slot] = Session(slot, writer)
+        server.sessions[0].commands.append(PROGRADE)
+
+        server.tick()
+        burned, _ = decode_frames(writers[0].data)
+        quiet, _ = decode_frames(writers[1].data)
+        assert [body[0] for body in burned[0][3]] == [0]  # only the ship changed
+        assert quiet[0][3] == []
+        assert burned[0][0] == quiet[0][0] == 1
+
+        for _ in range(KEYFRAME_TICKS - 1):
+            server.tick()
+        frames, _ = decode_frames(writers[1].data)
+        assert len(frames[-1][3]) == 2  # keyframe
+
+    def test_connecting_keeps_other_clients_changes(self):
+        server = SimulationServer(capacity=2)
+        writer = FakeWriter()
+        server.sessions[1] = Session(1, writer)
+        server.free.remove(1)
+        server.env.fleet.a[server.env.ship[1]] *= 1.1  # a change its client has not been sent yet
+
+        asyncio.run(server.handle(EmptyReader(), FakeWriter()))
+        server.tick()
+        frames, _ = decode_frames(writer.data)
+        assert [body[0] for body in frames[0][3]] == [0]
+
+    def test_tick_times_bounded(self):
+        config = OrbitConfig()
+        config.profile_window = 10
+        server = SimulationServer(config, capacity=1)
+        for _ in range(25):
+            server.tick()
+        assert len(server.tick_times) == 10
+
+    def test_mirror_follows_server(self):
+        async def scenario():
+            server = SimulationServer(capacity=4)
+            port = await server.start()
+            client = SessionClient.connect(f"127.0.0.1:{port}")
+            mirror = GameModel()
+            while not server.sessions:
+                await asyncio.sleep(0.001)
+            client.send(Action.PROGRADE)
+            client.send(Action.WARP_UP)  # not forwarded
+            await asyncio.sleep(0.01)
+            for _ in range(60):
+                server.tick()
+                await asyncio.sleep(0.001)
+                client.poll(mirror)
+            await server.stop()
+            client.close()
+            return mirror
+
+        mirror = asyncio.run(scenario())
+        reference = GameModel()
+        reference.change_orbit(True)
+        for _ in range(60):
+            reference.update()
+        assert mirror.tick == 60
+        assert mirror.time == reference.time
+        for ship, expected in zip(mirror.ships, reference.ships):
+            assert np.allclose(ship.get_state()[0], expected.get_state()[0], rtol=1e-9)
+
+    def test_load_test_reports_latency(self):
+        report = asyncio.run(load_test(clients=20, ticks=5, tick_rate=100))
+        assert report["ticks"] == 5
+        assert report["frames"] == 20 * 5
+        assert set(report["tick_time"]) == {"p50", "p95", "p99", "max"}
+        assert report["delivery_latency"]["max"] > 0
@@ -0,0 +1,68 @@
+import numpy as np
+
+from src.config import OrbitConfig
+from src.orbit_model import GameModel
+from src.vector_env import NO_BURN, OBSERVATION, PROGRADE, RETROGRADE, VectorOrbitEnv
+
+
+class TestVectorOrbitEnv:
+    def test_matches_game_model(self):
+        env = VectorOrbitEnv(3)
+        model = GameModel()
+        for action in (PROGRADE, NO_BURN, RETROGRADE, PROGRADE, NO_BURN):
+            observations, _, dones, _ = env.step(np.full(3, action))
+            if action != NO_BURN:
+                model.change_orbit(action == PROGRADE)
+            model.update()
+        assert not dones.any()
+
+        r_ship, v_ship = model.ships[0].get_state()
+        r_debris, v_debris = model.ships[1].get_state()
+        assert observations.shape == (3, len(OBSERVATION))
+        assert np.allclose(observations[:, :2], r_debris - r_ship)
+        assert np.allclose(observations[:, 2:4], v_debris - v_ship)
+        assert np.allclose(observations[:, 4], model.ships[0].a)
+
+    def test_games_are_independent(self):
+        env = VectorOrbitEnv(3)
+        observations, _, _, _ = env.step([PROGRADE, NO_BURN, NO_BURN])
+        assert not np.allclose(observations[0], observations[1])
+        assert np.array_equal(observations[1], observations[2])
+
+    def test_crash_ends_and_resets(self):
+        config = OrbitConfig()
+        config.ship_velocity = np.array([0.0, 500.0])  # falls into the star
+        env = VectorOrbitEnv(2, config, max_steps=10_000)
+        start = env.observe()
+        for _ in range(100):
+            observations, rewards, dones, info = env.step([NO_BURN, NO_BURN])
+            if dones.any():
+                break
+        assert dones.all() and info['crashed'].all()
+        assert np.all(rewards == env.crash_reward)
+        assert np.allclose(observations, start)  # fresh games
+        assert not np.allclose(info['final_observation'], start)
+        assert np.all(env.steps == 0)
+
+    def test_catch_rewarded(self):
+        config = OrbitConfig()
+        config.ship_position = config.debris_position * 1.01
+        config.ship_velocity = config.debris_velocity / np.sqrt(1.01)
+        env = VectorOrbitEnv(2, config)
+        _, rewards, dones, info = env.step([NO_BURN, NO_BURN])
+        assert dones.all() and info['caught'].all()
+        assert np.all(rewards == env.catch_reward)
+
+    def test_truncation_and_fuel_cost(self):
+        env = VectorOrbitEnv(2, max_steps=3, fuel_cost=0.01)
+        for _ in range(3):
+            _, rewards, dones, info = env.step([PROGRADE, NO_BURN])
+        assert dones.all() and info['truncated'].all()
+        assert rewards[0] == -0.01 * env.config.delta_v
+        assert rewards[1] == 0.0
+
+    def test_randomized_starts_reproducible(self):
+        first = VectorOrbitEnv(4, sigma_position=1e4, sigma_velocity=5.0, seed=1).observe()
+        second = VectorOrbitEnv(4, sigma_position=1e4, sigma_velocity=5.0, seed=1).observe()
+        assert np.array_equal(first, second)
+        assert not np.allclose(first[0], first[1])
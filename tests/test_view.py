@@ -1,7 +1,9 @@
 import pytest
 from unittest.mock import Mock, patch, MagicMock
-from src.orbit_view import OrbitRenderer
+import numpy as np
+from src.orbit_view import OrbitRenderer, OrbitPathCache
 from src.orbit_model import GameModel
+from src.config import OrbitConfig
 
 
 class TestOrbitView:
@@ -75,3 +77,261 @@ class TestOrbitView:
         # Should draw circles for ships
         assert mock_circle.call_count == len(model.ships) + 1  # one ship, one satellite, one star
         mock_flip.assert_called_once()
+
+
+class TestOrbitPathCache:
+
+    def test_path_rebuilt_only_after_burn(self):
+        model = GameModel()
+        cache = OrbitPathCache(model.config)
+        ship = model.ships[0]
+
+        points = cache.points(ship)
+        assert len(points) == model.config.orbit_path_points
+        model.update()  # propagation leaves (a, e, omega) unchanged
+        assert cache.points(ship) is points
+        assert cache.rebuilds == 1
+
+        model.change_orbit(True)
+        assert cache.points(ship) is not points
+        assert cache.rebuilds == 2
+
+    def test_path_passes_through_body(self):
+        model = GameModel()
+        cache = OrbitPathCache(model.config)
+        ship = model.ships[1]
+        r, _ = ship.get_state()
+        x = model.config.screen_width // 2 * (1 + r[0] / model.config.world_radius)
+        y = model.config.screen_height // 2 * (1 + r[1] / model.config.world_radius)
+        distance = np.hypot(*(np.array(cache.points(ship)) - (x, y)).T)
+        assert distance.min() < 2  # pixels
+
+    def test_open_orbit_path(self):
+        model = GameModel()
+        cache = OrbitPathCache(model.config)
+        ship = model.ships[0]
+        ship.add_delta_v(6000)
+        assert ship.e > 1
+        points = np.array(cache.points(ship))
+        assert len(points) == model.config.orbit_path_points
+        assert np.all(np.isfinite(points))
+        # the branch runs off screen at both ends and passes through the ship
+        r, _ = ship.get_state()
+        x = model.config.screen_width // 2 * (1 + r[0] / model.config.world_radius)
+        y = model.config.screen_height // 2 * (1 + r[1] / model.config.world_radius)
+        assert np.hypot(*(points - (x, y)).T).min() < 5  # vertices are sparser along the branch
+        assert np.all(np.abs(points[[0, -1]] - model.config.screen_width // 2).max(axis=1) > model.config.screen_width // 2)
+
+    @patch('pygame.display.init')
+    @patch('pygame.display.set_mode')
+    @patch('src.orbit_view.load_background')
+    @patch('pygame.draw.circle')
+    @patch('pygame.draw.lines')
+    @patch('pygame.display.flip')
+    def test_render_draws_one_polyline_per_ship(self, mock_flip, mock_lines, mock_circle, mock_background,
+                                                mock_display, mock_init):
+        mock_display.return_value = Mock()
+        view = OrbitRenderer()
+        model = GameModel()
+        view.render(model)
+        view.render(model)
+
+        assert mock_lines.call_count == 2 * len(model.ships)
+        assert view.orbit_paths.rebuilds == len(model.ships)
+
+
+class TestDirtyRectRendering:
+
+    @patch('pygame.display.init')
+    @patch('pygame.display.set_mode')
+    @patch('src.orbit_view.load_background')
+    @patch('pygame.draw.circle')
+    @patch('pygame.draw.lines')
+    @patch('pygame.display.update')
+    @patch('pygame.display.flip')
+    def test_only_first_frame_is_flipped(self, mock_flip, mock_update, mock_lines, mock_circle, mock_background,
+                                         mock_display, mock_init):
+        mock_display.return_value = Mock()
+        config = OrbitConfig()
+        config.dirty_rects = True
+        view = OrbitRenderer(config)
+        model = GameModel(config)
+
+        view.render(model)
+        model.update()
+        view.render(model)
+
+        mock_flip.assert_called_once()
+        mock_update.assert_called_once()
+        # previous and current rects of every circle: star, two ships and two apsis markers,
+        # plus the trail each ship has after one tick
+        assert len(mock_update.call_args[0][0]) == 2 * 5 + len(model.ships)
+        # background prepared for the window once at startup
+        mock_background.assert_called_once_with(config.background_image, (config.screen_width, config.screen_height),
+                                                config.asset_cache_dir)
+
+
+class TestInterpolatedRendering:
+
+    def test_state_at_matches_propagation(self):
+        model = GameModel()
+        ship = model.ships[0]
+        r_back, _ = ship.state_at(-model.config.dt)
+        r_before, _ = ship.get_state()
+        model.update()
+        assert np.allclose(ship.state_at(-model.config.dt)[0], r_before)
+        assert not np.allclose(r_back, r_before)
+
+
+class TestManeuverPreviewRendering:
+
+    @patch('pygame.display.init')
+    @patch('pygame.display.set_mode')
+    @patch('src.orbit_view.load_background')
+    @patch('pygame.draw.circle')
+    @patch('pygame.draw.lines')
+    @patch('pygame.display.flip')
+    def test_ghost_per_candidate(self, mock_flip, mock_lines, mock_circle, mock_background,
+                                 mock_display, mock_init):
+        mock_display.return_value = Mock()
+        config = OrbitConfig()
+        config.show_orbit_paths = False
+        view = OrbitRenderer(config)
+        model = GameModel(config)
+
+        view.show_preview = True
+        view.render(model)
+
+        preview = model.preview_maneuvers()
+        assert mock_lines.call_count == len(preview.delta_v)
+        colors = [call.args[1] for call in mock_lines.call_args_list]
+        assert colors.count(config.epochs_color) == 1
+
+    @patch('pygame.display.init')
+    @patch('pygame.display.set_mode')
+    @patch('src.orbit_view.load_background')
+    def test_ghosts_rebuilt_only_when_orbits_change(self, mock_background, mock_display, mock_init):
+        import pygame
+        config = OrbitConfig()
+        view = OrbitRenderer(config)
+        view.window = pygame.Surface((config.screen_width, config.screen_height))
+        model = GameModel(config)
+        view.draw_preview(model)
+        view._changed_orbit_rects = []
+
+        model.update()
+        with patch.object(model, 'preview_maneuvers') as mock_preview:
+            view.draw_preview(model)
+        mock_preview.assert_not_called()
+        assert view._changed_orbit_rects == []
+
+        model.change_orbit(True)
+        view.draw_preview(model)
+        assert len(view._changed_orbit_rects) == 2 * len(view._preview_rects)
+
+
+class TestFieldRendering:
+
+    @patch('pygame.display.init')
+    @patch('pygame.display.set_mode')
+    @patch('src.orbit_view.load_background')
+    def make_view(self, config, mock_background, mock_display, mock_init):
+        import pygame
+        view = OrbitRenderer(config)
+        view.window = pygame.Surface((config.screen_width, config.screen_height))
+        return view
+
+    def test_small_debris_plotted_as_pixels(self):
+        config = OrbitConfig()
+        view = self.make_view(config)
+        model = GameModel(config)
+        # far from the player, on the opposite side of the star
+        r = -np.array(config.ship_position, dtype=float)[None] * np.array([[1.0], [1.2]])
+        v = -np.array(config.ship_velocity, dtype=float)[None] * np.array([[1.0], [1 / np.sqrt(1.2)]])
+        model.add_debris(r, v, radius_ratio=0.001, color=(1, 2, 3))
+
+        with patch('pygame.draw.circle') as mock_circle:
+            view.draw_field(model)
+        mock_circle.assert_not_called()
+
+        import pygame
+        pixels = pygame.surfarray.array3d(view.window)
+        assert (pixels == [1, 2, 3]).all(axis=2).sum() == 2
+        # one dirty rect per occupied cell, covering its pixel
+        assert len(view._frame_rects) == 2
+        for rect in view._frame_rects:
+            assert rect.size == (config.lod_cell, config.lod_cell)
+            assert (pixels[rect.left:rect.right, rect.top:rect.bottom] == [1, 2, 3]).all(axis=2).sum() == 1
+
+    def test_near_and_large_debris_get_circles(self):
+        config = OrbitConfig()
+        view = self.make_view(config)
+        model = GameModel(config)
+        r, v = model.ships[0].get_state()
+        model.add_debris(r[None] * 1.01, v[None], radius_ratio=0.001)  # near the player
+        model.add_debris(-r[None], -v[None], radius_ratio=0.05)  # large
+
+        with patch('pygame.draw.circle') as mock_circle:
+            view.draw_field(model)
+        assert mock_circle.call_count == 2
+
+    def test_crowded_debris_plotted_as_pixels(self):
+        config = OrbitConfig()
+        view = self.make_view(config)
+        model = GameModel(config)
+        r, v = model.ships[0].get_state()
+        # large bodies bunched into one cell on the far side of the star
+        scale = np.linspace(1.0, 1.01, config.lod_cell_circles + 1)[:, None]
+        model.add_debris(-r[None] * scale, -v[None] / np.sqrt(scale), radius_ratio=0.05)
+
+        with patch('pygame.draw.circle') as mock_circle:
+            view.draw_field(model)
+        mock_circle.assert_not_called()
+
+    def test_circle_count_capped_nearest_first(self):
+        import pygame
+        config = OrbitConfig()
+        config.lod_max_circles = 3
+        view = self.make_view(config)
+        model = GameModel(config)
+        r, v = model.ships[0].get_state()
+        angles = np.linspace(0.5, 5.5, 10)
+        rotation = np.array([[np.cos(angles), -np.sin(angles)], [np.sin(angles), np.cos(angles)]])
+        rows = model.add_debris(np.einsum('ijk,j->ki', rotation, r), np.einsum('ijk,j->ki', rotation, v),
+                                radius_ratio=0.05)
+
+        with patch('pygame.draw.circle', return_value=pygame.Rect(0, 0, 1, 1)) as mock_circle:
+            view.draw_field(model)
+        assert mock_circle.call_count == 3
+        drawn = [tuple(call.args[2]) for call in mock_circle.call_args_list]
+        nearest = np.argsort(np.minimum(angles, 2 * np.pi - angles))[:3]
+        r_rows, _ = model.fleet.get_states(np.asarray(rows)[nearest])
+        expected = config.screen_width // 2 * (1 + r_rows / config.world_radius)
+        assert np.allclose(sorted(drawn), sorted(map(tuple, expected)))
+
+
+class TestTrailRendering:
+
+    @patch('pygame.display.init')
+    @patch('pygame.display.set_mode')
+    @patch('src.orbit_view.load_background')
+    def test_trail_fades_and_ends_at_ship(self, mock_background, mock_display, mock_init):
+        import pygame
+        config = OrbitConfig()
+        view = OrbitRenderer(config)
+        view.window = pygame.Surface((config.screen_width, config.screen_height))
+        model = GameModel(config)
+        for _ in range(30):
+            model.update()
+
+        ship = model.ships[0]
+        with patch('pygame.draw.lines', return_value=pygame.Rect(0, 0, 1, 1)) as mock_lines:
+            view.draw_trail(model, ship)
+        assert mock_lines.call_count == config.trail_fade_steps
+        brightness = [sum(call.args[1]) for call in mock_lines.call_args_list]
+        assert brightness == sorted(brightness)
+        assert tuple(mock_lines.call_args_list[-1].args[1]) == ship.color
+        r, _ = ship.get_state()
+        head = mock_lines.call_args_list[-1].args[3][-1]
+        assert np.allclose(head, [config.screen_width // 2 * (1 + r[0] / config.world_radius),
+                                  config.screen_height // 2 * (1 + r[1] / config.world_radius)])